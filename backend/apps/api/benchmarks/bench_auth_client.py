@@ -0,0 +1,92 @@
+"""
+Auth 서비스 호출 마이크로벤치마크 (요청마다 새 클라이언트 vs 공유 커넥션 풀)
+
+로컬 대역 Auth 서버(/auth/verify)를 띄우고 순차 호출 지연시간을 비교한다.
+
+실행 (apps/api 디렉토리에서):
+    python -m benchmarks.bench_auth_client [요청 수]
+"""
+import asyncio
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+import src.utils.auth as auth
+
+
+class StandInAuthHandler(BaseHTTPRequestHandler):
+    """POST /auth/verify 대역 (keep-alive 지원)"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        body = json.dumps({"user_id": 1, "email": "bench@example.com"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stand_in() -> tuple[ThreadingHTTPServer, str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInAuthHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+async def per_request_client(base_url: str):
+    """기존 방식: 요청마다 AsyncClient 생성"""
+    async with httpx.AsyncClient() as client:
+        response = await client.post(
+            f"{base_url}/auth/verify",
+            headers={"Authorization": "Bearer token"},
+        )
+        return response.json()["user_id"]
+
+
+async def pooled_client(base_url: str):
+    """변경 후: 공유 커넥션 풀 (verify_token_remote)"""
+    return await auth.verify_token_remote("token")
+
+
+async def measure(fn, base_url: str, n: int) -> list[float]:
+    await fn(base_url)  # 워밍업
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        await fn(base_url)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name: str, samples: list[float]):
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(
+        f"{name:<20} mean={statistics.mean(samples):.3f}ms "
+        f"p50={statistics.median(samples):.3f}ms p99={p99:.3f}ms"
+    )
+
+
+async def main(n: int):
+    server, base_url = start_stand_in()
+    auth.AUTH_SERVICE_URL = base_url
+    try:
+        report("per-request client", await measure(per_request_client, base_url, n))
+        await auth.start_auth_client()
+        report("pooled client", await measure(pooled_client, base_url, n))
+    finally:
+        await auth.close_auth_client()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
@@ -0,0 +1,161 @@
+"""
+GET /images 부하 테스트 (async 라우트 안의 sync 세션 vs async 세션)
+
+SQLite 파일 DB의 images를 쿼리마다 지연(db_latency)이 걸리는 VIEW로 만들어
+네트워크 너머 Postgres처럼 DB 대기 시간이 있는 상황을 흉내낸다.
+동시 요청을 ASGI로 직접 보내 처리량(req/s)을 비교한다.
+
+실행 (apps/api 디렉토리에서):
+    python -m benchmarks.bench_images_load [요청 수] [동시성] [쿼리 지연 ms]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.models.database import Base, get_db
+from src.models.image import Image
+from src.models.user import User
+from src.server import app
+from src.utils.auth import get_current_user
+from src.utils.s3 import presign_get_url
+from src.config import PRESIGN_LIST_EXPIRES
+
+BENCH_USER_ID = 1
+
+
+def install_latency(engine, latency_ms: float):
+    """커넥션마다 db_latency() 함수 등록 (드라이버 스레드에서 sleep)"""
+    def db_latency():
+        time.sleep(latency_ms / 1000)
+        return 1
+
+    @event.listens_for(engine, "connect")
+    def register(dbapi_conn, _):
+        dbapi_conn.create_function("db_latency", 0, db_latency)
+
+
+def prepare_db(path: str, rows: int = 200):
+    """images_raw에 데이터를 넣고 images를 지연 VIEW로 교체"""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(User(id=BENCH_USER_ID, email="bench@example.com", name="Bench"))
+        now = datetime.utcnow()
+        db.add_all(
+            Image(
+                user_id=BENCH_USER_ID,
+                object_key=f"originals/bench-{i}.jpg",
+                filename=f"bench-{i}.jpg",
+                size=1024,
+                created_at=now - timedelta(seconds=i),
+            )
+            for i in range(rows)
+        )
+        db.commit()
+        db.execute(text("ALTER TABLE images RENAME TO images_raw"))
+        db.execute(text("CREATE VIEW images AS SELECT * FROM images_raw WHERE (SELECT db_latency())"))
+        db.commit()
+    engine.dispose()
+
+
+def legacy_app(path: str, latency_ms: float):
+    """변경 전: async def 라우트에서 sync 세션으로 쿼리 (이벤트 루프 블로킹)"""
+    # 풀이 부족하면 루프가 막힌 채 체크아웃을 기다려 반납(스레드풀)이 진행되지 않으므로 동시성만큼 확보
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}, pool_size=32, max_overflow=0
+    )
+    install_latency(engine, latency_ms)
+    SyncSession = sessionmaker(bind=engine, autoflush=False)
+    legacy = FastAPI()
+
+    def get_sync_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @legacy.get("/images")
+    async def list_my_images(db: Session = Depends(get_sync_db), limit: int = 50):
+        images = db.query(Image)\
+            .filter(Image.user_id == BENCH_USER_ID)\
+            .order_by(Image.created_at.desc(), Image.id.desc())\
+            .limit(limit)\
+            .all()
+        return {
+            "images": [
+                {"id": img.id, "key": img.object_key, "url": presign_get_url(img.object_key, PRESIGN_LIST_EXPIRES)}
+                for img in images
+            ],
+            "count": len(images),
+        }
+
+    return legacy, engine
+
+
+def async_app(path: str, latency_ms: float):
+    """변경 후: 실제 /images 라우트 + async 세션"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", pool_size=32, max_overflow=0)
+    install_latency(engine.sync_engine, latency_ms)
+    AsyncSession = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_db():
+        async with AsyncSession() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: BENCH_USER_ID
+    return app, engine
+
+
+async def run_load(target: FastAPI, n: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=target)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        (await client.get("/images")).raise_for_status()  # 워밍업
+
+        remaining = iter(range(n))
+
+        async def worker():
+            for _ in remaining:
+                (await client.get("/images", params={"limit": 20})).raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return n / (time.perf_counter() - start)
+
+
+async def main(n: int, concurrency: int, latency_ms: float):
+    path = tempfile.mktemp(suffix=".db")
+    prepare_db(path)
+    try:
+        print(f"requests={n} concurrency={concurrency} query_latency={latency_ms}ms")
+        legacy, sync_engine = legacy_app(path, latency_ms)
+        before = await run_load(legacy, n, concurrency)
+        sync_engine.dispose()
+        print(f"{'sync session':<16} {before:8.1f} req/s")
+
+        target, async_engine = async_app(path, latency_ms)
+        after = await run_load(target, n, concurrency)
+        await async_engine.dispose()  # aiosqlite 커넥션 스레드 정리
+        print(f"{'async session':<16} {after:8.1f} req/s  (x{after / before:.1f})")
+    finally:
+        app.dependency_overrides.clear()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(
+        int(args[0]) if len(args) > 0 else 400,
+        int(args[1]) if len(args) > 1 else 32,
+        float(args[2]) if len(args) > 2 else 5.0,
+    ))
@@ -0,0 +1,44 @@
+"""
+presigned URL 생성 마이크로벤치마크 (boto3 generate_presigned_url vs SigV4Presigner)
+
+목록 한 페이지(100개) 분량의 GET URL 생성 시간을 비교한다. 네트워크 호출 없음.
+
+실행 (apps/api 디렉토리에서):
+    python -m benchmarks.bench_presign [반복 횟수]
+"""
+import sys
+import time
+
+from src.config import S3_BUCKET
+from src.utils.s3 import s3_public, presigner
+
+KEYS = [f"originals/{i:032x}.jpg" for i in range(100)]
+
+
+def boto3_page():
+    for key in KEYS:
+        s3_public.generate_presigned_url(
+            "get_object", Params={"Bucket": S3_BUCKET, "Key": key}, ExpiresIn=3600
+        )
+
+
+def fast_page():
+    for key in KEYS:
+        presigner.presign("GET", S3_BUCKET, key, 3600)
+
+
+def measure(name: str, fn, rounds: int):
+    fn()  # 워밍업
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    elapsed = time.perf_counter() - start
+    per_url_us = elapsed / (rounds * len(KEYS)) * 1_000_000
+    per_page_ms = elapsed / rounds * 1000
+    print(f"{name:<10} {per_url_us:8.2f}us/url  {per_page_ms:8.3f}ms/page(100)")
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    measure("boto3", boto3_page, rounds)
+    measure("sigv4", fast_page, rounds)
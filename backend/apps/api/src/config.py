@@ -8,13 +8,97 @@ S3_SECRET_KEY = os.getenv("S3_SECRET_KEY", "minio123")
 S3_BUCKET = os.getenv("S3_BUCKET", "uploads")
 PUBLIC_S3_BASEURL = os.getenv("PUBLIC_S3_BASEURL", "http://localhost:9000")
 
+# Auth 서비스 / JWT 설정 (auth 서비스의 utils/jwt.py와 동일한 값 사용)
+AUTH_SERVICE_URL = os.getenv("AUTH_SERVICE_URL", "http://auth:8000")
+JWT_SECRET = os.getenv("JWT_SECRET", "")  # 비어 있으면 HS 토큰은 원격 검증
+JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+JWT_JWKS_URL = os.getenv("JWT_JWKS_URL", "")  # 비대칭 알고리즘(RS/ES)용 공개키 세트
+JWKS_CACHE_TTL = int(os.getenv("JWKS_CACHE_TTL", "3600"))  # 공개키 세트 캐시 시간(초)
+JWKS_MIN_REFRESH_INTERVAL = int(os.getenv("JWKS_MIN_REFRESH_INTERVAL", "60"))  # 모르는 kid 재조회 최소 간격(초)
+
+# Auth 서비스 HTTP 클라이언트 (앱 전역 커넥션 풀)
+AUTH_HTTP_MAX_CONNECTIONS = int(os.getenv("AUTH_HTTP_MAX_CONNECTIONS", "100"))
+AUTH_HTTP_MAX_KEEPALIVE = int(os.getenv("AUTH_HTTP_MAX_KEEPALIVE", "20"))
+AUTH_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("AUTH_HTTP_KEEPALIVE_EXPIRY", "30"))
+AUTH_HTTP_TIMEOUT = float(os.getenv("AUTH_HTTP_TIMEOUT", "5.0"))
+AUTH_HTTP_CONNECT_TIMEOUT = float(os.getenv("AUTH_HTTP_CONNECT_TIMEOUT", "2.0"))
+AUTH_HTTP2 = os.getenv("AUTH_HTTP2", "false").lower() == "true"  # h2 패키지 필요
+AUTH_HTTP_RETRIES = int(os.getenv("AUTH_HTTP_RETRIES", "2"))  # 연결 실패 시 재시도 횟수
+AUTH_HTTP_RETRY_BACKOFF = float(os.getenv("AUTH_HTTP_RETRY_BACKOFF", "0.1"))  # 재시도 대기 상한 기준(초, 지수 증가 + jitter)
+
+# 검증된 토큰 캐시 (토큰 해시 -> user_id)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL = int(os.getenv("TOKEN_CACHE_TTL", "300"))  # 토큰 exp보다 길게 캐시하지 않음
+TOKEN_REVOCATION_TTL = int(os.getenv("TOKEN_REVOCATION_TTL", "86400"))  # 폐기 목록 보관 시간 (최대 토큰 수명 이상)
+
+# 내부 엔드포인트(/internal/*) 인증 토큰 (비어 있으면 비활성화)
+INTERNAL_API_TOKEN = os.getenv("INTERNAL_API_TOKEN", "")
+
 # 업로드 제한
 ALLOWED_EXT = {".jpg", ".jpeg", ".png", ".webp", ".avif"}
 ALLOWED_MIME = {"image/jpeg", "image/png", "image/webp", "image/avif"}
 MAX_SIZE = 10 * 1024 * 1024  # 10MB
 
-# Boto3 설정
-BOTO_CONFIG = Config(signature_version="s3v4", s3={"addressing_style": "path"})
+# 업로드 내용 검증 (완료 시 객체 앞부분만 ranged GET으로 읽어 실제 형식/크기 확인)
+SNIFF_BYTES = int(os.getenv("SNIFF_BYTES", "4096"))  # 한 번에 읽을 바이트 수
+SNIFF_MAX_READS = int(os.getenv("SNIFF_MAX_READS", "3"))  # JPEG 크기 정보가 EXIF 뒤에 있으면 이어서 읽는 횟수 (첫 읽기 포함)
+MAX_IMAGE_PIXELS = int(os.getenv("MAX_IMAGE_PIXELS", str(50_000_000)))  # 워커 디코딩 제한과 같은 값
+QUARANTINE_PREFIX = "quarantine/"  # 선언과 내용이 다른 객체를 옮겨 두는 곳
+
+# 업로드 수명주기 (pending → ready)
+PRESIGN_PUT_EXPIRES = 3600  # 업로드 URL/POST 정책 유효시간(초)
+PENDING_UPLOAD_TTL = int(os.getenv("PENDING_UPLOAD_TTL", "7200"))  # 이 시간(초)이 지나도 완료되지 않은 업로드는 만료
+UPLOAD_SWEEP_INTERVAL = int(os.getenv("UPLOAD_SWEEP_INTERVAL", "300"))  # 스위퍼 실행 주기(초, 0: 끔)
+UPLOAD_SWEEP_BATCH = int(os.getenv("UPLOAD_SWEEP_BATCH", "100"))  # 한 번에 확인할 pending 행 수
+UPLOAD_BATCH_MAX_ITEMS = int(os.getenv("UPLOAD_BATCH_MAX_ITEMS", "100"))  # POST /uploads/batch 한 번에 예약할 파일 수
+# ready가 되면 워커(apps/worker)에 등록할 작업 (classify는 process_image가 끝난 뒤 워커가 등록 - PROCESS_IMAGE_NEXT_KINDS)
+UPLOAD_JOB_KINDS = os.getenv("UPLOAD_JOB_KINDS", "process_image").split(",")
+
+# 멀티파트 업로드 (파트별 presigned PUT, 끊긴 파트만 다시 올림)
+MULTIPART_PART_SIZE = int(os.getenv("MULTIPART_PART_SIZE", str(5 * 1024 * 1024)))  # S3 최소 5MB (마지막 파트 제외)
+MULTIPART_UPLOAD_TTL = int(os.getenv("MULTIPART_UPLOAD_TTL", os.getenv("PENDING_UPLOAD_TTL", "7200")))  # 이 시간(초)이 지난 멀티파트 업로드는 스위퍼가 중단
+
+# 객체 존재 여부 캐시 (GET /images/{key} - DB 행이 기준, DB에 없는 키만 HEAD)
+OBJECT_CACHE_SIZE = int(os.getenv("OBJECT_CACHE_SIZE", "100000"))
+OBJECT_CACHE_TTL = int(os.getenv("OBJECT_CACHE_TTL", "600"))  # 존재 확인 결과 보관(초)
+OBJECT_CACHE_NEGATIVE_TTL = int(os.getenv("OBJECT_CACHE_NEGATIVE_TTL", "30"))  # 없음/미완료 결과 보관(초)
+
+# Presigned URL 캐시 (같은 버킷 구간 안에서는 같은 객체에 같은 URL 반환)
+PRESIGN_LIST_EXPIRES = 3600  # 목록 응답 URL 유효시간(초)
+PRESIGN_BUCKET_SECONDS = int(os.getenv("PRESIGN_BUCKET_SECONDS", "300"))  # 만료 시간 버킷 길이(초)
+PRESIGN_CACHE_SIZE = int(os.getenv("PRESIGN_CACHE_SIZE", "50000"))
+PRESIGN_CACHE_MAX_BYTES = int(os.getenv("PRESIGN_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))  # 32MB
+
+# 여러 키 한 번에 조회 URL 발급 (POST /images/presign)
+PRESIGN_BATCH_MAX_KEYS = int(os.getenv("PRESIGN_BATCH_MAX_KEYS", "500"))
+
+# 목록 썸네일 (워커가 만든 derivatives/ 파생본 중 선택)
+LIST_VARIANT_WIDTH = int(os.getenv("LIST_VARIANT_WIDTH", "256"))  # width 파라미터가 없을 때 표시 너비(px)
+
+# 목록 조건부 요청 (ETag/If-None-Match → 304)
+LIST_CACHE_MAX_AGE = int(os.getenv("LIST_CACHE_MAX_AGE", "0"))  # 브라우저가 재검증 없이 쓸 시간(초, presign 버킷 끝까지로 제한)
+
+# 목록 첫 페이지 서버 캐시 (직렬화된 응답, 키에 목록 버전이 들어가 업로드 완료 시 자동 무효화)
+LISTING_CACHE_URL = os.getenv("LISTING_CACHE_URL", "")  # redis://redis:6379/0 - 워커 간 공유 (redis 패키지 필요), 비우면 프로세스 내 LRU
+LISTING_CACHE_SIZE = int(os.getenv("LISTING_CACHE_SIZE", "1000"))  # 프로세스 내 LRU 항목 수
+LISTING_CACHE_MAX_BYTES = int(os.getenv("LISTING_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # 64MB
+LISTING_CACHE_TTL = int(os.getenv("LISTING_CACHE_TTL", "60"))  # 항목 보관(초, presign 버킷 끝까지로 제한)
+LISTING_CACHE_LOCK_TIMEOUT = float(os.getenv("LISTING_CACHE_LOCK_TIMEOUT", "2.0"))  # 다른 워커가 만드는 페이지를 기다리는 상한(초)
+
+# S3 호출 (boto3는 blocking이므로 전용 스레드풀에서 실행)
+S3_MAX_CONCURRENCY = int(os.getenv("S3_MAX_CONCURRENCY", "16"))  # 동시에 진행할 S3 호출 수 (스레드 수)
+S3_CALL_TIMEOUT = float(os.getenv("S3_CALL_TIMEOUT", "5.0"))  # 호출당 대기 상한(초, 큐 대기 포함)
+S3_CONNECT_TIMEOUT = float(os.getenv("S3_CONNECT_TIMEOUT", "2.0"))
+S3_READ_TIMEOUT = float(os.getenv("S3_READ_TIMEOUT", "5.0"))
+
+# Boto3 설정 (소켓 타임아웃을 둬서 느린 MinIO 응답이 스레드를 무한정 잡지 않게)
+BOTO_CONFIG = Config(
+    signature_version="s3v4",
+    s3={"addressing_style": "path"},
+    connect_timeout=S3_CONNECT_TIMEOUT,
+    read_timeout=S3_READ_TIMEOUT,
+    retries={"max_attempts": 2, "mode": "standard"},
+)
 
 # CORS 설정
 CORS_ORIGINS = [
@@ -1,14 +1,34 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, text
 from datetime import datetime
 from src.models.database import Base  # ✅ database.py에서 가져오기
 
+class ImageStatus:
+    """업로드 상태 (pending → ready | rejected | quarantined | expired)"""
+    PENDING = "pending"    # presigned URL 발급됨, 업로드 확인 전
+    READY = "ready"        # 객체 존재/크기/타입 확인 완료 (목록에 노출)
+    REJECTED = "rejected"  # 업로드됐지만 제한 위반
+    QUARANTINED = "quarantined"  # 실제 내용이 선언한 형식과 다름 (객체는 quarantine/으로 이동)
+    EXPIRED = "expired"    # 제한 시간 안에 업로드되지 않음
+
+
 class Image(Base):
     __tablename__ = "images"
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False, index=True)
-    object_key = Column(String(500), unique=True, nullable=False, index=True)
+    object_key = Column(String(500), nullable=False, index=True)  # 업로드 때 받은 키 (sha256 핸드셰이크로 재사용한 행은 같은 키를 가리킴, 워커는 바꾸지 않음)
     filename = Column(String(500))
     content_type = Column(String(100))
     size = Column(Integer)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    status = Column(String(20), nullable=False, default=ImageStatus.READY, server_default=ImageStatus.READY)
+    width = Column(Integer)   # 워커가 디코딩 후 기록
+    height = Column(Integer)
+
+    # 키셋 페이지네이션용 복합 인덱스 (ORDER BY created_at DESC, id DESC)
+    __table_args__ = (
+        Index("idx_images_created_at_id", "created_at", "id"),
+        Index("idx_images_user_id_created_at_id", "user_id", "created_at", "id"),
+        # 만료 스위퍼용 (pending 행만)
+        Index("idx_images_pending_created_at", "created_at", postgresql_where=text("status = 'pending'")),
+    )
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey
+from datetime import datetime
+from src.models.database import Base
+
+
+class ImageHash(Base):
+    """이미지 내용 해시 (apps/worker가 기록, 업로드 요청의 sha256으로 이미 있는 객체 조회)"""
+    __tablename__ = "image_hashes"
+
+    image_id = Column(Integer, ForeignKey("images.id", ondelete="CASCADE"), primary_key=True)
+    sha256 = Column(String(64), nullable=False, index=True)  # 실제 원본 바이트로 계산한 값
+    phash = Column(BigInteger, nullable=False)
+    dhash = Column(BigInteger, nullable=False)
+    phash_band0 = Column(Integer, nullable=False, index=True)
+    phash_band1 = Column(Integer, nullable=False, index=True)
+    phash_band2 = Column(Integer, nullable=False, index=True)
+    phash_band3 = Column(Integer, nullable=False, index=True)
+    canonical_image_id = Column(Integer, ForeignKey("images.id", ondelete="SET NULL"), index=True)
+    distance = Column(Integer)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Index, text
+from datetime import datetime
+from src.models.database import Base
+
+
+class JobStatus:
+    """작업 상태 (queued → running → done | queued(재시도) | dead)"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    DEAD = "dead"  # 재시도 소진/영구 실패 (dead-letter)
+
+
+class Job(Base):
+    """워커 작업 큐 (Postgres FOR UPDATE SKIP LOCKED로 소비, apps/worker와 같은 테이블)"""
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(50), nullable=False)
+    payload = Column(JSON, nullable=False, default=dict)
+    dedupe_key = Column(String(200), unique=True, nullable=False)  # 같은 작업 중복 등록 방지
+    status = Column(String(20), nullable=False, default=JobStatus.QUEUED, server_default=JobStatus.QUEUED)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    max_attempts = Column(Integer, nullable=False, default=5, server_default="5")
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_at = Column(DateTime)
+    locked_by = Column(String(100))
+    last_error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # 대기 작업 조회 (queued 행만)
+        Index("idx_jobs_queued", "kind", "run_after", postgresql_where=text("status = 'queued'")),
+    )
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, BigInteger, String
+from src.models.database import Base
+
+
+class ListingVersion(Base):
+    """
+    목록 범위별 변경 카운터 (목록 ETag용)
+
+    이미지가 ready가 되거나(api) 워커가 크기/썸네일/중복 연결을 기록할 때(worker) 같은 트랜잭션에서 +1.
+    """
+    __tablename__ = "listing_versions"
+
+    scope = Column(String(50), primary_key=True)  # public | user:<id>
+    version = Column(BigInteger, nullable=False, default=0)
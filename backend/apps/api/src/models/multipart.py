@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from datetime import datetime
+from src.models.database import Base
+
+
+class MultipartUpload(Base):
+    """진행 중인 S3 멀티파트 업로드 (완료/중단 시 삭제, 방치된 업로드는 스위퍼가 중단)"""
+    __tablename__ = "multipart_uploads"
+
+    id = Column(Integer, primary_key=True)
+    image_id = Column(Integer, ForeignKey("images.id", ondelete="CASCADE"), nullable=False, index=True)
+    upload_id = Column(String(1024), nullable=False)  # S3 UploadId
+    part_size = Column(Integer, nullable=False)
+    part_count = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
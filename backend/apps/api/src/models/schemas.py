@@ -1,21 +1,90 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
 class UploadRequest(BaseModel):
     filename: str
     contentType: str
     size: int
+    # put: presigned PUT URL / post: presigned POST 정책 (스토리지가 크기/타입 조건을 직접 검사)
+    mode: Literal["put", "post"] = "put"
+    # 파일 바이트의 SHA-256 (hex). 같은 내용이 이미 있으면 업로드 없이 그 객체를 공유
+    sha256: Optional[str] = Field(None, pattern="^[0-9a-fA-F]{64}$")
 
 class UploadResponse(BaseModel):
-    presignedUrl: str
+    presignedUrl: Optional[str] = None  # alreadyPresent면 None (업로드/완료 호출 불필요)
     objectKey: str
+    method: Optional[Literal["PUT", "POST"]] = "PUT"
+    # POST 모드: multipart/form-data에 그대로 넣을 필드 (파일은 마지막 "file" 필드로)
+    fields: Optional[dict[str, str]] = None
+    alreadyPresent: bool = False  # 같은 내용의 객체를 재사용해 바로 ready
+
+class BatchUploadRequest(BaseModel):
+    items: list[UploadRequest]
+
+class BatchUploadItem(BaseModel):
+    index: int  # 요청 items에서의 위치
+    presignedUrl: Optional[str] = None
+    objectKey: Optional[str] = None
+    method: Optional[Literal["PUT", "POST"]] = None
+    fields: Optional[dict[str, str]] = None
+    alreadyPresent: bool = False  # sha256이 같은 내용과 일치해 업로드 없이 바로 ready
+    error: Optional[str] = None  # 검증 실패 사유 (이 항목은 업로드하지 않음)
+
+class BatchUploadResponse(BaseModel):
+    items: list[BatchUploadItem]
+    accepted: int
+    failed: int
+
+class MultipartUploadRequest(BaseModel):
+    filename: str
+    contentType: str
+    size: int
+
+class UploadPartUrl(BaseModel):
+    partNumber: int
+    url: str
+
+class MultipartUploadResponse(BaseModel):
+    uploadId: int  # 서버 추적 ID (/uploads/multipart/{uploadId}/...)
+    objectKey: str
+    partSize: int  # 마지막 파트를 제외한 파트 크기 (바이트)
+    parts: list[UploadPartUrl]
+
+class MultipartPartsRequest(BaseModel):
+    partNumbers: list[int]  # 다시 서명할 파트 (URL 만료/재시도)
+
+class MultipartPartsResponse(BaseModel):
+    parts: list[UploadPartUrl]
+
+class CompletedPart(BaseModel):
+    partNumber: int
+    etag: str
+
+class MultipartCompleteRequest(BaseModel):
+    # 생략하면 서버가 스토리지에 올라간 파트 목록을 사용 (브라우저에서 ETag 헤더를 못 읽는 경우)
+    parts: Optional[list[CompletedPart]] = None
+
+class UploadCompleteResponse(BaseModel):
+    objectKey: str
+    status: str
+    size: Optional[int] = None
+    contentType: Optional[str] = None
 
 class ImageResponse(BaseModel):
     url: str
     key: str
     expiresIn: int
     download: bool
+
+class BulkPresignRequest(BaseModel):
+    keys: list[str]
+    expiresIn: int = 900  # 60~3600초로 클램핑
+    download: bool = False  # 다운로드 강제 (파일명은 업로드 때 이름)
+
+class BulkPresignResponse(BaseModel):
+    images: list[ImageResponse]
+    missing: list[str]  # 없거나 조회할 수 없는(ready가 아닌) 키
     
 
 class UserResponse(BaseModel):
@@ -27,4 +96,8 @@ class UserResponse(BaseModel):
     updated_at: datetime
     
     class Config:  # ✅ 추가
-        from_attributes = True  # SQLAlchemy 모델에서 변환 허용
\ No newline at end of file
+        from_attributes = True  # SQLAlchemy 모델에서 변환 허용
+
+class RevokeRequest(BaseModel):
+    token_hashes: list[str] = []  # sha256(token) hex
+    user_ids: list[int] = []      # 해당 사용자의 기존 토큰 전부 폐기
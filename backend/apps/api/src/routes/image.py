@@ -1,46 +1,57 @@
-from fastapi import APIRouter, HTTPException, Path, Query, Depends
-from sqlalchemy.orm.session import Session
-from src.routes.users import get_user
+from fastapi import APIRouter, HTTPException, Path, Query, Depends, Header, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.models.database import get_db
-from src.models.schemas import ImageResponse
-from src.utils.s3 import s3_internal, s3_public
-from src.config import S3_BUCKET
-from botocore.exceptions import ClientError
+from src.models.schemas import ImageResponse, BulkPresignRequest, BulkPresignResponse
+from src.utils.s3 import presign_get_url
+from src.utils.uploads import object_exists
+from src.utils.variants import load_variants, preferred_formats, variant_fields
+from src.config import PRESIGN_LIST_EXPIRES, LIST_VARIANT_WIDTH, PRESIGN_BATCH_MAX_KEYS
 import urllib.parse
 import os
-from src.models.image import Image
+from src.models.image import Image, ImageStatus
 from src.utils.auth import get_current_user
+from src.utils.pagination import apply_keyset, split_page
+from src.utils.listing import PUBLIC_SCOPE, user_scope, conditional_listing, cached_first_page, coalesced_page
 from src.models.user import User
 
 router = APIRouter()
 
-def get_user_by_id(user_id: int, db: Session) -> User | None:
-    """사용자 ID로 조회 (내부용)"""
-    return db.query(User).filter(User.id == user_id).first()
 
+def uploader_summary(user_id: int | None, name: str | None, avatar_url: str | None) -> dict | None:
+    """목록용 업로더 정보 (전체 User 행 대신 필요한 컬럼만)"""
+    if user_id is None:
+        return None
+    return {"id": user_id, "name": name, "avatar_url": avatar_url}
 
-@router.get("/images/public")
-async def list_all_images(
-    db: Session = Depends(get_db),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100)
-):
-    """모든 이미지 목록"""
-    images = db.query(Image)\
-        .order_by(Image.created_at.desc())\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
+
+def invalid_key(key: str) -> bool:
+    return key.startswith("/") or ".." in key
+
+
+def clamp_expiry(expires_in: int) -> int:
+    """조회 URL 만료 시간 클램핑 (60~3600초)"""
+    return max(60, min(expires_in, 3600))
+
+
+def download_params(key: str, filename: str | None) -> dict:
+    """다운로드 강제 응답 헤더 (Content-Disposition)"""
+    safe = filename or os.path.basename(key) or "download"
+    return {"ResponseContentDisposition": f"attachment; filename*=UTF-8''{urllib.parse.quote(safe)}"}
+
+
+async def public_page(db: AsyncSession, cursor: str | None, skip: int, limit: int, width: int, formats: list[str]) -> dict:
+    """공개 목록 한 페이지 (업로더 정보는 JOIN 한 번으로 함께 조회)"""
+    query = select(Image, User.id, User.name, User.avatar_url)\
+        .outerjoin(User, User.id == Image.user_id)\
+        .where(Image.status == ImageStatus.READY)
+    rows = (await db.execute(apply_keyset(query, cursor, limit, skip))).all()
+    rows, next_cursor = split_page(rows, limit, image_of=lambda row: row[0])
+    variants = await load_variants(db, [row[0].id for row in rows])
     
     result = []
-    for img in images:
-        url = s3_public.generate_presigned_url(
-            'get_object',
-            Params={'Bucket': S3_BUCKET, 'Key': img.object_key},
-            ExpiresIn=3600
-        )
-
-        user = get_user_by_id(img.user_id, db)
+    for img, uploader_id, uploader_name, uploader_avatar in rows:
+        url = presign_get_url(img.object_key, PRESIGN_LIST_EXPIRES)
 
         result.append({
             "id": img.id,
@@ -48,117 +59,176 @@ async def list_all_images(
             "filename": img.filename,
             "size": img.size,
             "url": url,
+            **variant_fields(variants.get(img.id, []), width, formats, url),
+            "width": img.width,
+            "height": img.height,
             "created_at": img.created_at.isoformat(),
             "user_id": img.user_id,
-            "user": user  # ✅ 업로더 정보 포함
+            "user": uploader_summary(uploader_id, uploader_name, uploader_avatar)
         })
     
-    return {"images": result, "count": len(result)}
+    return {"images": result, "count": len(result), "next_cursor": next_cursor}
 
-@router.get("/images")
-async def list_my_images(
-    user_id: int = Depends(get_current_user),
-    db: Session = Depends(get_db),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100)
-):
-    """내가 업로드한 이미지 목록"""
-    images = db.query(Image)\
-        .filter(Image.user_id == user_id)\
-        .order_by(Image.created_at.desc())\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
+
+async def user_page(db: AsyncSession, user_id: int, cursor: str | None, skip: int, limit: int, width: int, formats: list[str]) -> dict:
+    """사용자 목록 한 페이지 (/images, /images/user/{user_id} 공통)"""
+    query = select(Image).where(Image.user_id == user_id, Image.status == ImageStatus.READY)
+    images = (await db.scalars(apply_keyset(query, cursor, limit, skip))).all()
+    images, next_cursor = split_page(images, limit)
+    variants = await load_variants(db, [img.id for img in images])
     
     # Presigned URL 생성
     result = []
     for img in images:
-        url = s3_public.generate_presigned_url(
-            'get_object',
-            Params={'Bucket': S3_BUCKET, 'Key': img.object_key},
-            ExpiresIn=3600
-        )
+        url = presign_get_url(img.object_key, PRESIGN_LIST_EXPIRES)
         result.append({
             "id": img.id,
             "key": img.object_key,
             "filename": img.filename,
             "size": img.size,
             "url": url,
+            **variant_fields(variants.get(img.id, []), width, formats, url),
+            "width": img.width,
+            "height": img.height,
             "created_at": img.created_at.isoformat()
         })
     
-    return {"images": result, "count": len(result)}
+    return {"images": result, "count": len(result), "next_cursor": next_cursor}
+
+
+@router.get("/images/public")
+async def list_all_images(
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor"),
+    skip: int = Query(0, ge=0, deprecated=True),
+    limit: int = Query(50, ge=1, le=100),
+    width: int = Query(LIST_VARIANT_WIDTH, ge=1, le=4096, description="표시 너비(px, DPR 반영) - 이 이상인 가장 작은 썸네일 선택"),
+    accept: str | None = Header(None),
+    if_none_match: str | None = Header(None),
+):
+    """
+    모든 이미지 목록
+
+    If-None-Match가 현재 ETag와 같으면 조회/서명 없이 304, 첫 페이지는 직렬화된 결과를 캐시
+    """
+    formats = preferred_formats(accept)
+    not_modified = await conditional_listing(db, response, PUBLIC_SCOPE, formats, if_none_match, public=True)
+    if not_modified:
+        return not_modified
+
+    render = lambda: public_page(db, cursor, skip, limit, width, formats)
+    if cursor is None and not skip:
+        return await cached_first_page(response, "public", (limit, width), render)
+    return await coalesced_page(response, "public", (cursor, skip, limit, width), render)
+
+@router.get("/images")
+async def list_my_images(
+    response: Response,
+    user_id: int = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor"),
+    skip: int = Query(0, ge=0, deprecated=True),
+    limit: int = Query(50, ge=1, le=100),
+    width: int = Query(LIST_VARIANT_WIDTH, ge=1, le=4096, description="표시 너비(px, DPR 반영) - 이 이상인 가장 작은 썸네일 선택"),
+    accept: str | None = Header(None),
+    if_none_match: str | None = Header(None),
+):
+    """내가 업로드한 이미지 목록 (If-None-Match가 현재 ETag와 같으면 304, 첫 페이지는 캐시)"""
+    formats = preferred_formats(accept)
+    not_modified = await conditional_listing(db, response, user_scope(user_id), formats, if_none_match)
+    if not_modified:
+        return not_modified
+
+    render = lambda: user_page(db, user_id, cursor, skip, limit, width, formats)
+    if cursor is None and not skip:
+        return await cached_first_page(response, "user", (limit, width), render)
+    return await coalesced_page(response, "user", (cursor, skip, limit, width), render)
 
 
 @router.get("/images/user/{user_id}")
 async def list_user_images(
+    response: Response,
     user_id: int = Path(..., description="사용자 ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(50, ge=1, le=100),
+    width: int = Query(LIST_VARIANT_WIDTH, ge=1, le=4096, description="표시 너비(px, DPR 반영) - 이 이상인 가장 작은 썸네일 선택"),
+    accept: str | None = Header(None),
+    if_none_match: str | None = Header(None),
 ):
-    """사용자가 업로드한 이미지 목록"""
-    images = db.query(Image)\
-        .filter(Image.user_id == user_id)\
-        .order_by(Image.created_at.desc())\
-        .all()
-    
-    # Presigned URL 생성
-    result = []
-    for img in images:
-        url = s3_public.generate_presigned_url(
-            'get_object',
-            Params={'Bucket': S3_BUCKET, 'Key': img.object_key},
-            ExpiresIn=3600
+    """사용자가 업로드한 이미지 목록 (If-None-Match가 현재 ETag와 같으면 304, 첫 페이지는 /images와 같은 캐시)"""
+    formats = preferred_formats(accept)
+    not_modified = await conditional_listing(db, response, user_scope(user_id), formats, if_none_match, public=True)
+    if not_modified:
+        return not_modified
+
+    render = lambda: user_page(db, user_id, cursor, 0, limit, width, formats)
+    if cursor is None:
+        return await cached_first_page(response, "user", (limit, width), render)
+    return await coalesced_page(response, "user", (cursor, 0, limit, width), render)
+
+@router.post("/images/presign", response_model=BulkPresignResponse)
+async def create_presigned_gets(req: BulkPresignRequest, db: AsyncSession = Depends(get_db)):
+    """
+    여러 키의 조회 URL을 한 번에 발급 (갤러리/내보내기)
+
+    키마다 GET /images/{key}를 부르는 대신 images 테이블 조회 한 번으로 ready인 키만 골라 서명한다.
+    DB에 없는 키는 HEAD로 확인하지 않고 missing으로 돌려준다.
+    """
+    keys = list(dict.fromkeys(req.keys))  # 순서 유지 중복 제거
+    if len(keys) > PRESIGN_BATCH_MAX_KEYS:
+        raise HTTPException(status_code=400, detail=f"Too many keys (max {PRESIGN_BATCH_MAX_KEYS})")
+    if any(invalid_key(key) for key in keys):
+        raise HTTPException(status_code=400, detail="Invalid key")
+
+    rows = (await db.execute(
+        select(Image.object_key, Image.filename)
+        .where(Image.object_key.in_(keys), Image.status == ImageStatus.READY)
+        .order_by(Image.id)
+    )).all() if keys else []
+    filenames = {}
+    for key, filename in rows:
+        # 같은 객체를 여러 사용자가 공유하면(같은 내용 업로드) 파일명이 다를 수 있음 → 키 이름으로 (남의 파일명 노출 방지)
+        filenames[key] = filename if filenames.get(key, filename) == filename else None
+
+    effective_expiry = clamp_expiry(req.expiresIn)
+    images = [
+        ImageResponse(
+            url=presign_get_url(
+                key, effective_expiry, **(download_params(key, filenames[key]) if req.download else {})
+            ),
+            key=key,
+            expiresIn=effective_expiry,
+            download=req.download
         )
-        result.append({
-            "id": img.id,
-            "key": img.object_key,
-            "filename": img.filename,
-            "size": img.size,
-            "url": url,
-            "created_at": img.created_at.isoformat()
-        })
-    
-    return {"images": result, "count": len(result)}
+        for key in keys if key in filenames
+    ]
+    return BulkPresignResponse(images=images, missing=[key for key in keys if key not in filenames])
+
 
 @router.get("/images/{key:path}", response_model=ImageResponse)
-def create_presigned_get(
+async def create_presigned_get(
     key: str = Path(..., description="오브젝트 키 (예: originals/abc123.jpg)"),
+    db: AsyncSession = Depends(get_db),
     as_download: bool = Query(False, description="다운로드 강제"),
     filename: str | None = Query(None, description="다운로드 파일명"),
     expires_in: int = Query(900, description="URL 유효시간(초, 60~3600)"),
 ):
     """Presigned URL 생성 (다운로드/조회용)"""
-    if key.startswith("/") or ".." in key:
+    if invalid_key(key):
         raise HTTPException(status_code=400, detail="Invalid key")
 
-    # 파일 존재 확인
-    try:
-        s3_internal.head_object(Bucket=S3_BUCKET, Key=key)
-    except ClientError as e:
-        code = e.response.get("Error", {}).get("Code")
-        if code in ("404", "NoSuchKey", "NotFound"):
-            raise HTTPException(status_code=404, detail="Object not found")
-        raise
-
-    # 만료 시간 클램핑 (60~3600초)
-    effective_expiry = max(60, min(expires_in, 3600))
-    
-    # Presigned URL 파라미터 구성
-    params = {
-        "Bucket": S3_BUCKET,
-        "Key": key
-    }
+    # 파일 존재 확인 (캐시 → DB 행 → DB에 없는 키만 HEAD)
+    if not await object_exists(db, key):
+        raise HTTPException(status_code=404, detail="Object not found")
+
+    effective_expiry = clamp_expiry(expires_in)
     
-    # 다운로드 모드
-    if as_download:
-        safe = filename or os.path.basename(key) or "download"
-        params["ResponseContentDisposition"] = f"attachment; filename*=UTF-8''{urllib.parse.quote(safe)}"
+    # 추가 파라미터 (다운로드 모드)
+    params = download_params(key, filename) if as_download else {}
     
-    url = s3_public.generate_presigned_url(
-        "get_object",
-        Params=params,
-        ExpiresIn=effective_expiry,
-    )
+    url = presign_get_url(key, effective_expiry, **params)
     
     return ImageResponse(
         url=url,
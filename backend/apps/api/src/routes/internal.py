@@ -0,0 +1,43 @@
+from fastapi import APIRouter, HTTPException, Header, Depends
+from src.models.schemas import RevokeRequest
+from src.utils.auth import revoke_token, revoke_user, token_cache_stats
+from src.utils.s3 import presign_cache_stats
+from src.utils.uploads import object_cache_stats
+from src.utils.page_cache import page_cache_stats
+from src.utils.singleflight import singleflight_stats
+from src.models.engine import pool_stats
+from src.config import INTERNAL_API_TOKEN
+import secrets
+
+
+def require_internal_token(x_internal_token: str = Header("")):
+    """서비스 간 호출 전용 (INTERNAL_API_TOKEN 미설정 시 엔드포인트 비활성화)"""
+    if not INTERNAL_API_TOKEN or not secrets.compare_digest(x_internal_token, INTERNAL_API_TOKEN):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+router = APIRouter(prefix="/internal", dependencies=[Depends(require_internal_token)])
+
+
+@router.post("/auth/revoke")
+def push_revocations(req: RevokeRequest):
+    """Auth 서버가 폐기된 토큰/사용자를 푸시"""
+    for token_hash in req.token_hashes:
+        revoke_token(token_hash)
+    for user_id in req.user_ids:
+        revoke_user(user_id)
+
+    return {"revoked_tokens": len(req.token_hashes), "revoked_users": len(req.user_ids)}
+
+
+@router.get("/metrics")
+def get_metrics():
+    """캐시 등 내부 지표"""
+    return {
+        "auth_cache": token_cache_stats(),
+        "presign_cache": presign_cache_stats(),
+        "object_cache": object_cache_stats(),
+        "listing_cache": page_cache_stats(),
+        "singleflight": singleflight_stats(),
+        "db_pool": pool_stats(),
+    }
@@ -1,53 +1,324 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm.session import Session
-from src.models.schemas import UploadRequest, UploadResponse
+from fastapi import APIRouter, HTTPException, Depends, Path, Response
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models.schemas import (
+    UploadRequest, UploadResponse, UploadCompleteResponse,
+    MultipartUploadRequest, MultipartUploadResponse, MultipartPartsRequest, MultipartPartsResponse,
+    MultipartCompleteRequest, BatchUploadRequest, BatchUploadItem, BatchUploadResponse
+)
 from src.models.database import get_db
-from src.models.image import Image
-from src.utils.s3 import s3_public
+from src.models.image import Image, ImageStatus
+from src.models.multipart import MultipartUpload
+from src.models.variant import ImageVariant
+from src.utils.s3 import presigner, presign_post
 from src.utils.auth import get_current_user
-from src.config import S3_BUCKET, ALLOWED_EXT, ALLOWED_MIME, MAX_SIZE
+from src.utils.jobs import enqueue_upload_jobs
+from src.utils.listing import bump_listing_versions
+from src.utils.uploads import verify_upload, invalidate_object, find_stored_object, find_stored_objects
+from src.utils.multipart import create_multipart, presign_parts, list_parts, complete_multipart, abort_multipart
+from src.config import (
+    S3_BUCKET, ALLOWED_EXT, ALLOWED_MIME, MAX_SIZE, PRESIGN_PUT_EXPIRES, MULTIPART_PART_SIZE,
+    UPLOAD_BATCH_MAX_ITEMS
+)
+import math
 import uuid
 import os
 
 router = APIRouter()
 
-@router.post("/uploads", response_model=UploadResponse)
-def create_presigned_put(req: UploadRequest, db: Session = Depends(get_db), user_id: int = Depends(get_current_user)):
-    """Presigned URL 생성 (업로드용)"""
-    if req.size > MAX_SIZE:
+
+def new_object_key(filename: str, content_type: str, size: int) -> str:
+    """업로드 요청 검증 후 원본 키 생성 (originals/<uuid>.<ext>)"""
+    if size > MAX_SIZE:
         raise HTTPException(status_code=400, detail="File too large")
 
-    ext = os.path.splitext(req.filename)[1].lower()
-    if ext not in ALLOWED_EXT or req.contentType not in ALLOWED_MIME:
+    ext = os.path.splitext(filename)[1].lower()
+    if ext not in ALLOWED_EXT or content_type not in ALLOWED_MIME:
         raise HTTPException(status_code=400, detail="Unsupported file type")
 
-    object_key = f"originals/{uuid.uuid4().hex}{ext}"
+    return f"originals/{uuid.uuid4().hex}{ext}"
 
-    url = s3_public.generate_presigned_url(
-        "put_object",
-        Params={
-            "Bucket": S3_BUCKET,
-            "Key": object_key,
-        },
-        ExpiresIn=3600,
-    )
-     
-    # ✅ DB에 메타데이터 저장 (이미 받은 db 사용)
+
+async def save_pending_image(db: AsyncSession, image: Image, multipart: MultipartUpload | None = None):
+    """pending 이미지 행 저장 (멀티파트 추적 행도 같은 트랜잭션에)"""
     try:
-        image = Image(
-            user_id=user_id,
-            object_key=object_key,
-            filename=req.filename,
-            content_type=req.contentType,
-            size=req.size
-        )
         db.add(image)
-        db.commit()
-        db.refresh(image)
+        if multipart is not None:
+            await db.flush()
+            multipart.image_id = image.id
+            db.add(multipart)
+        await db.commit()
         print(f"✅ Image saved: ID={image.id}")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"❌ DB Error: {e}")
         raise HTTPException(500, f"Database error: {str(e)}")
 
-    return UploadResponse(presignedUrl=url, objectKey=object_key)
\ No newline at end of file
+
+async def finish_upload(db: AsyncSession, image: Image) -> UploadCompleteResponse:
+    """pending이면 실제 객체를 확인해 ready/rejected/quarantined로 전환하고 결과 반환"""
+    # 이미 처리된 업로드는 그대로 반환 (재시도 안전)
+    if image.status == ImageStatus.PENDING:
+        reason = await verify_upload(db, image)
+        if image.status == ImageStatus.PENDING:
+            raise HTTPException(status_code=409, detail="Object not uploaded yet")
+        await db.commit()
+        invalidate_object(image.object_key)  # commit 후 (그 전의 조회가 pending을 다시 캐시하지 않게)
+        if reason:
+            raise HTTPException(status_code=400, detail=reason)
+
+    if image.status != ImageStatus.READY:
+        raise HTTPException(status_code=400, detail=f"Upload {image.status}")
+
+    return UploadCompleteResponse(
+        objectKey=image.object_key,
+        status=image.status,
+        size=image.size,
+        contentType=image.content_type
+    )
+
+
+def presign_upload(object_key: str, req: UploadRequest) -> UploadResponse:
+    """업로드용 presigned PUT URL 또는 POST 정책 (로컬 서명, S3 호출 없음)"""
+    if req.mode == "post":
+        post = presign_post(object_key, req.contentType, MAX_SIZE, PRESIGN_PUT_EXPIRES)
+        return UploadResponse(presignedUrl=post["url"], objectKey=object_key, method="POST", fields=post["fields"])
+    url = presigner.presign("PUT", S3_BUCKET, object_key, PRESIGN_PUT_EXPIRES)
+    return UploadResponse(presignedUrl=url, objectKey=object_key)
+
+
+async def add_shared_image(db: AsyncSession, source: Image, user_id: int, filename: str) -> Image:
+    """
+    이미 있는 객체를 가리키는 ready 이미지 행 추가 (업로드/완료 확인 없음, commit과 목록 버전은 호출자가)
+
+    파생본 행도 복사해 바로 썸네일이 나오고, 후처리 작업은 워커가 중복으로 연결만 한다.
+    """
+    image = Image(
+        user_id=user_id,
+        object_key=source.object_key,
+        filename=filename,
+        content_type=source.content_type,
+        size=source.size,
+        width=source.width,
+        height=source.height,
+        status=ImageStatus.READY
+    )
+    db.add(image)
+    await db.flush()
+    variants = (await db.scalars(select(ImageVariant).where(ImageVariant.image_id == source.id))).all()
+    db.add_all(
+        ImageVariant(
+            image_id=image.id, object_key=variant.object_key, format=variant.format,
+            width=variant.width, height=variant.height, size=variant.size,
+        )
+        for variant in variants
+    )
+    await enqueue_upload_jobs(db, image)
+    return image
+
+
+async def share_stored_object(db: AsyncSession, source: Image, user_id: int, filename: str) -> Image:
+    """이미 있는 객체를 가리키는 ready 이미지 행 저장 (POST /uploads의 alreadyPresent)"""
+    try:
+        image = await add_shared_image(db, source, user_id, filename)
+        await bump_listing_versions(db, user_id)
+        await db.commit()
+        print(f"♻️ Image saved: ID={image.id} (shares {source.object_key})")
+    except Exception as e:
+        await db.rollback()
+        print(f"❌ DB Error: {e}")
+        raise HTTPException(500, f"Database error: {str(e)}")
+    return image
+
+
+@router.post("/uploads", response_model=UploadResponse)
+async def create_presigned_put(req: UploadRequest, db: AsyncSession = Depends(get_db), user_id: int = Depends(get_current_user)):
+    """
+    Presigned URL 생성 (업로드용, mode=post면 크기/타입 조건이 걸린 POST 정책)
+
+    sha256을 보냈고 같은 내용이 이미 올라와 있으면 URL 대신 alreadyPresent를 돌려준다 (전송 생략).
+    """
+    object_key = new_object_key(req.filename, req.contentType, req.size)
+
+    if req.sha256:
+        source = await find_stored_object(db, req.sha256, req.size)
+        if source is not None:
+            image = await share_stored_object(db, source, user_id, req.filename)
+            return UploadResponse(objectKey=image.object_key, method=None, alreadyPresent=True)
+
+    response = presign_upload(object_key, req)
+     
+    # ✅ DB에 메타데이터 저장 (업로드 완료 확인 전까지 pending - 목록에 노출되지 않음)
+    await save_pending_image(db, Image(
+        user_id=user_id,
+        object_key=object_key,
+        filename=req.filename,
+        content_type=req.contentType,
+        size=req.size,
+        status=ImageStatus.PENDING
+    ))
+
+    return response
+
+
+@router.post("/uploads/batch", response_model=BatchUploadResponse)
+async def create_presigned_puts(req: BatchUploadRequest, db: AsyncSession = Depends(get_db), user_id: int = Depends(get_current_user)):
+    """
+    여러 파일 업로드 예약 (앨범)
+
+    항목마다 검증/서명하고, 통과한 항목의 pending 행은 INSERT 한 번 + commit 한 번으로 저장한다.
+    검증에 실패한 항목은 error만 채워 돌려주고 나머지는 그대로 진행 (부분 실패).
+    sha256을 보낸 항목은 POST /uploads처럼 같은 내용을 찾아(쿼리 한 번) 있으면 alreadyPresent로 공유한다.
+    """
+    if not req.items:
+        raise HTTPException(status_code=400, detail="No items")
+    if len(req.items) > UPLOAD_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Too many items (max {UPLOAD_BATCH_MAX_ITEMS})")
+
+    stored = await find_stored_objects(db, {(item.sha256.lower(), item.size) for item in req.items if item.sha256})
+
+    results, rows, shared = [], [], []
+    for index, item in enumerate(req.items):
+        try:
+            object_key = new_object_key(item.filename, item.contentType, item.size)
+        except HTTPException as e:
+            results.append(BatchUploadItem(index=index, error=e.detail))
+            continue
+        source = stored.get((item.sha256.lower(), item.size)) if item.sha256 else None
+        if source is not None:
+            results.append(BatchUploadItem(index=index, objectKey=source.object_key, alreadyPresent=True))
+            shared.append((source, item.filename))
+            continue
+        results.append(BatchUploadItem(index=index, **presign_upload(object_key, item).model_dump()))
+        rows.append({
+            "user_id": user_id,
+            "object_key": object_key,
+            "filename": item.filename,
+            "content_type": item.contentType,
+            "size": item.size,
+            "status": ImageStatus.PENDING,
+        })
+
+    if rows or shared:
+        try:
+            if rows:
+                await db.execute(insert(Image), rows)
+            for source, filename in shared:
+                await add_shared_image(db, source, user_id, filename)
+            if shared:
+                await bump_listing_versions(db, user_id)
+            await db.commit()
+            print(f"✅ Images saved: {len(rows)} pending, {len(shared)} shared")
+        except Exception as e:
+            await db.rollback()
+            print(f"❌ DB Error: {e}")
+            raise HTTPException(500, f"Database error: {str(e)}")
+
+    accepted = len(rows) + len(shared)
+    return BatchUploadResponse(items=results, accepted=accepted, failed=len(results) - accepted)
+
+
+# ===== 멀티파트 업로드 (/uploads/{key:path}/complete보다 먼저 등록해야 경로가 가려지지 않음) =====
+
+async def get_multipart_upload(db: AsyncSession, upload_id: int, user_id: int) -> tuple[MultipartUpload, Image]:
+    row = (await db.execute(
+        select(MultipartUpload, Image)
+        .join(Image, Image.id == MultipartUpload.image_id)
+        .where(MultipartUpload.id == upload_id, Image.user_id == user_id)
+    )).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return row.MultipartUpload, row.Image
+
+
+@router.post("/uploads/multipart", response_model=MultipartUploadResponse)
+async def create_multipart_upload(req: MultipartUploadRequest, db: AsyncSession = Depends(get_db), user_id: int = Depends(get_current_user)):
+    """
+    멀티파트 업로드 시작 + 모든 파트 URL 발급
+
+    파트는 병렬로 올릴 수 있고, 연결이 끊기면 실패한 파트만 다시 올리면 된다.
+    """
+    object_key = new_object_key(req.filename, req.contentType, req.size)
+    part_count = max(1, math.ceil(req.size / MULTIPART_PART_SIZE))
+
+    upload_id = await create_multipart(object_key, req.contentType)
+    image = Image(
+        user_id=user_id,
+        object_key=object_key,
+        filename=req.filename,
+        content_type=req.contentType,
+        size=req.size,
+        status=ImageStatus.PENDING
+    )
+    upload = MultipartUpload(upload_id=upload_id, part_size=MULTIPART_PART_SIZE, part_count=part_count)
+    await save_pending_image(db, image, upload)
+
+    return MultipartUploadResponse(
+        uploadId=upload.id,
+        objectKey=object_key,
+        partSize=MULTIPART_PART_SIZE,
+        parts=presign_parts(object_key, upload_id, list(range(1, part_count + 1))),
+    )
+
+
+@router.post("/uploads/multipart/{upload_id}/parts", response_model=MultipartPartsResponse)
+async def presign_multipart_parts(
+    upload_id: int,
+    req: MultipartPartsRequest,
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user)
+):
+    """파트 URL 다시 발급 (URL 만료 후 이어 올리기)"""
+    upload, image = await get_multipart_upload(db, upload_id, user_id)
+    if not req.partNumbers or any(not 1 <= number <= upload.part_count for number in req.partNumbers):
+        raise HTTPException(status_code=400, detail=f"Part numbers must be between 1 and {upload.part_count}")
+
+    return MultipartPartsResponse(parts=presign_parts(image.object_key, upload.upload_id, sorted(set(req.partNumbers))))
+
+
+@router.post("/uploads/multipart/{upload_id}/complete", response_model=UploadCompleteResponse)
+async def complete_multipart_upload(
+    upload_id: int,
+    req: MultipartCompleteRequest | None = None,
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user)
+):
+    """파트를 합치고 업로드 완료 확인 (이후 재시도는 POST /uploads/{objectKey}/complete)"""
+    upload, image = await get_multipart_upload(db, upload_id, user_id)
+
+    if req is not None and req.parts:
+        parts = [{"PartNumber": part.partNumber, "ETag": part.etag} for part in req.parts]
+    else:
+        parts = await list_parts(image.object_key, upload.upload_id)
+    await complete_multipart(image.object_key, upload.upload_id, parts)
+
+    await db.delete(upload)
+    return await finish_upload(db, image)
+
+
+@router.delete("/uploads/multipart/{upload_id}", status_code=204)
+async def abort_multipart_upload(upload_id: int, db: AsyncSession = Depends(get_db), user_id: int = Depends(get_current_user)):
+    """멀티파트 업로드 중단 (올라간 파트 삭제, 이미지 행은 expired)"""
+    upload, image = await get_multipart_upload(db, upload_id, user_id)
+
+    await abort_multipart(image.object_key, upload.upload_id)
+    image.status = ImageStatus.EXPIRED
+    await db.delete(upload)
+    await db.commit()
+    return Response(status_code=204)
+
+
+@router.post("/uploads/{key:path}/complete", response_model=UploadCompleteResponse)
+async def complete_upload(
+    key: str = Path(..., description="POST /uploads 응답의 objectKey"),
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user)
+):
+    """업로드 완료 확인 (HEAD로 크기/타입 확인 후 ready 전환)"""
+    image = (await db.scalars(
+        select(Image).where(Image.object_key == key, Image.user_id == user_id)
+    )).first()
+    if image is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+
+    return await finish_upload(db, image)
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException, Path, Query, Depends
-from sqlalchemy.orm.session import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.models.database import get_db
 from src.models.user import User
 from src.models.schemas import UserResponse
@@ -7,9 +7,9 @@ from src.models.schemas import UserResponse
 router = APIRouter()
 
 @router.get("/users/{user_id}", response_model=UserResponse)
-def get_user(user_id: int, db: Session = Depends(get_db)):  # ✅ async 제거
+async def get_user(user_id: int, db: AsyncSession = Depends(get_db)):
     """사용자 정보 조회"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
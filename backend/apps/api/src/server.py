@@ -1,10 +1,35 @@
+from contextlib import asynccontextmanager
+import asyncio
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
-from src.routes import upload, image
-from src.utils.s3 import wait_for_bucket
-from src.config import CORS_ORIGINS
+from src.routes import upload, image, internal
+from src.utils.s3 import wait_for_bucket, start_s3_executor, close_s3_executor
+from src.utils.auth import start_auth_client, close_auth_client
+from src.utils.uploads import run_upload_sweeper
+from src.utils.page_cache import start_page_cache, close_page_cache
+from src.models.database import SessionLocal
+from src.config import CORS_ORIGINS, UPLOAD_SWEEP_INTERVAL
 
-app = FastAPI(title="Image Upload API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작 시 S3 스레드풀/MinIO 버킷, Auth 클라이언트 풀, 목록 캐시, 업로드 스위퍼 준비, 종료 시 정리"""
+    start_s3_executor()
+    await wait_for_bucket()
+    await start_auth_client()
+    await start_page_cache()
+    sweeper = None
+    if UPLOAD_SWEEP_INTERVAL > 0:
+        sweeper = asyncio.create_task(run_upload_sweeper(SessionLocal, UPLOAD_SWEEP_INTERVAL))
+    yield
+    if sweeper is not None:
+        sweeper.cancel()
+    await close_page_cache()
+    await close_auth_client()
+    close_s3_executor()
+
+
+app = FastAPI(title="Image Upload API", lifespan=lifespan)
 
 # CORS 미들웨어
 app.add_middleware(
@@ -18,12 +43,7 @@ app.add_middleware(
 # 라우터 포함
 app.include_router(upload.router, tags=["Upload"])
 app.include_router(image.router, tags=["Image"])
-
-# 시작 이벤트
-@app.on_event("startup")
-async def on_startup():
-    """서버 시작 시 MinIO 연결 및 버킷 생성"""
-    await wait_for_bucket()
+app.include_router(internal.router, tags=["Internal"], include_in_schema=False)
 
 # 헬스체크
 @app.get("/health")
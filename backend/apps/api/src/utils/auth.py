@@ -1,33 +1,261 @@
 from fastapi import HTTPException, Depends
 from fastapi.security import HTTPBearer
+from jose import jwt, JWTError
+import asyncio
+import hashlib
 import httpx
-import os
+import random
+import time
+from src.config import (
+    AUTH_SERVICE_URL, JWT_SECRET, JWT_ALGORITHM,
+    JWT_JWKS_URL, JWKS_CACHE_TTL, JWKS_MIN_REFRESH_INTERVAL,
+    TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL, TOKEN_REVOCATION_TTL,
+    AUTH_HTTP_MAX_CONNECTIONS, AUTH_HTTP_MAX_KEEPALIVE, AUTH_HTTP_KEEPALIVE_EXPIRY,
+    AUTH_HTTP_TIMEOUT, AUTH_HTTP_CONNECT_TIMEOUT, AUTH_HTTP2,
+    AUTH_HTTP_RETRIES, AUTH_HTTP_RETRY_BACKOFF
+)
+from src.utils.cache import TTLCache, ExpiringDict
 
 security = HTTPBearer()
 
-AUTH_SERVICE_URL = os.getenv("AUTH_SERVICE_URL", "http://auth:8000")
+# 검증된 토큰 캐시: 토큰 해시 -> (user_id, iat)
+_token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL)
+
+# 폐기 목록: 토큰 해시 -> True, user_id -> 폐기 시각 (이전에 발급된 토큰 전부 무효)
+# 개수 제한으로 빠지면 폐기된 토큰이 다시 통과하므로 LRU가 아닌 TTL로만 만료
+_revoked_tokens = ExpiringDict(ttl=TOKEN_REVOCATION_TTL)
+_revoked_users = ExpiringDict(ttl=TOKEN_REVOCATION_TTL)
+
+
+# Auth 서비스 호출용 클라이언트 (lifespan에서 생성/종료)
+_http_client: httpx.AsyncClient | None = None
+
+
+def _http2_enabled() -> bool:
+    if not AUTH_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        print("⚠️ AUTH_HTTP2=true but 'h2' is not installed, falling back to HTTP/1.1")
+        return False
+
+
+def _create_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=AUTH_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=AUTH_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=AUTH_HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(AUTH_HTTP_TIMEOUT, connect=AUTH_HTTP_CONNECT_TIMEOUT),
+        http2=_http2_enabled(),
+    )
+
+
+async def start_auth_client():
+    """앱 시작 시 커넥션 풀 생성"""
+    global _http_client
+    if _http_client is None:
+        _http_client = _create_http_client()
+
+
+async def close_auth_client():
+    """앱 종료 시 커넥션 풀 정리"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def get_auth_client() -> httpx.AsyncClient:
+    """공유 클라이언트 (lifespan 밖에서 호출되면 지연 생성)"""
+    global _http_client
+    if _http_client is None:
+        _http_client = _create_http_client()
+    return _http_client
+
+
+async def _request_with_retry(method: str, url: str, **kwargs) -> httpx.Response:
+    """
+    연결 단계 실패만 재시도 (요청이 전송되지 않았으므로 안전)
+    대기 시간은 지수 증가 + full jitter
+    """
+    client = get_auth_client()
+    for attempt in range(AUTH_HTTP_RETRIES + 1):
+        try:
+            return await client.request(method, url, **kwargs)
+        except (httpx.ConnectError, httpx.ConnectTimeout):
+            if attempt == AUTH_HTTP_RETRIES:
+                raise
+            await asyncio.sleep(random.uniform(0, AUTH_HTTP_RETRY_BACKOFF * (2 ** attempt)))
+
+
+class UnknownSigningKey(Exception):
+    """로컬에 검증 키가 없음 → Auth 서버 원격 검증으로 위임"""
+
+
+# 공개키 세트 캐시 (kid -> JWK)
+_jwks_cache = {"keys": {}, "fetched_at": 0.0}
+
+
+async def _fetch_jwks() -> dict:
+    """Auth 서버(JWKS URL)에서 공개키 세트 조회"""
+    response = await _request_with_retry("GET", JWT_JWKS_URL)
+    response.raise_for_status()
+    return response.json()
+
+
+async def _get_public_key(kid: str | None) -> dict | None:
+    """
+    kid에 해당하는 공개키 반환 (캐시 우선)
+
+    캐시가 만료됐거나 모르는 kid면 재조회하되,
+    잘못된 kid로 Auth 서버를 두드리지 않도록 최소 간격을 둔다.
+    """
+    now = time.monotonic()
+    age = now - _jwks_cache["fetched_at"]
+    keys = _jwks_cache["keys"]
+
+    if age > JWKS_CACHE_TTL or (kid not in keys and age > JWKS_MIN_REFRESH_INTERVAL):
+        try:
+            jwks = await _fetch_jwks()
+            keys = {k.get("kid"): k for k in jwks.get("keys", [])}
+            _jwks_cache["keys"] = keys
+            _jwks_cache["fetched_at"] = now
+        except (httpx.HTTPError, ValueError) as e:
+            # 조회 실패 시 기존 캐시로 계속 동작 (Auth 서버 일시 장애 대비)
+            print(f"⚠️ JWKS fetch failed: {e}")
+
+    return keys.get(kid)
+
+
+def _user_id_from_claims(payload: dict) -> int:
+    """Access 토큰 페이로드에서 user_id 추출 (/auth/verify와 동일한 기준)"""
+    if payload.get("type") == "refresh" or "user_id" not in payload or "email" not in payload:
+        raise HTTPException(401, "Invalid token")
+    return payload["user_id"]
+
+
+async def verify_token_locally(token: str) -> dict:
+    """
+    Auth 서버와 같은 서명 설정으로 JWT를 프로세스 내에서 검증
+
+    Returns:
+        검증된 페이로드
+
+    Raises:
+        UnknownSigningKey: 로컬 검증에 필요한 키가 없을 때
+        HTTPException(401): 서명/만료 검증 실패
+    """
+    if JWT_ALGORITHM.startswith("HS"):
+        if not JWT_SECRET:
+            raise UnknownSigningKey()
+        key = JWT_SECRET
+    else:
+        if not JWT_JWKS_URL:
+            raise UnknownSigningKey()
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError:
+            raise HTTPException(401, "Invalid token")
+        key = await _get_public_key(header.get("kid"))
+        if key is None:
+            raise UnknownSigningKey()
+
+    try:
+        return jwt.decode(token, key, algorithms=[JWT_ALGORITHM])
+    except JWTError:
+        raise HTTPException(401, "Invalid token")
+
+
+async def verify_token_remote(token: str) -> int:
+    """Auth 서버 /auth/verify로 검증 요청"""
+    try:
+        response = await _request_with_retry(
+            "POST",
+            f"{AUTH_SERVICE_URL}/auth/verify",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+    except httpx.RequestError:
+        raise HTTPException(503, "Auth service unavailable")
+
+    if response.status_code != 200:
+        raise HTTPException(401, "Invalid token")
+
+    try:
+        return response.json()["user_id"]
+    except (ValueError, KeyError) as e:
+        raise HTTPException(401, f"Authentication failed: {str(e)}")
+
+
+def hash_token(token: str) -> str:
+    """캐시/폐기 목록 키 (원본 토큰은 메모리에 보관하지 않음)"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def revoke_token(token_hash: str):
+    """토큰 하나 폐기"""
+    _revoked_tokens.set(token_hash, True)
+    _token_cache.pop(token_hash)
+
+
+def revoke_user(user_id: int, revoked_at: float | None = None):
+    """revoked_at 이전에 발급된 사용자의 모든 토큰 폐기 (로그아웃, 계정 정지 등)"""
+    _revoked_users.set(user_id, revoked_at if revoked_at is not None else time.time())
+
+
+def _is_user_revoked(user_id: int, issued_at: float) -> bool:
+    revoked_at = _revoked_users.get(user_id)
+    return revoked_at is not None and issued_at <= revoked_at
+
+
+def token_cache_stats() -> dict:
+    return {
+        "tokens": _token_cache.stats(),
+        "revoked_tokens": len(_revoked_tokens),
+        "revoked_users": len(_revoked_users),
+    }
+
 
 async def get_current_user(credentials = Depends(security)) -> int:
     """
     JWT 토큰에서 user_id 추출
-    Auth 서버에 검증 요청
+    캐시 → 로컬 검증 → (검증 키를 모를 때만) Auth 서버 검증 순서
     """
     token = credentials.credentials
-    
+    token_hash = hash_token(token)
+
+    if _revoked_tokens.get(token_hash):
+        raise HTTPException(401, "Token revoked")
+
+    cached = _token_cache.get(token_hash)
+    if cached is not None:
+        user_id, issued_at = cached
+        if _is_user_revoked(user_id, issued_at):
+            _token_cache.pop(token_hash)
+            raise HTTPException(401, "Token revoked")
+        return user_id
+
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{AUTH_SERVICE_URL}/auth/verify",
-                headers={"Authorization": f"Bearer {token}"}
-            )
-            
-            if response.status_code != 200:
-                raise HTTPException(401, "Invalid token")
-            
-            data = response.json()
-            return data["user_id"]
-            
-    except httpx.RequestError:
-        raise HTTPException(503, "Auth service unavailable")
-    except Exception as e:
-        raise HTTPException(401, f"Authentication failed: {str(e)}")
\ No newline at end of file
+        payload = await verify_token_locally(token)
+        user_id = _user_id_from_claims(payload)
+    except UnknownSigningKey:
+        user_id = await verify_token_remote(token)
+        # Auth 서버가 검증한 토큰이므로 exp/iat는 서명 확인 없이 읽어도 됨
+        try:
+            payload = jwt.get_unverified_claims(token)
+        except JWTError:
+            payload = {}
+
+    issued_at = float(payload.get("iat") or 0)
+    if _is_user_revoked(user_id, issued_at):
+        raise HTTPException(401, "Token revoked")
+
+    # min(토큰 exp, TOKEN_CACHE_TTL) 동안 캐시
+    exp = payload.get("exp")
+    if exp is not None:
+        _token_cache.set(token_hash, (user_id, issued_at), ttl=float(exp) - time.time())
+
+    return user_id
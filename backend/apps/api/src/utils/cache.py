@@ -0,0 +1,147 @@
+from collections import OrderedDict, deque
+import threading
+import time
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    크기 제한 LRU + 항목별 만료(TTL) 인메모리 캐시
+
+    - maxsize(항목 수) 또는 max_bytes(sizeof 합계)를 넘으면 가장 오래 사용하지 않은 항목부터 제거
+    - 항목마다 만료 시각을 따로 가짐 (기본값: ttl초)
+    - hit/miss/eviction 카운터 제공
+    - 스레드풀에서 도는 sync 라우트와 공유하므로 Lock으로 보호
+    """
+
+    def __init__(self, maxsize: int, ttl: float, max_bytes: int | None = None, sizeof=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof or (lambda value: 0)
+        self._bytes = 0
+        self._data: OrderedDict = OrderedDict()  # key -> (expires_at, value, size)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """조회 (만료된 항목은 miss로 처리하고 제거)"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            expires_at, value, size = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float | None = None):
+        """저장 (ttl은 기본 ttl보다 길어질 수 없음)"""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+
+        size = self._sizeof(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._data[key] = (time.monotonic() + ttl, value, size)
+            self._bytes += size
+            while len(self._data) > self.maxsize or (
+                self.max_bytes is not None and self._bytes > self.max_bytes and len(self._data) > 1
+            ):
+                _, (_, _, evicted_size) = self._data.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        """항목 제거 (무효화)"""
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+            if entry is not _MISSING:
+                self._bytes -= entry[2]
+        return default if entry is _MISSING else entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """모니터링용 카운터"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class ExpiringDict:
+    """
+    크기 제한 없이 TTL로만 만료되는 저장소 (폐기 목록처럼 개수 때문에 빠지면 안 되는 데이터)
+
+    모든 항목의 ttl이 같으므로 넣은 순서가 곧 만료 순서 → 앞에서부터 만료된 항목만 정리한다.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._data: dict = {}  # key -> (expires_at, value)
+        self._order: deque = deque()  # (expires_at, key), 넣은 순서
+        self._lock = threading.Lock()
+
+    def _purge(self, now: float):
+        while self._order and self._order[0][0] <= now:
+            expires_at, key = self._order.popleft()
+            entry = self._data.get(key)
+            if entry is not None and entry[0] == expires_at:  # 다시 넣은 키는 새 만료 시각 기준
+                del self._data[key]
+
+    def get(self, key, default=None):
+        with self._lock:
+            now = time.monotonic()
+            self._purge(now)
+            entry = self._data.get(key)
+            return default if entry is None or entry[0] <= now else entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            now = time.monotonic()
+            self._purge(now)
+            expires_at = now + self.ttl
+            self._data[key] = (expires_at, value)
+            self._order.append((expires_at, key))
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._order.clear()
+
+    def __len__(self):
+        with self._lock:
+            self._purge(time.monotonic())
+            return len(self._data)
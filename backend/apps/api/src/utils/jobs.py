@@ -0,0 +1,29 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models.image import Image
+from src.models.job import Job
+from src.config import UPLOAD_JOB_KINDS
+
+
+async def enqueue_job(db: AsyncSession, kind: str, payload: dict, dedupe_key: str):
+    """
+    워커 작업 등록 (같은 dedupe_key가 있으면 무시, commit은 호출자가)
+
+    상태 변경과 같은 트랜잭션에서 등록하면 커밋된 변경에 대해서만 작업이 생긴다.
+    """
+    insert = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+    await db.execute(
+        insert(Job)
+        .values(kind=kind, payload=payload, dedupe_key=dedupe_key)
+        .on_conflict_do_nothing(index_elements=["dedupe_key"])
+    )
+
+
+async def enqueue_upload_jobs(db: AsyncSession, image: Image):
+    """ready가 된 업로드의 후처리 작업 등록"""
+    for kind in UPLOAD_JOB_KINDS:
+        await enqueue_job(
+            db, kind,
+            {"image_id": image.id, "object_key": image.object_key},
+            dedupe_key=f"{kind}:{image.id}",
+        )
@@ -0,0 +1,130 @@
+import json
+import time
+from fastapi import Response
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models.listing_version import ListingVersion
+from src.utils import page_cache
+from src.utils.singleflight import SingleFlight
+from src.config import PRESIGN_BUCKET_SECONDS, LIST_CACHE_MAX_AGE, LISTING_CACHE_TTL
+
+PUBLIC_SCOPE = "public"
+
+# 첫 페이지가 아닌 목록 조회 (캐시하지 않고 동시에 온 같은 조회만 합침)
+_page_flights = SingleFlight("listing_page")
+
+
+def user_scope(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+async def bump_listing_versions(db: AsyncSession, user_id: int):
+    """
+    공개 목록 + 업로더 목록 버전 +1 (commit은 호출자가)
+
+    행 잠금으로 증가가 직렬화되므로 늦게 커밋된 변경도 버전을 놓치지 않는다.
+    (잠금 순서는 항상 public → user)
+    """
+    insert = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+    for scope in (PUBLIC_SCOPE, user_scope(user_id)):
+        await db.execute(
+            insert(ListingVersion)
+            .values(scope=scope, version=1)
+            .on_conflict_do_update(index_elements=["scope"], set_={"version": ListingVersion.version + 1})
+        )
+
+
+async def listing_version(db: AsyncSession, scope: str) -> int:
+    """현재 버전 (기본 키 조회 한 번, 아직 변경이 없으면 0)"""
+    return await db.scalar(select(ListingVersion.version).where(ListingVersion.scope == scope)) or 0
+
+
+def listing_etag(scope: str, version: int, formats: list[str]) -> str:
+    """
+    목록 약한 ETag (범위 + 버전 + presign 버킷 + 썸네일 형식)
+
+    presigned URL은 버킷 안에서 같으므로 버전과 버킷이 같으면 응답도 같다.
+    버킷이 바뀌면 ETag도 바뀌어 오래된 URL이 담긴 사본을 304로 연장하지 않는다.
+    """
+    bucket = int(time.time() // PRESIGN_BUCKET_SECONDS)
+    return f'W/"{scope}.{version}.{bucket}.{"-".join(formats)}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match 약한 비교 (W/ 무시, 쉼표로 나열된 값/* 지원)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tag = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == tag for candidate in if_none_match.split(","))
+
+
+def _bucket_remaining() -> float:
+    """현재 presign 버킷이 끝날 때까지 남은 시간(초)"""
+    return PRESIGN_BUCKET_SECONDS - time.time() % PRESIGN_BUCKET_SECONDS
+
+
+def cache_control(public: bool) -> str:
+    """브라우저 캐시 시간은 LIST_CACHE_MAX_AGE, 단 현재 presign 버킷이 끝나기 전까지만 (URL 유효시간 보장)"""
+    max_age = int(min(LIST_CACHE_MAX_AGE, _bucket_remaining()))
+    return f"{'public' if public else 'private'}, max-age={max_age}, must-revalidate"
+
+
+async def conditional_listing(
+    db: AsyncSession,
+    response: Response,
+    scope: str,
+    formats: list[str],
+    if_none_match: str | None,
+    public: bool = False,
+) -> Response | None:
+    """
+    목록 응답에 ETag/Cache-Control을 붙이고, 클라이언트 사본이 최신이면 304 응답 반환
+
+    버전을 페이지 조회보다 먼저 읽는다: 그 사이 커밋된 변경은 응답에 들어가고 다음 요청에서 ETag가 바뀐다.
+    """
+    etag = listing_etag(scope, await listing_version(db, scope), formats)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control(public),
+        "Vary": "Accept",  # 썸네일 형식이 Accept에 따라 달라짐
+    }
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
+
+
+async def cached_first_page(response: Response, name: str, params: tuple, render) -> Response:
+    """
+    직렬화된 첫 페이지를 캐시에서 응답 (없으면 render()로 한 번만 만들어 저장)
+
+    키 = 목록 이름 + ETag(범위/버전/presign 버킷/형식) + 쿼리 파라미터.
+    같은 버킷 안에서는 presigned URL이 같으므로 캐시된 바이트는 새로 만든 응답과 같다.
+    conditional_listing이 붙인 헤더를 그대로 쓴다.
+    """
+    etag = response.headers["ETag"]
+
+    async def render_json() -> bytes:
+        # FastAPI 기본 JSONResponse와 같은 직렬화
+        return json.dumps(await render(), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+    body = await page_cache.get_page_cache().get_or_render(
+        f"{name}|{etag}|{'|'.join(map(str, params))}",
+        render_json,
+        ttl=min(LISTING_CACHE_TTL, _bucket_remaining()),
+    )
+    headers = {name: response.headers[name] for name in ("ETag", "Cache-Control", "Vary")}
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def coalesced_page(response: Response, name: str, params: tuple, render) -> dict:
+    """
+    첫 페이지가 아닌 목록 (캐시하지 않음)
+
+    같은 목록/버전/파라미터 조회가 동시에 오면 한 번만 조회/서명하고 결과를 나눠 쓴다.
+    """
+    return await _page_flights.do((name, response.headers["ETag"], *params), render)
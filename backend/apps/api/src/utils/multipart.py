@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta, timezone
+from botocore.exceptions import ClientError
+from fastapi import HTTPException
+from sqlalchemy import delete, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models.multipart import MultipartUpload
+from src.utils.s3 import s3_internal, presigner, run_s3, S3Timeout
+from src.config import S3_BUCKET, PRESIGN_PUT_EXPIRES, MULTIPART_UPLOAD_TTL
+
+# 파트 목록 검증 실패 (클라이언트가 다시 올리거나 파트 목록을 고쳐야 함)
+_INVALID_PART_CODES = {"InvalidPart", "InvalidPartOrder", "EntityTooSmall", "MalformedXML"}
+
+
+async def _call(fn, **kwargs):
+    """S3 호출 (스토리지 지연 시 503, 없는 업로드는 404)"""
+    try:
+        return await run_s3(fn, Bucket=S3_BUCKET, **kwargs)
+    except S3Timeout:
+        raise HTTPException(status_code=503, detail="Storage timeout")
+    except ClientError as e:
+        code = e.response.get("Error", {}).get("Code")
+        if code == "NoSuchUpload":
+            raise HTTPException(status_code=404, detail="Upload not found")
+        if code in _INVALID_PART_CODES:
+            raise HTTPException(status_code=400, detail=f"Invalid parts: {code}")
+        raise
+
+
+async def create_multipart(key: str, content_type: str) -> str:
+    """멀티파트 업로드 시작 (S3 UploadId 반환)"""
+    response = await _call(s3_internal.create_multipart_upload, Key=key, ContentType=content_type)
+    return response["UploadId"]
+
+
+def presign_parts(key: str, upload_id: str, part_numbers: list[int], expires_in: int = PRESIGN_PUT_EXPIRES) -> list[dict]:
+    """
+    파트별 업로드 URL (UploadPart presigned PUT)
+
+    S3 호출 없이 로컬에서 서명하므로 파트 수가 많아도 한 번의 요청으로 돌려줄 수 있다.
+    """
+    return [
+        {
+            "partNumber": number,
+            "url": presigner.presign("PUT", S3_BUCKET, key, expires_in, query={"partNumber": number, "uploadId": upload_id}),
+        }
+        for number in part_numbers
+    ]
+
+
+async def list_parts(key: str, upload_id: str) -> list[dict]:
+    """스토리지에 올라간 파트 목록 (완료 요청에 ETag가 없을 때 사용)"""
+    parts, marker = [], 0
+    while True:
+        response = await _call(s3_internal.list_parts, Key=key, UploadId=upload_id, PartNumberMarker=marker)
+        parts += [{"PartNumber": part["PartNumber"], "ETag": part["ETag"]} for part in response.get("Parts", [])]
+        if not response.get("IsTruncated"):
+            return parts
+        marker = response["NextPartNumberMarker"]
+
+
+async def complete_multipart(key: str, upload_id: str, parts: list[dict]):
+    """파트를 하나의 객체로 합침 (스토리지 내부 작업, 바이트를 다시 받지 않음)"""
+    if not parts:
+        raise HTTPException(status_code=400, detail="No parts uploaded")
+    await _call(
+        s3_internal.complete_multipart_upload,
+        Key=key,
+        UploadId=upload_id,
+        MultipartUpload={"Parts": sorted(parts, key=lambda part: part["PartNumber"])},
+    )
+
+
+async def abort_multipart(key: str, upload_id: str):
+    """멀티파트 업로드 중단 (올라간 파트 삭제, 이미 끝난 업로드면 무시)"""
+    try:
+        await _call(s3_internal.abort_multipart_upload, Key=key, UploadId=upload_id)
+    except HTTPException as e:
+        if e.status_code != 404:
+            raise
+
+
+def _list_stale_uploads(cutoff: datetime) -> list[tuple[str, str]]:
+    stale, params = [], {"Bucket": S3_BUCKET, "Prefix": "originals/"}
+    while True:
+        response = s3_internal.list_multipart_uploads(**params)
+        stale += [
+            (upload["Key"], upload["UploadId"])
+            for upload in response.get("Uploads", [])
+            if upload["Initiated"] < cutoff
+        ]
+        if not response.get("IsTruncated"):
+            return stale
+        params.update(KeyMarker=response["NextKeyMarker"], UploadIdMarker=response["NextUploadIdMarker"])
+
+
+async def abort_stale_multipart_uploads(db: AsyncSession, max_age: int = MULTIPART_UPLOAD_TTL) -> int:
+    """
+    방치된 멀티파트 업로드 정리
+
+    스토리지의 list_multipart_uploads가 기준이므로 DB 행이 없는 업로드도 중단한다.
+    (중단하지 않으면 올라간 파트가 보이지 않는 채로 용량을 차지함)
+    이미지 행은 pending 스위퍼가 expired로 정리한다.
+
+    Returns:
+        중단한 업로드 수
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age)
+    try:
+        stale = await run_s3(_list_stale_uploads, cutoff)
+    except S3Timeout:
+        return 0
+
+    for key, upload_id in stale:
+        await abort_multipart(key, upload_id)
+
+    await db.execute(delete(MultipartUpload).where(or_(
+        MultipartUpload.upload_id.in_([upload_id for _, upload_id in stale]),
+        MultipartUpload.created_at < cutoff.replace(tzinfo=None),
+    )))
+    await db.commit()
+    return len(stale)
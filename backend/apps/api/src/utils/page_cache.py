@@ -0,0 +1,190 @@
+import asyncio
+import time
+from src.utils.cache import TTLCache
+from src.utils.singleflight import SingleFlight
+from src.config import (
+    LISTING_CACHE_URL, LISTING_CACHE_SIZE, LISTING_CACHE_MAX_BYTES, LISTING_CACHE_TTL,
+    LISTING_CACHE_LOCK_TIMEOUT
+)
+
+_LOCK_POLL_INTERVAL = 0.05
+
+
+class MemoryPageBackend:
+    """프로세스 내 LRU (기본값, uvicorn 워커마다 따로)"""
+
+    name = "memory"
+
+    def __init__(self, maxsize: int = LISTING_CACHE_SIZE, max_bytes: int = LISTING_CACHE_MAX_BYTES, ttl: float = LISTING_CACHE_TTL):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl, max_bytes=max_bytes, sizeof=len)
+
+    async def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        self._cache.set(key, value, ttl=ttl)
+
+    async def lock(self, key: str, ttl: float) -> bool:
+        return True  # 프로세스 안의 동시 요청은 SingleFlight가 합침
+
+    async def unlock(self, key: str):
+        pass
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+class RedisPageBackend:
+    """
+    Redis 호환 서버 공유 캐시 (모든 uvicorn 워커/인스턴스가 같은 페이지를 봄)
+
+    client는 redis.asyncio.Redis와 같은 get/set(px, nx)/delete 인터페이스면 된다.
+    서버 장애는 캐시 miss로 처리한다 (목록 응답은 계속 직접 만듦).
+    """
+
+    name = "redis"
+
+    def __init__(self, client, prefix: str = "listing:"):
+        self.client = client
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _error(self, op: str, e: Exception):
+        self.errors += 1
+        print(f"⚠️ Listing cache {op} failed: {e!r}")
+
+    async def get(self, key: str) -> bytes | None:
+        try:
+            value = await self.client.get(self.prefix + key)
+        except Exception as e:
+            self._error("get", e)
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        try:
+            await self.client.set(self.prefix + key, value, px=max(1, int(ttl * 1000)))
+        except Exception as e:
+            self._error("set", e)
+
+    async def lock(self, key: str, ttl: float) -> bool:
+        """다른 프로세스가 이 페이지를 만들고 있지 않으면 잠금 획득 (SET NX, ttl 후 자동 해제)"""
+        try:
+            return bool(await self.client.set(f"{self.prefix}lock:{key}", b"1", px=max(1, int(ttl * 1000)), nx=True))
+        except Exception as e:
+            self._error("lock", e)
+            return True
+
+    async def unlock(self, key: str):
+        try:
+            await self.client.delete(f"{self.prefix}lock:{key}")
+        except Exception as e:
+            self._error("unlock", e)
+
+    async def close(self):
+        await self.client.aclose()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class PageCache:
+    """
+    직렬화된 목록 페이지 캐시
+
+    키에 목록 버전(ETag)이 들어가므로 업로드 완료로 버전이 오르면 모든 워커에서 바로 miss가 된다.
+    (따로 지우지 않아도 예전 항목은 TTL/LRU로 사라짐)
+    miss가 몰려도 프로세스 안에서는 SingleFlight로, 프로세스 사이에서는 백엔드 잠금으로 한 번만 만든다.
+    """
+
+    def __init__(self, backend, lock_timeout: float = LISTING_CACHE_LOCK_TIMEOUT):
+        self.backend = backend
+        self.lock_timeout = lock_timeout
+        self._flights = SingleFlight("listing_first_page")
+        self.renders = 0
+
+    async def get_or_render(self, key: str, render, ttl: float) -> bytes:
+        """
+        캐시된 페이지 바이트, 없으면 render()로 만들어 저장
+
+        render: 직렬화된 페이지(bytes)를 돌려주는 async 함수
+        """
+        body = await self.backend.get(key)
+        if body is not None:
+            return body
+        return await self._flights.do(key, lambda: self._fill(key, render, ttl))
+
+    async def _fill(self, key: str, render, ttl: float) -> bytes:
+        locked = await self.backend.lock(key, self.lock_timeout)
+        if not locked:
+            # 다른 프로세스가 만드는 중 → 결과를 기다렸다가 사용 (제한 시간 안에 없으면 직접 만듦)
+            deadline = time.monotonic() + self.lock_timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(_LOCK_POLL_INTERVAL)
+                body = await self.backend.get(key)
+                if body is not None:
+                    return body
+
+        try:
+            self.renders += 1
+            body = await render()
+            await self.backend.set(key, body, ttl)
+            return body
+        finally:
+            if locked:
+                await self.backend.unlock(key)
+
+    def stats(self) -> dict:
+        return {"backend": self.backend.name, "renders": self.renders, "inflight": len(self._flights), **self.backend.stats()}
+
+
+def _create_backend():
+    if not LISTING_CACHE_URL:
+        return MemoryPageBackend()
+    try:
+        import redis.asyncio as redis
+    except ImportError:
+        print("⚠️ LISTING_CACHE_URL is set but 'redis' is not installed, falling back to in-process cache")
+        return MemoryPageBackend()
+    return RedisPageBackend(redis.from_url(LISTING_CACHE_URL))
+
+
+# 목록 첫 페이지 캐시 (lifespan에서 공유 백엔드로 교체, lifespan 밖에서는 프로세스 내 LRU)
+page_cache = PageCache(MemoryPageBackend())
+
+
+async def start_page_cache():
+    """앱 시작 시 설정된 백엔드 연결 (LISTING_CACHE_URL)"""
+    global page_cache
+    page_cache = PageCache(_create_backend())
+
+
+async def close_page_cache():
+    """앱 종료 시 공유 백엔드 연결 정리"""
+    global page_cache
+    if isinstance(page_cache.backend, RedisPageBackend):
+        await page_cache.backend.close()
+    page_cache = PageCache(MemoryPageBackend())
+
+
+def get_page_cache() -> PageCache:
+    return page_cache
+
+
+def page_cache_stats() -> dict:
+    return page_cache.stats()
@@ -0,0 +1,50 @@
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+from datetime import datetime
+import base64
+from src.models.image import Image
+
+
+def encode_cursor(created_at: datetime, image_id: int) -> str:
+    """(created_at, id)를 불투명한 커서 문자열로 인코딩"""
+    raw = f"{created_at.isoformat()}|{image_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """커서 디코딩 (잘못된 커서는 400)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, image_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(image_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def apply_keyset(query, cursor: str | None, limit: int, skip: int = 0):
+    """
+    (created_at, id) 내림차순 키셋 페이지네이션 적용 (select() 문에 조건 추가)
+
+    커서가 있으면 인덱스 범위 탐색으로 다음 페이지를 바로 찾으므로
+    페이지 깊이와 무관하게 일정한 비용. skip(OFFSET)은 하위 호환용.
+    다음 페이지 존재 여부 확인을 위해 limit + 1개를 조회한다.
+    """
+    query = query.order_by(Image.created_at.desc(), Image.id.desc())
+
+    if cursor:
+        created_at, image_id = decode_cursor(cursor)
+        query = query.where(tuple_(Image.created_at, Image.id) < (created_at, image_id))
+    elif skip:
+        query = query.offset(skip)
+
+    return query.limit(limit + 1)
+
+
+def split_page(rows: list, limit: int, image_of=lambda row: row) -> tuple[list, str | None]:
+    """limit + 1개 조회 결과를 (현재 페이지, next_cursor)로 분리"""
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = image_of(rows[-1])
+    return rows, encode_cursor(last.created_at, last.id)
@@ -1,10 +1,20 @@
 import boto3
 import asyncio
+import functools
+import hashlib
+import hmac
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urlsplit
 from botocore.exceptions import ClientError, EndpointConnectionError
 from src.config import (
     S3_ENDPOINT, S3_ACCESS_KEY, S3_SECRET_KEY, S3_BUCKET,
-    PUBLIC_S3_BASEURL, BOTO_CONFIG
+    PUBLIC_S3_BASEURL, BOTO_CONFIG,
+    PRESIGN_BUCKET_SECONDS, PRESIGN_CACHE_SIZE, PRESIGN_CACHE_MAX_BYTES,
+    S3_MAX_CONCURRENCY, S3_CALL_TIMEOUT
 )
+from src.utils.cache import TTLCache
 
 # 내부용 클라이언트 (서버->MinIO)
 s3_internal = boto3.client(
@@ -26,6 +36,226 @@ s3_public = boto3.client(
     region_name="us-east-1",
 )
 
+
+def _hmac_sha256(key: bytes, msg: str) -> bytes:
+    return hmac.new(key, msg.encode(), hashlib.sha256).digest()
+
+
+class SigV4Presigner:
+    """
+    S3 presigned URL 전용 SigV4 서명기
+
+    boto3 generate_presigned_url은 호출마다 요청 객체 생성, 이벤트 훅, 서명기 파이프라인을 거친다.
+    여기서는 날짜별 서명 키를 한 번만 유도해 캐시하고 쿼리 문자열 서명을 직접 계산한다.
+    같은 입력(path-style, s3v4, 서명 시각)에 대해 boto3와 바이트 단위로 같은 URL을 만든다.
+    """
+
+    def __init__(self, endpoint_url: str, access_key: str, secret_key: str, region: str = "us-east-1"):
+        parts = urlsplit(endpoint_url)
+        self.base_url = f"{parts.scheme}://{parts.netloc}"
+        self.host = parts.hostname
+        if parts.port is not None and parts.port != {"http": 80, "https": 443}.get(parts.scheme):
+            self.host = f"{self.host}:{parts.port}"
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self._signing_key = (None, None)  # (datestamp, key) - 하루에 한 번만 유도
+
+    def _get_signing_key(self, datestamp: str) -> bytes:
+        cached_date, key = self._signing_key
+        if cached_date != datestamp:
+            key = _hmac_sha256(("AWS4" + self.secret_key).encode(), datestamp)
+            key = _hmac_sha256(key, self.region)
+            key = _hmac_sha256(key, "s3")
+            key = _hmac_sha256(key, "aws4_request")
+            self._signing_key = (datestamp, key)
+        return key
+
+    def presign(
+        self,
+        method: str,
+        bucket: str,
+        key: str,
+        expires_in: int,
+        query: dict | None = None,
+        signed_at: float | None = None,
+    ) -> str:
+        """
+        presigned URL 생성
+
+        Args:
+            method: "GET" / "PUT"
+            query: 추가 쿼리 파라미터 (S3 이름 그대로, 예: response-content-disposition, uploadId)
+            signed_at: 서명 시각 (epoch 초, 기본값: 현재)
+        """
+        amz_date = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime(signed_at if signed_at is not None else time.time()))
+        datestamp = amz_date[:8]
+        scope = f"{datestamp}/{self.region}/s3/aws4_request"
+
+        path = f"/{quote(bucket, safe='-._~')}/{quote(key, safe='/~')}"
+        operation_params = [
+            (quote(k, safe="-_.~"), quote(str(v), safe="-_.~")) for k, v in (query or {}).items()
+        ]
+        auth_params = [
+            ("X-Amz-Algorithm", "AWS4-HMAC-SHA256"),
+            ("X-Amz-Credential", quote(f"{self.access_key}/{scope}", safe="-_.~")),
+            ("X-Amz-Date", amz_date),
+            ("X-Amz-Expires", str(expires_in)),
+            ("X-Amz-SignedHeaders", "host"),
+        ]
+        params = operation_params + auth_params
+
+        canonical_request = "\n".join((
+            method,
+            path,
+            "&".join(f"{k}={v}" for k, v in sorted(params)),
+            f"host:{self.host}\n",
+            "host",
+            "UNSIGNED-PAYLOAD",
+        ))
+        string_to_sign = "\n".join((
+            "AWS4-HMAC-SHA256",
+            amz_date,
+            scope,
+            hashlib.sha256(canonical_request.encode()).hexdigest(),
+        ))
+        signature = hmac.new(
+            self._get_signing_key(datestamp), string_to_sign.encode(), hashlib.sha256
+        ).hexdigest()
+
+        query_string = "&".join(f"{k}={v}" for k, v in params)
+        return f"{self.base_url}{path}?{query_string}&X-Amz-Signature={signature}"
+
+
+# 외부용 presigner (s3_public과 같은 엔드포인트/자격 증명)
+presigner = SigV4Presigner(
+    s3_public.meta.endpoint_url,
+    S3_ACCESS_KEY,
+    S3_SECRET_KEY,
+    region=s3_public.meta.region_name,
+)
+
+# boto3 파라미터명 -> S3 쿼리 파라미터명 (조회용 응답 헤더 덮어쓰기)
+_RESPONSE_QUERY_PARAMS = {
+    "ResponseCacheControl": "response-cache-control",
+    "ResponseContentDisposition": "response-content-disposition",
+    "ResponseContentEncoding": "response-content-encoding",
+    "ResponseContentLanguage": "response-content-language",
+    "ResponseContentType": "response-content-type",
+    "ResponseExpires": "response-expires",
+}
+
+# 조회용 presigned URL 캐시: (key, 만료, 추가 파라미터, 버킷 번호) -> URL
+_presign_cache = TTLCache(
+    maxsize=PRESIGN_CACHE_SIZE,
+    ttl=PRESIGN_BUCKET_SECONDS,
+    max_bytes=PRESIGN_CACHE_MAX_BYTES,
+    sizeof=sys.getsizeof,
+)
+
+
+def presign_get_url(key: str, expires_in: int, **extra_params) -> str:
+    """
+    조회용 presigned URL (만료 시간 버킷 단위 캐시)
+
+    시간을 PRESIGN_BUCKET_SECONDS 단위 버킷으로 나눠 같은 버킷 안에서는
+    같은 객체에 같은 URL을 돌려준다 (HMAC 서명 재계산 없음, 브라우저/CDN 캐시 적중).
+    서명 시각을 버킷 시작 시각으로 고정하므로 워커가 여러 개여도 URL이 같고,
+    버킷 안 어느 시점에 받아도 최소 expires_in초는 유효하도록 버킷 길이만큼 더 길게 서명한다.
+    """
+    now = time.time()
+    bucket_index = int(now // PRESIGN_BUCKET_SECONDS)
+    cache_key = (key, expires_in, tuple(sorted(extra_params.items())), bucket_index)
+
+    url = _presign_cache.get(cache_key)
+    if url is None:
+        bucket_start = bucket_index * PRESIGN_BUCKET_SECONDS
+        if all(name in _RESPONSE_QUERY_PARAMS for name in extra_params):
+            url = presigner.presign(
+                "GET", S3_BUCKET, key, expires_in + PRESIGN_BUCKET_SECONDS,
+                query={_RESPONSE_QUERY_PARAMS[name]: value for name, value in extra_params.items()},
+                signed_at=bucket_start,
+            )
+        else:
+            # 빠른 경로가 모르는 파라미터는 boto3로 처리
+            url = s3_public.generate_presigned_url(
+                "get_object",
+                Params={"Bucket": S3_BUCKET, "Key": key, **extra_params},
+                ExpiresIn=expires_in + PRESIGN_BUCKET_SECONDS,
+            )
+        _presign_cache.set(cache_key, url, ttl=bucket_start + PRESIGN_BUCKET_SECONDS - now)
+
+    return url
+
+
+def presign_post(key: str, content_type: str, max_size: int, expires_in: int) -> dict:
+    """
+    업로드용 presigned POST 정책 (크기/Content-Type을 스토리지가 검사)
+
+    PUT URL은 아무 크기/타입이나 받지만, POST 정책의 조건을 어기면
+    스토리지가 바이트를 저장하기 전에 요청을 거부한다.
+
+    Returns:
+        {"url": ..., "fields": {...}}
+    """
+    return s3_public.generate_presigned_post(
+        S3_BUCKET,
+        key,
+        Fields={"Content-Type": content_type},
+        Conditions=[
+            ["content-length-range", 1, max_size],
+            {"Content-Type": content_type},
+        ],
+        ExpiresIn=expires_in,
+    )
+
+
+def presign_cache_stats() -> dict:
+    return _presign_cache.stats()
+
+
+class S3Timeout(Exception):
+    """S3 호출이 S3_CALL_TIMEOUT 안에 끝나지 않음"""
+
+
+# boto3 호출 전용 스레드풀 (lifespan에서 생성/종료)
+# anyio 기본 스레드풀과 분리해 느린 S3가 sync 라우트까지 막지 않게 하고, 동시 호출 수를 제한한다
+_executor: ThreadPoolExecutor | None = None
+
+
+def start_s3_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=S3_MAX_CONCURRENCY, thread_name_prefix="s3")
+
+
+def close_s3_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def run_s3(fn, *args, timeout: float | None = None, **kwargs):
+    """
+    blocking boto3 호출을 이벤트 루프 밖에서 실행
+
+    Usage:
+        head = await run_s3(s3_internal.head_object, Bucket=S3_BUCKET, Key=key)
+
+    Raises:
+        S3Timeout: 큐 대기 포함 timeout(기본 S3_CALL_TIMEOUT)초 초과
+                   (스레드에서 진행 중인 호출은 boto3 소켓 타임아웃으로 끝남)
+    """
+    start_s3_executor()
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+    try:
+        return await asyncio.wait_for(future, timeout or S3_CALL_TIMEOUT)
+    except asyncio.TimeoutError as e:
+        raise S3Timeout(f"S3 call {getattr(fn, '__name__', fn)} timed out") from e
+
+
 def ensure_bucket():
     """버킷 존재 확인 및 생성"""
     try:
@@ -40,10 +270,10 @@ async def wait_for_bucket():
     
     for attempt in range(max_retries):
         try:
-            ensure_bucket()
+            await run_s3(ensure_bucket)
             print(f"✅ Successfully connected to MinIO and ensured bucket '{S3_BUCKET}' exists")
             return
-        except EndpointConnectionError as e:
+        except (EndpointConnectionError, S3Timeout) as e:
             if attempt < max_retries - 1:
                 print(f"⏳ MinIO not ready yet (attempt {attempt + 1}/{max_retries}), retrying in {backoff}s...")
                 await asyncio.sleep(backoff)
@@ -52,4 +282,4 @@ async def wait_for_bucket():
                 raise RuntimeError(f"❌ MinIO is still unavailable after {max_retries} retries") from e
         except Exception as e:
             print(f"⚠️ Unexpected error while connecting to MinIO: {e}")
-            raise
\ No newline at end of file
+            raise
@@ -0,0 +1,75 @@
+import asyncio
+
+# 이름 -> SingleFlight (GET /internal/metrics)
+_registry: dict = {}
+
+
+class SingleFlight:
+    """
+    같은 키의 동시 계산을 하나로 합침 (먼저 온 요청이 계산, 나머지는 그 결과를 기다림)
+
+    결과를 보관하지는 않는다 (끝나면 다음 호출은 다시 계산, 캐시는 호출자가).
+    계산하던 요청이 취소되면 기다리던 요청 중 하나가 이어서 계산한다.
+    name을 주면 지표(calls/executions/coalesced)가 singleflight_stats()에 나온다.
+    """
+
+    def __init__(self, name: str | None = None):
+        self._inflight: dict = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0  # 다른 요청의 계산 결과를 기다린 호출 수
+        if name:
+            _registry[name] = self
+
+    async def do(self, key, fn):
+        """fn()을 키당 한 번만 실행하고 같은 결과(또는 예외)를 모두에게 돌려줌"""
+        self.calls += 1
+        waited = False
+        while True:
+            future = self._inflight.get(key)
+            if future is None:
+                break
+            if not waited:
+                self.coalesced += 1
+                waited = True
+            try:
+                # shield: 기다리던 요청이 취소돼도 공유 future는 취소하지 않음
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # 이 요청 자신이 취소됨
+                # 계산하던 요청이 취소됨 → 다시 확인 후 직접 계산
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.executions += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 기다리는 요청이 없어도 "never retrieved" 경고가 나지 않게
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    def __len__(self):
+        return len(self._inflight)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+            "coalesce_ratio": round(self.coalesced / self.calls, 4) if self.calls else 0.0,
+        }
+
+
+def singleflight_stats() -> dict:
+    return {name: flights.stats() for name, flights in _registry.items()}
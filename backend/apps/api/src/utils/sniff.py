@@ -0,0 +1,106 @@
+import struct
+from typing import NamedTuple
+
+
+class Sniffed(NamedTuple):
+    """앞부분 바이트로 알아낸 실제 형식/크기 (크기를 못 찾으면 None)"""
+    mime: str
+    width: int | None = None
+    height: int | None = None
+    next_offset: int | None = None  # JPEG: 크기 정보(SOF)가 더 뒤에 있으면 이어서 읽을 파일 위치
+
+
+# SOF 마커 (DHT/JPG/DAC 제외) - 프레임 헤더에 높이/너비가 있음
+_JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def scan_jpeg(data: bytes, pos: int = 0) -> tuple[tuple[int, int] | None, int | None]:
+    """
+    JPEG 세그먼트를 pos부터 따라가며 SOF의 (너비, 높이) 찾기
+
+    APP(EXIF 등) 세그먼트는 길이만 보고 건너뛴다.
+
+    Returns:
+        ((너비, 높이), None) 또는 (None, 다음 세그먼트 위치 - data 밖이면 이어서 읽을 곳, 깨졌으면 None)
+    """
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            return None, None
+        marker = data[pos + 1]
+        if marker == 0xFF:  # 채움 바이트
+            pos += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:  # 길이 없는 마커
+            pos += 2
+            continue
+        if marker in (0xD9, 0xDA):  # EOI / 스캔 시작 전에 SOF가 없으면 깨진 파일
+            return None, None
+
+        length = struct.unpack(">H", data[pos + 2:pos + 4])[0]
+        if length < 2:
+            return None, None
+        if marker in _JPEG_SOF:
+            if pos + 9 > len(data):
+                return None, pos
+            height, width = struct.unpack(">HH", data[pos + 5:pos + 9])
+            return (width, height), None
+        pos += 2 + length
+    return None, pos
+
+
+def _sniff_webp(data: bytes) -> Sniffed:
+    chunk = data[12:16]
+    if chunk == b"VP8 " and len(data) >= 30:
+        width, height = struct.unpack("<HH", data[26:30])
+        return Sniffed("image/webp", width & 0x3FFF, height & 0x3FFF)
+    if chunk == b"VP8L" and len(data) >= 25:
+        bits = int.from_bytes(data[21:25], "little")
+        return Sniffed("image/webp", (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1)
+    if chunk == b"VP8X" and len(data) >= 30:
+        return Sniffed(
+            "image/webp",
+            int.from_bytes(data[24:27], "little") + 1,
+            int.from_bytes(data[27:30], "little") + 1,
+        )
+    return Sniffed("image/webp")
+
+
+def _sniff_avif(data: bytes) -> Sniffed | None:
+    """ISO BMFF ftyp 브랜드로 AVIF 판별, 크기는 ispe(이미지 공간 크기) 속성에서"""
+    box_size = struct.unpack(">I", data[0:4])[0]
+    brands = data[8:12] + data[16:min(box_size, len(data))]
+    if not any(brands[i:i + 4] in (b"avif", b"avis") for i in range(0, len(brands) - 3, 4)):
+        return None
+
+    ispe = data.find(b"ispe")
+    if ispe != -1 and ispe + 16 <= len(data):
+        width, height = struct.unpack(">II", data[ispe + 8:ispe + 16])
+        return Sniffed("image/avif", width, height)
+    return Sniffed("image/avif")
+
+
+def sniff_image(data: bytes) -> Sniffed | None:
+    """
+    객체 앞부분(몇 KB)으로 실제 이미지 형식/크기 판별 (JPEG/PNG/WebP/AVIF)
+
+    Returns:
+        알 수 없는 형식이면 None
+    """
+    if data.startswith(b"\xff\xd8\xff"):
+        size, next_offset = scan_jpeg(data, 2)
+        if size:
+            return Sniffed("image/jpeg", *size)
+        return Sniffed("image/jpeg", next_offset=next_offset)
+
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        if data[12:16] == b"IHDR" and len(data) >= 24:
+            return Sniffed("image/png", *struct.unpack(">II", data[16:24]))
+        return Sniffed("image/png")
+
+    if data[0:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return _sniff_webp(data)
+
+    if len(data) >= 12 and data[4:8] == b"ftyp":
+        return _sniff_avif(data)
+
+    return None
@@ -0,0 +1,265 @@
+import asyncio
+from datetime import datetime, timedelta
+from botocore.exceptions import ClientError
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models.image import Image, ImageStatus
+from src.models.image_hash import ImageHash
+from src.utils.cache import TTLCache
+from src.utils.jobs import enqueue_upload_jobs
+from src.utils.listing import bump_listing_versions
+from src.utils.multipart import abort_stale_multipart_uploads
+from src.utils.s3 import s3_internal, run_s3, S3Timeout
+from src.utils.sniff import Sniffed, scan_jpeg, sniff_image
+from src.utils.singleflight import SingleFlight
+from src.config import (
+    S3_BUCKET, ALLOWED_MIME, MAX_SIZE, PENDING_UPLOAD_TTL, UPLOAD_SWEEP_BATCH,
+    OBJECT_CACHE_SIZE, OBJECT_CACHE_TTL, OBJECT_CACHE_NEGATIVE_TTL,
+    SNIFF_BYTES, SNIFF_MAX_READS, MAX_IMAGE_PIXELS, QUARANTINE_PREFIX
+)
+
+# 오브젝트 키 -> 조회 가능 여부 (True: ready 행 또는 DB 밖의 기존 객체)
+_object_cache = TTLCache(maxsize=OBJECT_CACHE_SIZE, ttl=OBJECT_CACHE_TTL)
+# 캐시 miss인 같은 키의 동시 확인은 한 번만 (공유된 이미지에 요청이 몰릴 때)
+_object_flights = SingleFlight("object_exists")
+
+
+async def head_object(key: str) -> dict | None:
+    """HEAD 한 번으로 객체 메타데이터 조회 (없으면 None, 스토리지 지연 시 503)"""
+    try:
+        return await run_s3(s3_internal.head_object, Bucket=S3_BUCKET, Key=key)
+    except S3Timeout:
+        raise HTTPException(status_code=503, detail="Storage timeout")
+    except ClientError as e:
+        code = e.response.get("Error", {}).get("Code")
+        if code in ("404", "NoSuchKey", "NotFound"):
+            return None
+        raise
+
+
+async def object_exists(db: AsyncSession, key: str) -> bool:
+    """
+    조회 가능한 객체인지 확인 (캐시 → images 테이블 → HEAD 순)
+
+    images 행이 있으면 행 상태가 기준 (ready만 존재로 취급, S3 호출 없음).
+    DB에 없는 키(직접 넣은 객체 등)만 HEAD로 확인한다.
+    없음/미완료 결과는 완료 처리로 바뀔 수 있으므로 짧게 캐시한다.
+    캐시 miss에 같은 키 요청이 몰리면 DB 조회/HEAD는 한 번만 하고 나머지는 그 결과를 기다린다.
+    """
+    cached = _object_cache.get(key)
+    if cached is not None:
+        return cached
+    return await _object_flights.do(key, lambda: _lookup_object(db, key))
+
+
+async def _lookup_object(db: AsyncSession, key: str) -> bool:
+    statuses = (await db.scalars(select(Image.status).where(Image.object_key == key))).all()
+    if statuses:
+        exists = ImageStatus.READY in statuses
+    else:
+        exists = await head_object(key) is not None
+
+    _object_cache.set(key, exists, ttl=None if exists else OBJECT_CACHE_NEGATIVE_TTL)
+    return exists
+
+
+def invalidate_object(key: str):
+    """상태가 바뀐 객체의 캐시 제거 (완료 처리/스위퍼)"""
+    _object_cache.pop(key)
+
+
+def object_cache_stats() -> dict:
+    return _object_cache.stats()
+
+
+async def find_stored_object(db: AsyncSession, sha256: str, size: int) -> Image | None:
+    """
+    같은 내용의 ready 이미지 (업로드 전 SHA-256 핸드셰이크)
+
+    해시는 워커가 실제 원본 바이트로 계산한 image_hashes 값이고, 클라이언트가 보낸 값은 조회 키로만 쓴다.
+    선언한 크기도 같아야 재사용한다. 가장 먼저 올라온 이미지(중복들의 대표)를 우선한다.
+    """
+    return (await db.scalars(
+        select(Image)
+        .join(ImageHash, ImageHash.image_id == Image.id)
+        .where(ImageHash.sha256 == sha256.lower(), Image.status == ImageStatus.READY, Image.size == size)
+        .order_by(Image.id)
+        .limit(1)
+    )).first()
+
+
+async def find_stored_objects(db: AsyncSession, keys: set[tuple[str, int]]) -> dict[tuple[str, int], Image]:
+    """find_stored_object의 여러 건 버전 ((sha256 소문자, 크기) -> 대표 이미지, 쿼리 한 번)"""
+    if not keys:
+        return {}
+    rows = (await db.execute(
+        select(ImageHash.sha256, Image)
+        .join(ImageHash, ImageHash.image_id == Image.id)
+        .where(ImageHash.sha256.in_({sha256 for sha256, _ in keys}), Image.status == ImageStatus.READY)
+        .order_by(Image.id)
+    )).all()
+    found = {}
+    for sha256, image in rows:
+        if (sha256, image.size) in keys:
+            found.setdefault((sha256, image.size), image)
+    return found
+
+
+def rejection_reason(size: int, content_type: str | None) -> str | None:
+    """실제 업로드된 객체가 업로드 제한을 위반하면 사유 반환"""
+    if size > MAX_SIZE:
+        return "File too large"
+    if content_type not in ALLOWED_MIME:
+        return "Unsupported file type"
+    return None
+
+
+def _read_range(key: str, start: int, length: int) -> bytes:
+    response = s3_internal.get_object(Bucket=S3_BUCKET, Key=key, Range=f"bytes={start}-{start + length - 1}")
+    return response["Body"].read()
+
+
+async def read_range(key: str, start: int, length: int) -> bytes:
+    """객체 일부만 ranged GET (범위가 객체 밖이면 빈 바이트, 스토리지 지연 시 503)"""
+    try:
+        return await run_s3(_read_range, key, start, length)
+    except S3Timeout:
+        raise HTTPException(status_code=503, detail="Storage timeout")
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "InvalidRange":
+            return b""
+        raise
+
+
+async def sniff_object(key: str) -> Sniffed | None:
+    """
+    객체 앞 SNIFF_BYTES만 읽어 실제 형식/크기 판별 (파일 크기와 무관하게 일정한 비용)
+
+    JPEG의 크기 정보(SOF)가 큰 EXIF 뒤에 있으면 세그먼트 길이로 위치를 계산해
+    그 부분만 이어서 읽는다 (최대 SNIFF_MAX_READS번).
+    """
+    sniffed = sniff_image(await read_range(key, 0, SNIFF_BYTES))
+    reads = 1
+    while sniffed and sniffed.width is None and sniffed.next_offset is not None and reads < SNIFF_MAX_READS:
+        offset = sniffed.next_offset
+        size, next_pos = scan_jpeg(await read_range(key, offset, SNIFF_BYTES))
+        sniffed = Sniffed(
+            sniffed.mime, *(size or (None, None)),
+            next_offset=None if next_pos is None else offset + next_pos,
+        )
+        reads += 1
+    return sniffed
+
+
+def content_mismatch(sniffed: Sniffed | None, content_type: str | None) -> str | None:
+    """실제 내용이 선언한 형식과 다르면 사유 반환 (격리 대상)"""
+    if sniffed is None:
+        return "Unrecognized image format"
+    if sniffed.mime != content_type:
+        return f"Content is {sniffed.mime}, not {content_type}"
+    if sniffed.width == 0 or sniffed.height == 0:
+        return "Invalid image dimensions"
+    return None
+
+
+def _move_object(src: str, dst: str):
+    s3_internal.copy_object(Bucket=S3_BUCKET, Key=dst, CopySource={"Bucket": S3_BUCKET, "Key": src})
+    s3_internal.delete_object(Bucket=S3_BUCKET, Key=src)
+
+
+async def quarantine_object(key: str):
+    """검증 실패 객체를 quarantine/ 아래로 옮김 (서버측 복사, 원래 키로는 더 이상 접근 불가)"""
+    try:
+        await run_s3(_move_object, key, QUARANTINE_PREFIX + key)
+    except S3Timeout:
+        raise HTTPException(status_code=503, detail="Storage timeout")
+
+
+async def verify_upload(db: AsyncSession, image: Image) -> str | None:
+    """
+    pending 업로드를 HEAD + 앞부분 ranged GET으로 확인하고 상태 전환 (commit과 캐시 무효화는 호출자가)
+
+    객체가 아직 없으면 pending 그대로 둔다.
+    크기/선언 타입이 제한을 넘거나 앞부분에서 가로/세로를 알 수 없으면 rejected, 실제 바이트가 선언과 다르면 quarantined.
+    ready가 되면 같은 트랜잭션에 워커 후처리 작업을 등록하고 목록 버전을 올린다.
+
+    Returns:
+        rejected/quarantined로 바뀐 경우 사유, 그 외 None
+    """
+    head = await head_object(image.object_key)
+    if head is None:
+        return None
+
+    # presigned PUT은 크기/타입을 강제하지 않으므로 실제 값으로 갱신
+    image.size = head["ContentLength"]
+    image.content_type = head.get("ContentType")
+
+    reason = rejection_reason(image.size, image.content_type)
+    if reason:
+        image.status = ImageStatus.REJECTED
+    else:
+        # 선언(Content-Type)이 아니라 실제 바이트로 형식 확인
+        sniffed = await sniff_object(image.object_key) if image.size else None
+        reason = content_mismatch(sniffed, image.content_type)
+        if reason:
+            image.status = ImageStatus.QUARANTINED
+            await quarantine_object(image.object_key)
+            print(f"🚫 Quarantined {image.object_key}: {reason}")
+        else:
+            image.width, image.height = sniffed.width, sniffed.height
+            if not (image.width and image.height):
+                # 크기 정보를 SNIFF_MAX_READS 안에서 못 찾음 → 픽셀 수 제한을 확인할 수 없으므로 ready로 두지 않음
+                reason = "Image dimensions unknown"
+            elif image.width * image.height > MAX_IMAGE_PIXELS:
+                reason = "Image dimensions too large"
+            image.status = ImageStatus.REJECTED if reason else ImageStatus.READY
+
+    if image.status == ImageStatus.READY:
+        await enqueue_upload_jobs(db, image)
+        await bump_listing_versions(db, image.user_id)
+    return reason
+
+
+async def expire_stale_uploads(db: AsyncSession, max_age: int = PENDING_UPLOAD_TTL, batch: int = UPLOAD_SWEEP_BATCH) -> dict:
+    """
+    오래된 pending 업로드 정리
+
+    완료 호출 없이 업로드만 된 객체는 ready로 살리고, 끝내 업로드되지 않은 행은 expired 처리
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=max_age)
+    images = (await db.scalars(
+        select(Image)
+        .where(Image.status == ImageStatus.PENDING, Image.created_at < cutoff)
+        .order_by(Image.created_at)
+        .limit(batch)
+    )).all()
+
+    counts = {ImageStatus.READY: 0, ImageStatus.REJECTED: 0, ImageStatus.QUARANTINED: 0, ImageStatus.EXPIRED: 0}
+    for image in images:
+        await verify_upload(db, image)
+        if image.status == ImageStatus.PENDING:
+            image.status = ImageStatus.EXPIRED
+        counts[image.status] += 1
+
+    await db.commit()
+    # commit 전에 지우면 그 사이의 조회가 pending을 읽고 '없음'을 다시 캐시함
+    for image in images:
+        invalidate_object(image.object_key)
+    return counts
+
+
+async def run_upload_sweeper(session_factory, interval: int):
+    """lifespan에서 실행하는 주기적 스위퍼 (취소될 때까지)"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with session_factory() as db:
+                counts = await expire_stale_uploads(db)
+                aborted = await abort_stale_multipart_uploads(db)
+            if any(counts.values()):
+                print(f"🧹 Swept pending uploads: {counts}")
+            if aborted:
+                print(f"🧹 Aborted {aborted} abandoned multipart uploads")
+        except Exception as e:
+            print(f"⚠️ Upload sweeper failed: {e}")
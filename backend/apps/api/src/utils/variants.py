@@ -0,0 +1,54 @@
+from collections import defaultdict
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models.variant import ImageVariant
+from src.utils.s3 import presign_get_url
+from src.config import PRESIGN_LIST_EXPIRES
+
+
+async def load_variants(db: AsyncSession, image_ids: list[int]) -> dict[int, list[ImageVariant]]:
+    """페이지 이미지들의 파생본을 쿼리 한 번으로 조회 (image_id -> 가로 크기 오름차순 목록)"""
+    if not image_ids:
+        return {}
+
+    variants = (await db.scalars(
+        select(ImageVariant)
+        .where(ImageVariant.image_id.in_(image_ids))
+        .order_by(ImageVariant.image_id, ImageVariant.width)
+    )).all()
+
+    grouped = defaultdict(list)
+    for variant in variants:
+        grouped[variant.image_id].append(variant)
+    return grouped
+
+
+def preferred_formats(accept: str | None) -> list[str]:
+    """Accept 헤더 기준 파생본 형식 우선순위 (AVIF를 받는 브라우저면 AVIF 먼저)"""
+    if accept and "image/avif" in accept:
+        return ["avif", "webp"]
+    return ["webp"]
+
+
+def variant_fields(variants: list[ImageVariant], width: int, formats: list[str], original_url: str) -> dict:
+    """
+    목록 항목의 thumbnail_url / srcset
+
+    표시 너비(width) 이상인 가장 작은 파생본을 고르고, 없으면 가장 큰 파생본을 쓴다.
+    아직 파생본이 없으면(워커 처리 전) 원본 URL로 대체한다.
+    """
+    for fmt in formats:
+        candidates = [variant for variant in variants if variant.format == fmt]
+        if not candidates:
+            continue
+
+        chosen = next((variant for variant in candidates if variant.width >= width), candidates[-1])
+        return {
+            "thumbnail_url": presign_get_url(chosen.object_key, PRESIGN_LIST_EXPIRES),
+            "srcset": ", ".join(
+                f"{presign_get_url(variant.object_key, PRESIGN_LIST_EXPIRES)} {variant.width}w"
+                for variant in candidates
+            ),
+        }
+
+    return {"thumbnail_url": original_url, "srcset": None}
@@ -5,6 +5,7 @@ from fastapi.testclient import TestClient
 from moto import mock_s3
 import boto3
 import os
+import struct
 
 # ===== 1. 환경 변수 먼저 설정 =====
 os.environ["S3_ENDPOINT"] = ""
@@ -12,6 +13,8 @@ os.environ["S3_ACCESS_KEY"] = "test-key"
 os.environ["S3_SECRET_KEY"] = "test-secret"
 os.environ["S3_BUCKET"] = "test-bucket"
 os.environ["PUBLIC_S3_BASEURL"] = ""
+os.environ["INTERNAL_API_TOKEN"] = "test-internal-token"
+os.environ["UPLOAD_SWEEP_INTERVAL"] = "0"  # 테스트에서는 스위퍼를 직접 호출
 
 # ===== 2. Mock을 전역으로 시작 =====
 mock = mock_s3()
@@ -25,6 +28,8 @@ from src.utils.s3 import s3_internal
 from src.models.database import Base, get_db
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
 import tempfile
 
 # ===== 4. Mock S3에 버킷 생성 =====
@@ -43,27 +48,45 @@ from src.utils.auth import get_current_user
 app.dependency_overrides[get_current_user] = mock_get_current_user
 
 
-# ✅ 테스트용 SQLite DB
+# ✅ 테스트용 SQLite DB (테스트 코드는 sync 세션, 앱은 같은 파일에 aiosqlite로 접속)
 TEST_DB_FILE = tempfile.mktemp(suffix=".db")
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{TEST_DB_FILE}"
 
 test_engine = create_engine(SQLALCHEMY_DATABASE_URL, echo=False)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
 
+# TestClient는 요청마다 이벤트 루프가 달라질 수 있으므로 커넥션을 재사용하지 않음
+test_async_engine = create_async_engine(f"sqlite+aiosqlite:///{TEST_DB_FILE}", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(bind=test_async_engine, autoflush=False, expire_on_commit=False)
+
 # ✅ 테이블 생성
 Base.metadata.create_all(bind=test_engine)
 
 # ✅ DB 의존성 Override
-def override_get_db():
-    db = TestingSessionLocal()
-    try:
+async def override_get_db():
+    async with TestingAsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 app.dependency_overrides[get_db] = override_get_db
 
 
+def jpeg_bytes(width=640, height=480, exif_size=0, total_size=None) -> bytes:
+    """헤더만 있는 최소 JPEG (SOI + 선택적 EXIF(APP1) + SOF0 + EOI, total_size까지 0으로 채움)"""
+    data = b"\xff\xd8"
+    if exif_size:
+        data += b"\xff\xe1" + struct.pack(">H", exif_size + 2) + b"\0" * exif_size
+    data += b"\xff\xc0" + struct.pack(">HBHHB", 11, 8, height, width, 1) + b"\x01\x11\x00"
+    data += b"\xff\xda"
+    if total_size:
+        data += b"\0" * (total_size - len(data) - 2)
+    return data + b"\xff\xd9"
+
+
+def png_bytes(width=640, height=480) -> bytes:
+    """헤더만 있는 최소 PNG (시그니처 + IHDR)"""
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+
+
 @pytest.fixture
 def client():
     """FastAPI TestClient 생성"""
@@ -87,11 +110,57 @@ def db():
         
         # 모든 테이블의 데이터 삭제 (테이블은 유지)
         from src.models.image import Image  # Image 모델 import
+        from src.models.job import Job
+        from src.models.variant import ImageVariant
+        from src.models.multipart import MultipartUpload
+        from src.models.image_hash import ImageHash
+        from src.models.listing_version import ListingVersion
+        from src.models.user import User
+        session.query(Job).delete()
+        session.query(MultipartUpload).delete()
+        session.query(ImageHash).delete()
+        session.query(ListingVersion).delete()
+        session.query(ImageVariant).delete()
         session.query(Image).delete()
+        session.query(User).delete()
         session.commit()
         
         session.close()
 
+@pytest.fixture(autouse=True)
+def reset_object_cache():
+    """테스트마다 객체 존재 캐시 초기화 (DB 행은 db fixture가 지움)"""
+    from src.utils.uploads import _object_cache
+    _object_cache.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_page_cache():
+    """테스트마다 목록 첫 페이지 캐시 초기화 (테스트는 버전을 올리지 않고 행을 직접 넣음)"""
+    from src.utils import page_cache
+    page_cache.page_cache = page_cache.PageCache(page_cache.MemoryPageBackend())
+    yield
+
+@pytest.fixture
+def async_session_factory():
+    """앱과 같은 테스트 DB에 붙는 async 세션 팩토리 (백그라운드 작업 직접 호출용)"""
+    return TestingAsyncSessionLocal
+
+@pytest.fixture
+def query_counter():
+    """앱이 테스트 DB에 실행한 SQL 문 기록 (N+1 검증용)"""
+    from sqlalchemy import event
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(test_async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
 def pytest_sessionfinish(session, exitstatus):
     """테스트 세션 종료 시 정리"""
     mock.stop()
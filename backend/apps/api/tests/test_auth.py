@@ -0,0 +1,317 @@
+# backend/apps/api/tests/test_auth.py
+
+import httpx
+import pytest
+import time
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt, jwk
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+import src.utils.auth as auth
+
+TEST_SECRET = "test-jwt-secret"
+
+
+def make_token(user_id=1, secret=TEST_SECRET, algorithm="HS256", headers=None, **extra):
+    """auth 서비스의 create_jwt_token과 같은 형태의 토큰 생성"""
+    payload = {
+        "user_id": user_id,
+        "email": "test@example.com",
+        "exp": datetime.utcnow() + timedelta(minutes=5),
+        "iat": datetime.utcnow(),
+    }
+    payload.update(extra)
+    return jwt.encode(payload, secret, algorithm=algorithm, headers=headers)
+
+
+def bearer(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.fixture(autouse=True)
+def reset_token_cache():
+    """테스트마다 토큰 캐시/폐기 목록 초기화"""
+    for cache in (auth._token_cache, auth._revoked_tokens, auth._revoked_users):
+        cache.clear()
+    yield
+
+
+@pytest.fixture
+def hs256(monkeypatch):
+    """공유 시크릿 설정"""
+    monkeypatch.setattr(auth, "JWT_SECRET", TEST_SECRET)
+    monkeypatch.setattr(auth, "JWT_ALGORITHM", "HS256")
+
+
+@pytest.fixture
+def remote_calls(monkeypatch):
+    """원격 검증 호출 기록 (Auth 서버 대신)"""
+    calls = []
+
+    async def fake_remote(token):
+        calls.append(token)
+        return 42
+
+    monkeypatch.setattr(auth, "verify_token_remote", fake_remote)
+    return calls
+
+
+class TestLocalVerification:
+    """HS256 공유 시크릿 로컬 검증 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_valid_token(self, hs256, remote_calls):
+        """유효한 토큰은 원격 호출 없이 검증"""
+        user_id = await auth.get_current_user(bearer(make_token(user_id=7)))
+
+        assert user_id == 7
+        assert remote_calls == []
+
+    @pytest.mark.asyncio
+    async def test_tampered_token(self, hs256, remote_calls):
+        """다른 시크릿으로 서명된 토큰은 401"""
+        token = make_token(secret="another-secret")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await auth.get_current_user(bearer(token))
+
+        assert exc_info.value.status_code == 401
+        assert remote_calls == []
+
+    @pytest.mark.asyncio
+    async def test_expired_token(self, hs256, remote_calls):
+        """만료된 토큰은 401"""
+        token = make_token(exp=datetime.utcnow() - timedelta(minutes=1))
+
+        with pytest.raises(HTTPException) as exc_info:
+            await auth.get_current_user(bearer(token))
+
+        assert exc_info.value.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_refresh_token_rejected(self, hs256, remote_calls):
+        """Refresh 토큰으로는 인증 불가"""
+        token = make_token(type="refresh")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await auth.get_current_user(bearer(token))
+
+        assert exc_info.value.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_no_secret_falls_back_to_remote(self, monkeypatch, remote_calls):
+        """시크릿이 없으면 Auth 서버로 위임"""
+        monkeypatch.setattr(auth, "JWT_SECRET", "")
+        monkeypatch.setattr(auth, "JWT_ALGORITHM", "HS256")
+        token = make_token()
+
+        user_id = await auth.get_current_user(bearer(token))
+
+        assert user_id == 42
+        assert remote_calls == [token]
+
+
+class TestJWKSVerification:
+    """비대칭 알고리즘(RS256) 공개키 세트 검증 테스트"""
+
+    @pytest.fixture
+    def rsa_key(self):
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        private_pem = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode()
+        public_pem = key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+        public_jwk["kid"] = "key-1"
+        return private_pem, public_jwk
+
+    @pytest.fixture
+    def rs256(self, monkeypatch, rsa_key):
+        _, public_jwk = rsa_key
+        fetches = []
+
+        async def fake_fetch():
+            fetches.append(1)
+            return {"keys": [public_jwk]}
+
+        monkeypatch.setattr(auth, "JWT_ALGORITHM", "RS256")
+        monkeypatch.setattr(auth, "JWT_JWKS_URL", "http://auth/.well-known/jwks.json")
+        monkeypatch.setattr(auth, "_fetch_jwks", fake_fetch)
+        monkeypatch.setattr(auth, "_jwks_cache", {"keys": {}, "fetched_at": 0.0})
+        return fetches
+
+    @pytest.mark.asyncio
+    async def test_known_kid_cached(self, rs256, rsa_key, remote_calls):
+        """공개키 세트는 한 번만 조회하고 캐시"""
+        private_pem, _ = rsa_key
+        token = make_token(user_id=3, secret=private_pem, algorithm="RS256", headers={"kid": "key-1"})
+
+        assert await auth.get_current_user(bearer(token)) == 3
+        assert await auth.get_current_user(bearer(token)) == 3
+        assert len(rs256) == 1
+        assert remote_calls == []
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_falls_back_to_remote(self, rs256, rsa_key, remote_calls):
+        """모르는 kid는 Auth 서버로 위임"""
+        private_pem, _ = rsa_key
+        token = make_token(secret=private_pem, algorithm="RS256", headers={"kid": "rotated"})
+
+        assert await auth.get_current_user(bearer(token)) == 42
+        assert remote_calls == [token]
+
+
+class TestTokenCache:
+    """검증된 토큰 캐시 및 폐기 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_remote_result_cached(self, monkeypatch, remote_calls):
+        """원격 검증 결과는 캐시되어 재검증하지 않음"""
+        monkeypatch.setattr(auth, "JWT_SECRET", "")
+        token = make_token()
+        before = auth.token_cache_stats()["tokens"]
+
+        for _ in range(3):
+            assert await auth.get_current_user(bearer(token)) == 42
+
+        assert remote_calls == [token]
+        after = auth.token_cache_stats()["tokens"]
+        assert after["hits"] - before["hits"] == 2
+        assert after["misses"] - before["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_ttl_bounded_by_exp(self, hs256):
+        """exp가 지난 토큰은 캐시에 남지 않음"""
+        token = make_token(exp=datetime.utcnow() + timedelta(seconds=1))
+        await auth.get_current_user(bearer(token))
+
+        entry_expires_at, _, _ = auth._token_cache._data[auth.hash_token(token)]
+        assert entry_expires_at - time.monotonic() <= 1.5
+
+    @pytest.mark.asyncio
+    async def test_revoke_token(self, hs256):
+        """폐기된 토큰은 캐시에 있어도 401"""
+        token = make_token()
+        await auth.get_current_user(bearer(token))
+
+        auth.revoke_token(auth.hash_token(token))
+
+        with pytest.raises(HTTPException) as exc_info:
+            await auth.get_current_user(bearer(token))
+        assert exc_info.value.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_revoke_user(self, hs256):
+        """사용자 폐기 시점 이전 토큰은 401, 이후 발급 토큰은 허용"""
+        old_token = make_token(user_id=5, iat=datetime.utcnow() - timedelta(minutes=1))
+        await auth.get_current_user(bearer(old_token))
+
+        auth.revoke_user(5)
+
+        with pytest.raises(HTTPException):
+            await auth.get_current_user(bearer(old_token))
+
+        new_token = make_token(user_id=5, iat=datetime.utcnow() + timedelta(seconds=1))
+        assert await auth.get_current_user(bearer(new_token)) == 5
+
+    @pytest.mark.asyncio
+    async def test_revocations_not_evicted_by_count(self, hs256):
+        """폐기가 TOKEN_CACHE_SIZE보다 많이 쌓여도 먼저 폐기한 토큰은 계속 401"""
+        token = make_token()
+        auth.revoke_token(auth.hash_token(token))
+        for i in range(auth.TOKEN_CACHE_SIZE + 1):
+            auth.revoke_token(f"other-{i}")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await auth.get_current_user(bearer(token))
+        assert exc_info.value.status_code == 401
+
+
+class TestAuthHTTPClient:
+    """Auth 서비스 공유 HTTP 클라이언트 테스트"""
+
+    @pytest.fixture
+    def mock_auth_service(self, monkeypatch):
+        """연결 실패 후 성공하는 Auth 서비스 대역"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.ConnectError("connection refused", request=request)
+            return httpx.Response(200, json={"user_id": 9, "email": "test@example.com"})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(auth, "_http_client", client)
+        monkeypatch.setattr(auth, "AUTH_HTTP_RETRY_BACKOFF", 0)
+        return calls
+
+    @pytest.mark.asyncio
+    async def test_retry_on_connect_error(self, mock_auth_service):
+        """연결 실패는 재시도 후 성공"""
+        assert await auth.verify_token_remote("token") == 9
+        assert len(mock_auth_service) == 2
+        assert mock_auth_service[-1].headers["Authorization"] == "Bearer token"
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_retries(self, monkeypatch):
+        """재시도 횟수를 넘으면 503"""
+        def handler(request):
+            raise httpx.ConnectError("connection refused", request=request)
+
+        monkeypatch.setattr(auth, "_http_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        monkeypatch.setattr(auth, "AUTH_HTTP_RETRY_BACKOFF", 0)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await auth.verify_token_remote("token")
+        assert exc_info.value.status_code == 503
+
+    def test_client_lifecycle(self, monkeypatch):
+        """lifespan에서 생성되고 종료 시 닫힘"""
+        from fastapi.testclient import TestClient
+        from src.server import app
+
+        monkeypatch.setattr(auth, "_http_client", None)
+        with TestClient(app):
+            client = auth._http_client
+            assert client is not None
+            assert not client.is_closed
+
+        assert client.is_closed
+        assert auth._http_client is None
+
+
+class TestInternalEndpoints:
+    """/internal/* 엔드포인트 테스트"""
+
+    HEADERS = {"X-Internal-Token": "test-internal-token"}
+
+    def test_requires_internal_token(self, client):
+        assert client.get("/internal/metrics").status_code == 404
+        assert client.get("/internal/metrics", headers={"X-Internal-Token": "wrong"}).status_code == 404
+
+    def test_push_revocation(self, client):
+        response = client.post(
+            "/internal/auth/revoke",
+            json={"token_hashes": ["abc"], "user_ids": [1, 2]},
+            headers=self.HEADERS,
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"revoked_tokens": 1, "revoked_users": 2}
+        assert auth._revoked_tokens.get("abc") is True
+
+    def test_metrics(self, client):
+        response = client.get("/internal/metrics", headers=self.HEADERS)
+
+        assert response.status_code == 200
+        assert "hits" in response.json()["auth_cache"]["tokens"]
+        assert "coalesced" in response.json()["singleflight"]["object_exists"]
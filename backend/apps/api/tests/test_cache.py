@@ -0,0 +1,277 @@
+# backend/apps/api/tests/test_cache.py
+
+import asyncio
+import time
+import pytest
+from src.utils.cache import TTLCache, ExpiringDict
+from src.utils.page_cache import PageCache, MemoryPageBackend, RedisPageBackend
+from src.utils.singleflight import SingleFlight
+
+
+class TestTTLCache:
+    """TTLCache 테스트"""
+
+    def test_hit_and_miss(self):
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_lru_eviction(self):
+        """가장 오래 사용하지 않은 항목부터 제거"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # a를 최근 사용으로
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_expiry(self):
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("a", 1, ttl=0.01)
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_ttl_capped_by_default(self):
+        """항목 ttl은 기본 ttl을 넘지 않고, 0 이하면 저장하지 않음"""
+        cache = TTLCache(maxsize=10, ttl=0.01)
+        cache.set("a", 1, ttl=3600)
+        cache.set("b", 2, ttl=-1)
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_pop(self):
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("a", 1)
+
+        assert cache.pop("a") == 1
+        assert cache.get("a") is None
+
+    def test_max_bytes_eviction(self):
+        """메모리 상한(sizeof 합계)을 넘으면 LRU 제거"""
+        cache = TTLCache(maxsize=100, ttl=60, max_bytes=10, sizeof=len)
+        cache.set("a", "12345")
+        cache.set("b", "12345")
+        cache.set("c", "123")
+
+        assert cache.get("a") is None
+        assert cache.get("b") == "12345"
+        assert cache.stats()["bytes"] == 8
+
+    def test_overwrite_updates_bytes(self):
+        cache = TTLCache(maxsize=100, ttl=60, max_bytes=10, sizeof=len)
+        cache.set("a", "12345")
+        cache.set("a", "12")
+
+        assert cache.stats()["bytes"] == 2
+
+
+class FakeRedis:
+    """redis.asyncio.Redis 대신 쓰는 로컬 가짜 (get/set(px, nx)/delete만)"""
+
+    def __init__(self):
+        self.data = {}  # key -> (expires_at, value)
+        self.fail = False
+
+    def _check(self):
+        if self.fail:
+            raise ConnectionError("redis down")
+
+    async def get(self, name):
+        self._check()
+        entry = self.data.get(name)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    async def set(self, name, value, px=None, nx=False):
+        self._check()
+        if nx and await self.get(name) is not None:
+            return None
+        self.data[name] = (time.monotonic() + (px / 1000 if px else 3600), value)
+        return True
+
+    async def delete(self, name):
+        self._check()
+        self.data.pop(name, None)
+
+    async def aclose(self):
+        pass
+
+
+class TestExpiringDict:
+    """ExpiringDict 테스트 (폐기 목록)"""
+
+    def test_no_size_eviction(self):
+        store = ExpiringDict(ttl=60)
+        for i in range(1000):
+            store.set(i, True)
+
+        assert len(store) == 1000
+        assert store.get(0) is True
+
+    def test_expiry_purges_oldest(self):
+        store = ExpiringDict(ttl=0.05)
+        store.set("a", 1)
+        store.set("b", 2)
+        time.sleep(0.06)
+        store.set("c", 3)
+
+        assert store.get("a") is None
+        assert len(store) == 1
+
+    def test_reset_extends_expiry(self):
+        store = ExpiringDict(ttl=0.1)
+        store.set("a", 1)
+        time.sleep(0.06)
+        store.set("a", 2)
+        time.sleep(0.06)
+
+        assert store.get("a") == 2  # 처음 넣은 만료 시각으로 지워지지 않음
+
+
+class TestSingleFlight:
+    """SingleFlight 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        flights, calls = SingleFlight(), []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "page"
+
+        results = await asyncio.gather(*(flights.do("k", compute) for _ in range(20)))
+
+        assert results == ["page"] * 20
+        assert len(calls) == 1
+        assert len(flights) == 0
+
+    @pytest.mark.asyncio
+    async def test_error_shared_then_retried(self):
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(*(flights.do("k", fail) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+
+        async def ok():
+            return 1
+        assert await flights.do("k", ok) == 1  # 실패 결과는 남지 않음
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_handed_over(self):
+        """계산하던 요청이 취소되면 기다리던 요청이 직접 계산"""
+        flights, started = SingleFlight(), asyncio.Event()
+
+        async def slow():
+            started.set()
+            await asyncio.sleep(10)
+
+        async def fast():
+            return "follower"
+
+        leader = asyncio.create_task(flights.do("k", slow))
+        await started.wait()
+        follower = asyncio.create_task(flights.do("k", fast))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == "follower"
+
+    @pytest.mark.asyncio
+    async def test_stats_count_coalesced_calls(self):
+        flights = SingleFlight()
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            return 1
+
+        await asyncio.gather(*(flights.do("k", compute) for _ in range(10)))
+        await flights.do("k", compute)  # 끝난 뒤의 호출은 다시 계산
+
+        stats = flights.stats()
+        assert (stats["calls"], stats["executions"], stats["coalesced"]) == (11, 2, 9)
+        assert stats["inflight"] == 0
+
+
+class TestPageCache:
+    """목록 페이지 캐시 테스트 (프로세스 내 LRU / Redis 호환 백엔드)"""
+
+    def renderer(self, body=b"page", delay=0.01):
+        calls = []
+
+        async def render():
+            calls.append(1)
+            await asyncio.sleep(delay)
+            return body
+        return render, calls
+
+    @pytest.mark.asyncio
+    async def test_burst_miss_renders_once(self):
+        cache = PageCache(MemoryPageBackend(maxsize=10, max_bytes=1024, ttl=60))
+        render, calls = self.renderer()
+
+        results = await asyncio.gather(*(cache.get_or_render("k", render, ttl=60) for _ in range(50)))
+
+        assert set(results) == {b"page"} and len(calls) == 1
+        assert await cache.get_or_render("k", render, ttl=60) == b"page"
+        assert len(calls) == 1
+        assert cache.stats()["renders"] == 1
+
+    @pytest.mark.asyncio
+    async def test_shared_backend_across_processes(self):
+        """다른 워커가 만든 페이지를 그대로 사용"""
+        redis = FakeRedis()
+        worker_a, worker_b = PageCache(RedisPageBackend(redis)), PageCache(RedisPageBackend(redis))
+        render_a, calls_a = self.renderer(b"from a")
+        render_b, calls_b = self.renderer(b"from b")
+
+        assert await worker_a.get_or_render("k", render_a, ttl=60) == b"from a"
+        assert await worker_b.get_or_render("k", render_b, ttl=60) == b"from a"
+        assert (len(calls_a), len(calls_b)) == (1, 0)
+        assert worker_b.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_waits_for_other_process_render(self):
+        """다른 워커가 잠금을 잡고 만드는 중이면 결과를 기다림"""
+        redis = FakeRedis()
+        worker_a, worker_b = PageCache(RedisPageBackend(redis)), PageCache(RedisPageBackend(redis), lock_timeout=1.0)
+        render_a, calls_a = self.renderer(b"from a", delay=0.2)
+        render_b, calls_b = self.renderer(b"from b")
+
+        task_a = asyncio.create_task(worker_a.get_or_render("k", render_a, ttl=60))
+        await asyncio.sleep(0.05)  # a가 잠금을 잡은 뒤
+
+        assert await worker_b.get_or_render("k", render_b, ttl=60) == b"from a"
+        assert await task_a == b"from a"
+        assert (len(calls_a), len(calls_b)) == (1, 0)
+        assert "listing:lock:k" not in redis.data
+
+    @pytest.mark.asyncio
+    async def test_backend_failure_falls_back_to_render(self):
+        redis = FakeRedis()
+        redis.fail = True
+        cache = PageCache(RedisPageBackend(redis))
+        render, calls = self.renderer()
+
+        assert await cache.get_or_render("k", render, ttl=60) == b"page"
+        assert len(calls) == 1
+        assert cache.stats()["errors"] == 4  # get, lock, set, unlock
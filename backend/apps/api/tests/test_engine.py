@@ -0,0 +1,128 @@
+# backend/apps/api/tests/test_engine.py
+
+import pytest
+import tempfile
+from sqlalchemy import exc, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool
+
+import src.models.engine as engine_module
+from src.models.engine import (
+    TimedAsyncQueuePool,
+    TimedQueuePool,
+    create_db_engine,
+    pool_stats,
+    to_async_url,
+)
+
+
+@pytest.fixture
+def sqlite_url():
+    return f"sqlite:///{tempfile.mktemp(suffix='.db')}"
+
+
+class TestPoolOptions:
+    """설정값 → create_engine 인자 변환 테스트"""
+
+    def test_postgres_pool_settings(self, monkeypatch):
+        monkeypatch.setattr(engine_module, "DB_POOL_SIZE", 7)
+        monkeypatch.setattr(engine_module, "DB_MAX_OVERFLOW", 3)
+        monkeypatch.setattr(engine_module, "DB_POOL_RECYCLE", 600)
+
+        options = engine_module._pool_options(make_url("postgresql+asyncpg://u:p@db/x"), is_async=True)
+
+        assert options["poolclass"] is TimedAsyncQueuePool
+        assert options["pool_size"] == 7
+        assert options["max_overflow"] == 3
+        assert options["pool_recycle"] == 600
+        assert options["pool_pre_ping"] is True
+
+    def test_sync_engine_uses_sync_pool(self):
+        options = engine_module._pool_options(make_url("postgresql://u:p@db/x"), is_async=False)
+        assert options["poolclass"] is TimedQueuePool
+
+    def test_pgbouncer_mode(self, monkeypatch):
+        """PgBouncer transaction 모드: 앱 풀 없음 + prepared statement 캐시 끔"""
+        monkeypatch.setattr(engine_module, "DB_PGBOUNCER", True)
+
+        options = engine_module._pool_options(make_url("postgresql+asyncpg://u:p@db/x"), is_async=True)
+
+        assert options["poolclass"] is NullPool
+        assert options["connect_args"]["statement_cache_size"] == 0
+        assert options["connect_args"]["prepared_statement_cache_size"] == 0
+        name_func = options["connect_args"]["prepared_statement_name_func"]
+        assert name_func() != name_func()
+
+    def test_sqlite_uses_driver_defaults(self):
+        assert engine_module._pool_options(make_url("sqlite:///x.db"), is_async=False) == {}
+
+    def test_to_async_url(self):
+        assert to_async_url("postgresql://u:p@db/x") == "postgresql+asyncpg://u:p@db/x"
+        assert to_async_url("sqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+
+
+class TestPoolMetrics:
+    """체크아웃/overflow/대기 시간 게이지 테스트"""
+
+    def test_checked_out_and_overflow(self, sqlite_url):
+        engine = create_db_engine(
+            sqlite_url, name="test_gauges", poolclass=TimedQueuePool, pool_size=1, max_overflow=1
+        )
+        first = engine.connect()
+        second = engine.connect()
+
+        stats = pool_stats()["test_gauges"]
+        assert stats["checked_out"] == 2
+        assert stats["overflow"] == 1
+        assert stats["checkouts"] == 2
+
+        first.close()
+        second.close()
+        engine.dispose()
+
+    def test_timeout_counted(self, sqlite_url):
+        engine = create_db_engine(
+            sqlite_url, name="test_timeout", poolclass=TimedQueuePool,
+            pool_size=1, max_overflow=0, pool_timeout=0.05,
+        )
+        conn = engine.connect()
+
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+        stats = pool_stats()["test_timeout"]
+        assert stats["timeouts"] == 1
+        assert stats["wait_seconds_max"] >= 0.05
+
+        conn.close()
+        engine.dispose()
+
+    def test_metrics_survive_dispose(self, sqlite_url):
+        """dispose()로 풀이 재생성되어도 누적값 유지"""
+        engine = create_db_engine(sqlite_url, name="test_dispose", poolclass=TimedQueuePool, pool_size=1)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        engine.dispose()
+
+        assert isinstance(engine.pool, TimedQueuePool)
+        assert pool_stats()["test_dispose"]["checkouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_async_engine(self, sqlite_url):
+        engine = create_db_engine(
+            to_async_url(sqlite_url), name="test_async", is_async=True,
+            poolclass=TimedAsyncQueuePool, pool_size=2,
+        )
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            assert pool_stats()["test_async"]["checked_out"] == 1
+
+        assert pool_stats()["test_async"]["checkouts"] == 1
+        await engine.dispose()
+
+    def test_internal_metrics_endpoint(self, client):
+        response = client.get("/internal/metrics", headers={"X-Internal-Token": "test-internal-token"})
+
+        assert response.status_code == 200
+        assert "api" in response.json()["db_pool"]
@@ -1,7 +1,17 @@
 # backend/apps/api/tests/test_images.py
 
+import asyncio
+import httpx
 import pytest
+from datetime import datetime
+from unittest.mock import patch
+import src.utils.uploads as uploads
 from src.models.image import Image
+from src.models.user import User
+from src.models.variant import ImageVariant
+from src.utils.listing import bump_listing_versions
+import src.utils.listing as listing
+from tests.conftest import jpeg_bytes
 
 class TestImagesEndpoint:
     """GET /images/{key} 엔드포인트 테스트"""
@@ -310,4 +320,457 @@ class TestListAllImages:
         assert response.status_code == 200
         data = response.json()
         assert data["images"] == []
-        assert data["count"] == 0
\ No newline at end of file
+        assert data["count"] == 0
+
+    def test_list_all_images_uploader_single_query(self, client, db, query_counter):
+        """업로더 정보를 이미지 수와 관계없이 한 번의 쿼리로 조회 (+ 목록 버전, 파생본 조회 한 번씩)"""
+        db.add_all([
+            User(id=1, email="user1@example.com", name="User 1", avatar_url="https://example.com/1.png"),
+            User(id=2, email="user2@example.com", name="User 2"),
+        ])
+        for i in range(6):
+            db.add(Image(
+                user_id=(i % 3) + 1,  # user_id=3은 users 테이블에 없음
+                object_key=f"originals/uploader{i}.jpg",
+                filename=f"uploader{i}.jpg",
+                content_type="image/jpeg",
+                size=1024
+            ))
+        db.commit()
+        query_counter.clear()
+
+        response = client.get("/images/public")
+
+        assert response.status_code == 200
+        selects = [q for q in query_counter if q.lstrip().upper().startswith("SELECT")]
+        assert len(selects) == 3
+        assert "listing_versions" in selects[0]
+        assert "image_variants" in selects[2]
+
+        uploaders = {img["user_id"]: img["user"] for img in response.json()["images"]}
+        assert uploaders[1] == {"id": 1, "name": "User 1", "avatar_url": "https://example.com/1.png"}
+        assert uploaders[2] == {"id": 2, "name": "User 2", "avatar_url": None}
+        assert uploaders[3] is None
+        assert "email" not in uploaders[1]
+
+
+class TestListingVariants:
+    """목록 썸네일(파생본) 선택 / srcset 테스트"""
+
+    def _add_image_with_variants(self, db, formats=("webp", "avif"), widths=(256, 768, 1536)):
+        image = Image(
+            user_id=1, object_key="originals/variant.jpg", filename="variant.jpg",
+            content_type="image/jpeg", size=4096, width=2000, height=1000,
+        )
+        db.add(image)
+        db.flush()
+        db.add_all(
+            ImageVariant(
+                image_id=image.id, object_key=f"derivatives/variant/{w}.{fmt}",
+                format=fmt, width=w, height=w // 2, size=w,
+            )
+            for fmt in formats for w in widths
+        )
+        db.commit()
+        return image
+
+    def test_smallest_suitable_variant(self, client, db):
+        self._add_image_with_variants(db)
+
+        img = client.get("/images/public", params={"width": 500}).json()["images"][0]
+
+        assert "derivatives/variant/768.webp" in img["thumbnail_url"]
+        assert "originals/variant.jpg" in img["url"]  # 원본 URL은 그대로
+        assert (img["width"], img["height"]) == (2000, 1000)
+        entries = [entry.rsplit(" ", 1) for entry in img["srcset"].split(", ")]
+        assert [descriptor for _, descriptor in entries] == ["256w", "768w", "1536w"]
+        assert all(".webp?" in url for url, _ in entries)
+
+    def test_default_width_and_largest_fallback(self, client, db):
+        self._add_image_with_variants(db)
+
+        small = client.get("/images").json()["images"][0]
+        huge = client.get("/images", params={"width": 4000}).json()["images"][0]
+
+        assert "derivatives/variant/256.webp" in small["thumbnail_url"]
+        assert "derivatives/variant/1536.webp" in huge["thumbnail_url"]
+
+    def test_avif_when_accepted(self, client, db):
+        self._add_image_with_variants(db)
+
+        response = client.get("/images/user/1", headers={"Accept": "image/avif,image/webp,*/*"})
+
+        assert "derivatives/variant/256.avif" in response.json()["images"][0]["thumbnail_url"]
+        assert "Accept" in response.headers["vary"]
+
+    def test_falls_back_to_original_before_processing(self, client, db):
+        self._add_image_with_variants(db, formats=())
+
+        img = client.get("/images/public").json()["images"][0]
+
+        assert img["thumbnail_url"] == img["url"]
+        assert img["srcset"] is None
+
+
+class TestCursorPagination:
+    """커서(키셋) 페이지네이션 테스트"""
+
+    def _add_images(self, db, count, user_id=1, created_at=None):
+        for i in range(count):
+            db.add(Image(
+                user_id=user_id,
+                object_key=f"originals/cursor{user_id}-{i}.jpg",
+                filename=f"cursor{i}.jpg",
+                content_type="image/jpeg",
+                size=1024,
+                created_at=created_at or datetime(2024, 1, 1, 0, 0, i),
+            ))
+        db.commit()
+
+    def _walk(self, client, url, limit):
+        """next_cursor를 따라 끝까지 조회"""
+        ids, cursor, pages = [], None, 0
+        while True:
+            params = {"limit": limit}
+            if cursor:
+                params["cursor"] = cursor
+            data = client.get(url, params=params).json()
+            ids += [img["id"] for img in data["images"]]
+            pages += 1
+            cursor = data["next_cursor"]
+            if cursor is None:
+                return ids, pages
+
+    @pytest.mark.parametrize("url", ["/images/public", "/images", "/images/user/1"])
+    def test_walk_all_pages(self, client, db, url):
+        """모든 이미지를 중복/누락 없이 최신순으로 순회"""
+        self._add_images(db, 7)
+
+        ids, pages = self._walk(client, url, limit=3)
+
+        assert pages == 3
+        assert len(ids) == 7
+        assert ids == sorted(ids, reverse=True)
+
+    def test_same_created_at_tiebreak(self, client, db):
+        """created_at이 같아도 id로 순서가 결정되어 누락 없음"""
+        self._add_images(db, 5, created_at=datetime(2024, 1, 1))
+
+        ids, _ = self._walk(client, "/images/public", limit=2)
+
+        assert len(set(ids)) == 5
+
+    def test_last_page_has_no_cursor(self, client, db):
+        self._add_images(db, 2)
+
+        data = client.get("/images/public", params={"limit": 2}).json()
+
+        assert data["count"] == 2
+        assert data["next_cursor"] is None
+
+    def test_invalid_cursor(self, client, db):
+        response = client.get("/images/public", params={"cursor": "not-a-cursor"})
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
+
+    def test_user_images_bounded_page_size(self, client, db):
+        """사용자별 목록도 기본 페이지 크기(50)로 제한"""
+        self._add_images(db, 55, user_id=2)
+
+        data = client.get("/images/user/2").json()
+
+        assert data["count"] == 50
+        assert data["next_cursor"] is not None
+
+
+class TestObjectExistenceCache:
+    """GET /images/{key} 존재 확인 캐시 테스트"""
+
+    def test_steady_state_skips_db_and_s3(self, client, db, query_counter):
+        """두 번째 조회부터는 DB 쿼리/HEAD 없이 응답"""
+        db.add(Image(user_id=1, object_key="originals/cached.jpg"))
+        db.commit()
+
+        assert client.get("/images/originals/cached.jpg").status_code == 200
+        assert len(query_counter) == 1
+
+        with patch("src.utils.uploads.head_object") as head:
+            assert client.get("/images/originals/cached.jpg").status_code == 200
+        assert len(query_counter) == 1
+        head.assert_not_called()
+
+    def test_untracked_object_head_once(self, client, mock_s3_client):
+        """DB에 없는 키는 HEAD 한 번 후 캐시"""
+        mock_s3_client.put_object(Bucket="test-bucket", Key="originals/legacy.jpg", Body=b"img")
+
+        with patch("src.utils.uploads.head_object", wraps=uploads.head_object) as head:
+            assert client.get("/images/originals/legacy.jpg").status_code == 200
+            assert client.get("/images/originals/legacy.jpg").status_code == 200
+
+        assert head.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_cold_lookups_coalesced(self, mock_s3_client):
+        """캐시 miss에 같은 키 요청이 몰리면 HEAD는 한 번 (나머지는 그 결과를 기다림)"""
+        from src.server import app
+        mock_s3_client.put_object(Bucket="test-bucket", Key="originals/shared.jpg", Body=b"img")
+        head_object = uploads.head_object
+
+        async def slow_head(key):
+            await asyncio.sleep(0.05)
+            return await head_object(key)
+
+        before = uploads._object_flights.coalesced
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            with patch("src.utils.uploads.head_object", side_effect=slow_head) as head:
+                responses = await asyncio.gather(*(ac.get("/images/originals/shared.jpg") for _ in range(20)))
+
+        assert [r.status_code for r in responses] == [200] * 20
+        assert len({r.json()["url"] for r in responses}) == 1
+        assert head.call_count == 1
+        assert uploads._object_flights.coalesced - before == 19
+
+    def test_negative_result_cached(self, client):
+        with patch("src.utils.uploads.head_object", wraps=uploads.head_object) as head:
+            assert client.get("/images/originals/missing.jpg").status_code == 404
+            assert client.get("/images/originals/missing.jpg").status_code == 404
+
+        assert head.call_count == 1
+
+    def test_completion_invalidates_negative_entry(self, client, db, mock_s3_client):
+        """pending 때 캐시된 '없음'은 완료 처리 시 지워짐"""
+        key = client.post("/uploads", json={"filename": "a.jpg", "contentType": "image/jpeg", "size": 10}).json()["objectKey"]
+        assert client.get(f"/images/{key}").status_code == 404
+
+        mock_s3_client.put_object(Bucket="test-bucket", Key=key, Body=jpeg_bytes(), ContentType="image/jpeg")
+        assert client.post(f"/uploads/{key}/complete").status_code == 200
+
+        assert client.get(f"/images/{key}").status_code == 200
+
+    def test_lookup_before_commit_not_cached_after_completion(self, client, mock_s3_client):
+        """완료 확인 후 commit 전에 들어온 조회가 캐시한 '없음'도 commit 후 지워짐"""
+        key = client.post("/uploads", json={"filename": "a.jpg", "contentType": "image/jpeg", "size": 10}).json()["objectKey"]
+        mock_s3_client.put_object(Bucket="test-bucket", Key=key, Body=jpeg_bytes(), ContentType="image/jpeg")
+        verify_upload = uploads.verify_upload
+
+        async def verify_then_lookup(db, image):
+            reason = await verify_upload(db, image)
+            uploads._object_cache.set(key, False)  # 아직 pending을 읽은 동시 조회
+            return reason
+
+        with patch("src.routes.upload.verify_upload", side_effect=verify_then_lookup):
+            assert client.post(f"/uploads/{key}/complete").status_code == 200
+
+        assert client.get(f"/images/{key}").status_code == 200
+
+
+class TestConditionalListing:
+    """목록 ETag / If-None-Match 테스트"""
+
+    def add_image(self, db, user_id=1):
+        db.add(Image(user_id=user_id, object_key=f"originals/etag{user_id}.jpg", filename="etag.jpg", size=1024))
+        db.commit()
+
+    def complete_upload(self, client, mock_s3_client):
+        key = client.post("/uploads", json={"filename": "new.jpg", "contentType": "image/jpeg", "size": 10}).json()["objectKey"]
+        mock_s3_client.put_object(Bucket="test-bucket", Key=key, Body=jpeg_bytes(), ContentType="image/jpeg")
+        assert client.post(f"/uploads/{key}/complete").status_code == 200
+
+    async def bump(self, async_session_factory, user_id):
+        async with async_session_factory() as session:
+            await bump_listing_versions(session, user_id)
+            await session.commit()
+
+    def test_not_modified_skips_query_and_signing(self, client, db, query_counter):
+        self.add_image(db)
+        first = client.get("/images/public")
+        etag = first.headers["etag"]
+        assert etag.startswith('W/"public.')
+        assert first.headers["cache-control"] == "public, max-age=0, must-revalidate"
+        query_counter.clear()
+
+        with patch("src.routes.image.presign_get_url") as presign:
+            response = client.get("/images/public", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert "Accept" in response.headers["vary"]
+        assert len(query_counter) == 1  # 버전 조회만
+        presign.assert_not_called()
+
+    def test_weak_comparison_and_lists(self, client):
+        etag = client.get("/images/public").headers["etag"]
+
+        assert client.get("/images/public", headers={"If-None-Match": etag.removeprefix("W/")}).status_code == 304
+        assert client.get("/images/public", headers={"If-None-Match": f'"other", {etag}'}).status_code == 304
+        assert client.get("/images/public", headers={"If-None-Match": '"other"'}).status_code == 200
+
+    def test_upload_completion_changes_etag(self, client, mock_s3_client):
+        public_etag = client.get("/images/public").headers["etag"]
+        my_etag = client.get("/images").headers["etag"]
+
+        self.complete_upload(client, mock_s3_client)
+
+        response = client.get("/images/public", headers={"If-None-Match": public_etag})
+        assert response.status_code == 200 and response.json()["count"] == 1
+        assert client.get("/images", headers={"If-None-Match": my_etag}).status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_scopes_are_independent(self, client, async_session_factory):
+        """다른 사용자의 업로드는 내 목록 ETag를 바꾸지 않음"""
+        mine = client.get("/images")
+        assert mine.headers["cache-control"].startswith("private")
+        public_etag = client.get("/images/public").headers["etag"]
+
+        await self.bump(async_session_factory, user_id=2)
+
+        assert client.get("/images", headers={"If-None-Match": mine.headers["etag"]}).status_code == 304
+        assert client.get("/images/public", headers={"If-None-Match": public_etag}).status_code == 200
+        assert client.get("/images/user/2").headers["etag"] != client.get("/images/user/1").headers["etag"]
+
+    def test_etag_varies_by_format(self, client):
+        webp = client.get("/images/public").headers["etag"]
+        avif = client.get("/images/public", headers={"Accept": "image/avif,image/webp"}).headers["etag"]
+
+        assert webp != avif
+        assert client.get("/images/public", headers={"If-None-Match": webp, "Accept": "image/avif"}).status_code == 200
+
+    def test_presign_bucket_change_invalidates(self):
+        """버킷이 바뀌면 URL도 바뀌므로 같은 버전이어도 ETag가 달라짐"""
+        with patch("time.time", return_value=1000 * listing.PRESIGN_BUCKET_SECONDS):
+            before = listing.listing_etag("public", 3, ["webp"])
+        with patch("time.time", return_value=1001 * listing.PRESIGN_BUCKET_SECONDS):
+            after = listing.listing_etag("public", 3, ["webp"])
+
+        assert before != after
+
+    def test_max_age_capped_by_presign_bucket(self):
+        bucket = listing.PRESIGN_BUCKET_SECONDS
+        with patch.object(listing, "LIST_CACHE_MAX_AGE", 10 * bucket), patch("time.time", return_value=1000 * bucket + bucket - 30):
+            assert listing.cache_control(public=True) == "public, max-age=30, must-revalidate"
+
+
+class TestListingPageCache:
+    """목록 첫 페이지 서버 캐시 테스트"""
+
+    def add_images(self, db, count, user_id=1):
+        db.add_all(Image(user_id=user_id, object_key=f"originals/page{user_id}-{i}.jpg", filename="p.jpg", size=1) for i in range(count))
+        db.commit()
+
+    def test_first_page_served_from_cache(self, client, db, query_counter):
+        self.add_images(db, 3)
+        first = client.get("/images/public")
+        query_counter.clear()
+
+        with patch("src.routes.image.presign_get_url") as presign:
+            second = client.get("/images/public")
+
+        assert second.status_code == 200
+        assert second.content == first.content
+        assert second.headers["etag"] == first.headers["etag"]
+        assert second.headers["content-type"] == "application/json"
+        assert len(query_counter) == 1  # 버전 조회만
+        presign.assert_not_called()
+
+    def test_upload_completion_invalidates(self, client, db, mock_s3_client):
+        self.add_images(db, 1)
+        assert client.get("/images").json()["count"] == 1
+
+        key = client.post("/uploads", json={"filename": "new.jpg", "contentType": "image/jpeg", "size": 10}).json()["objectKey"]
+        mock_s3_client.put_object(Bucket="test-bucket", Key=key, Body=jpeg_bytes(), ContentType="image/jpeg")
+        client.post(f"/uploads/{key}/complete")
+
+        assert client.get("/images").json()["count"] == 2
+        assert client.get("/images/public").json()["count"] == 2
+
+    def test_user_feeds_share_entry(self, client, db, query_counter):
+        """/images와 /images/user/{id}는 같은 내용이라 캐시 항목을 공유 (Cache-Control만 다름)"""
+        self.add_images(db, 2)
+        mine = client.get("/images")
+        query_counter.clear()
+
+        public = client.get("/images/user/1")
+
+        assert public.content == mine.content
+        assert public.headers["cache-control"].startswith("public")
+        assert len(query_counter) == 1
+
+    def test_params_and_later_pages_not_mixed(self, client, db, query_counter):
+        self.add_images(db, 3)
+        first = client.get("/images/public", params={"limit": 2}).json()
+
+        assert client.get("/images/public", params={"limit": 3}).json()["count"] == 3
+        query_counter.clear()
+        later = client.get("/images/public", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+
+        assert later["count"] == 1
+        assert len(query_counter) > 1  # 첫 페이지가 아니면 캐시하지 않음
+
+
+class TestBulkPresign:
+    """POST /images/presign 테스트 (여러 키를 쿼리 한 번으로)"""
+
+    def add_images(self, db, count, **fields):
+        images = [Image(user_id=1, object_key=f"originals/bulk{i}.jpg", filename=f"photo {i}.jpg", **fields) for i in range(count)]
+        db.add_all(images)
+        db.commit()
+        return [img.object_key for img in images]
+
+    def test_single_query_for_all_keys(self, client, db, query_counter):
+        keys = self.add_images(db, 200)
+
+        with patch("src.utils.uploads.head_object") as head:
+            response = client.post("/images/presign", json={"keys": keys})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [img["key"] for img in data["images"]] == keys
+        assert all(img["url"] and img["expiresIn"] == 900 for img in data["images"])
+        assert data["missing"] == []
+        assert len([s for s in query_counter if s.lstrip().upper().startswith("SELECT")]) == 1
+        head.assert_not_called()
+
+    def test_missing_and_not_ready_keys(self, client, db):
+        ready = self.add_images(db, 1)
+        db.add(Image(user_id=1, object_key="originals/pending.jpg", status="pending"))
+        db.commit()
+
+        response = client.post("/images/presign", json={"keys": [*ready, "originals/pending.jpg", "originals/nope.jpg", *ready]})
+
+        data = response.json()
+        assert [img["key"] for img in data["images"]] == ready
+        assert data["missing"] == ["originals/pending.jpg", "originals/nope.jpg"]
+
+    def test_download_uses_uploaded_filename(self, client, db):
+        keys = self.add_images(db, 1)
+
+        data = client.post("/images/presign", json={"keys": keys, "download": True, "expiresIn": 99999}).json()
+
+        image = data["images"][0]
+        assert image["download"] is True
+        assert image["expiresIn"] == 3600
+        assert "photo%25200.jpg" in image["url"]  # filename*=UTF-8''photo%200.jpg (쿼리 인코딩)
+
+    def test_shared_key_does_not_leak_other_filename(self, client, db):
+        """여러 사용자의 행이 같은 객체를 가리키면 파일명 대신 키 이름"""
+        db.add_all([
+            Image(user_id=1, object_key="originals/shared.jpg", filename="mine.jpg"),
+            Image(user_id=2, object_key="originals/shared.jpg", filename="private name.jpg"),
+        ])
+        db.commit()
+
+        data = client.post("/images/presign", json={"keys": ["originals/shared.jpg"], "download": True}).json()
+
+        url = data["images"][0]["url"]
+        assert "shared.jpg" in url
+        assert "mine" not in url and "private" not in url
+
+    def test_too_many_keys(self, client):
+        keys = [f"originals/{i}.jpg" for i in range(501)]
+        assert client.post("/images/presign", json={"keys": keys}).status_code == 400
+
+    def test_invalid_key(self, client):
+        assert client.post("/images/presign", json={"keys": ["originals/../secret"]}).status_code == 400
@@ -0,0 +1,301 @@
+# backend/apps/api/tests/test_s3.py
+
+import asyncio
+import boto3
+import botocore.auth
+import datetime
+import httpx
+import pytest
+import requests
+import threading
+import time as real_time
+from botocore.client import Config
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import src.utils.s3 as s3
+from src.config import PRESIGN_BUCKET_SECONDS
+
+
+class FakeClock:
+    """time 모듈 대역 (time()만 고정, 나머지는 실제 time 모듈)"""
+
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def __getattr__(self, name):
+        return getattr(real_time, name)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """버킷 경계를 제어하기 위한 가짜 시계"""
+    fake = FakeClock(1_700_000_000.0 - 1_700_000_000.0 % PRESIGN_BUCKET_SECONDS)
+    monkeypatch.setattr(s3, "time", fake)
+    s3._presign_cache.clear()
+    return fake
+
+
+@pytest.fixture
+def sign_calls(monkeypatch):
+    """실제 서명 호출 기록"""
+    calls = []
+    original = s3.presigner.presign
+
+    def counting(*args, **kwargs):
+        calls.append(kwargs)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(s3.presigner, "presign", counting)
+    return calls
+
+
+@pytest.fixture
+def frozen_botocore(monkeypatch):
+    """boto3 서명 시각 고정 (presigner와 같은 시각으로 비교)"""
+    fixed = datetime.datetime(2024, 5, 1, 12, 0, 7)
+
+    class FrozenDateTime(datetime.datetime):
+        @classmethod
+        def utcnow(cls):
+            return fixed
+
+    monkeypatch.setattr(botocore.auth.datetime, "datetime", FrozenDateTime)
+    return fixed.replace(tzinfo=datetime.timezone.utc).timestamp()
+
+
+KEYS = [
+    "originals/abc123.jpg",
+    "originals/공백 있는 파일 (1).png",
+    "originals/a+b=c&d~e!'*.webp",
+]
+
+
+class TestSigV4Presigner:
+    """빠른 경로 SigV4 presigner 테스트 (boto3와 바이트 단위 비교)"""
+
+    @pytest.mark.parametrize("key", KEYS)
+    def test_get_matches_boto3(self, frozen_botocore, key):
+        expected = s3.s3_public.generate_presigned_url(
+            "get_object", Params={"Bucket": "test-bucket", "Key": key}, ExpiresIn=900
+        )
+        assert s3.presigner.presign("GET", "test-bucket", key, 900, signed_at=frozen_botocore) == expected
+
+    @pytest.mark.parametrize("key", KEYS)
+    def test_download_matches_boto3(self, frozen_botocore, key):
+        disposition = "attachment; filename*=UTF-8''%EC%82%AC%EC%A7%84.jpg"
+        expected = s3.s3_public.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": "test-bucket", "Key": key, "ResponseContentDisposition": disposition},
+            ExpiresIn=900,
+        )
+        actual = s3.presigner.presign(
+            "GET", "test-bucket", key, 900,
+            query={"response-content-disposition": disposition},
+            signed_at=frozen_botocore,
+        )
+        assert actual == expected
+
+    @pytest.mark.parametrize("key", KEYS)
+    def test_put_matches_boto3(self, frozen_botocore, key):
+        expected = s3.s3_public.generate_presigned_url(
+            "put_object", Params={"Bucket": "test-bucket", "Key": key}, ExpiresIn=3600
+        )
+        assert s3.presigner.presign("PUT", "test-bucket", key, 3600, signed_at=frozen_botocore) == expected
+
+    def test_custom_endpoint_port(self, frozen_botocore):
+        """MinIO처럼 포트가 있는 엔드포인트도 동일"""
+        import boto3
+        from src.config import BOTO_CONFIG
+        client = boto3.client(
+            "s3", endpoint_url="http://localhost:9000",
+            aws_access_key_id="test-key", aws_secret_access_key="test-secret",
+            config=BOTO_CONFIG, region_name="us-east-1",
+        )
+        presigner = s3.SigV4Presigner("http://localhost:9000", "test-key", "test-secret")
+
+        expected = client.generate_presigned_url(
+            "get_object", Params={"Bucket": "uploads", "Key": KEYS[1]}, ExpiresIn=900
+        )
+        assert presigner.presign("GET", "uploads", KEYS[1], 900, signed_at=frozen_botocore) == expected
+
+    def test_signing_key_cached_per_day(self):
+        presigner = s3.SigV4Presigner("http://localhost:9000", "ak", "sk")
+        presigner.presign("GET", "b", "k", 60, signed_at=1_700_000_000)
+        first_key = presigner._signing_key
+
+        presigner.presign("GET", "b", "k", 60, signed_at=1_700_000_100)
+        assert presigner._signing_key is first_key
+
+        presigner.presign("GET", "b", "k", 60, signed_at=1_700_000_000 + 86400)
+        assert presigner._signing_key[0] != first_key[0]
+
+    def test_urls_work_against_moto(self, mock_s3_client):
+        """moto S3에서 presigned GET/PUT 동작"""
+        key = KEYS[1]
+        put_url = s3.presigner.presign("PUT", "test-bucket", key, 900)
+        assert requests.put(put_url, data=b"uploaded via presigned put").status_code == 200
+
+        get_url = s3.presigner.presign("GET", "test-bucket", key, 900)
+        response = requests.get(get_url)
+        assert response.status_code == 200
+        assert response.content == b"uploaded via presigned put"
+
+
+class TestPresignCache:
+    """조회용 presigned URL 캐시 테스트"""
+
+    def test_signed_at_bucket_start(self, clock, sign_calls):
+        """서명 시각이 버킷 시작으로 고정되어 워커가 달라도 같은 URL"""
+        first = s3.presign_get_url("originals/a.jpg", 3600)
+        s3._presign_cache.clear()  # 다른 워커 (캐시 없음)
+        clock.now += 123
+        second = s3.presign_get_url("originals/a.jpg", 3600)
+
+        assert first == second
+        assert sign_calls[0]["signed_at"] == clock.now - 123
+
+    def test_same_url_within_bucket(self, clock, sign_calls):
+        """같은 버킷 안에서는 같은 URL (서명 1회)"""
+        first = s3.presign_get_url("originals/a.jpg", 3600)
+        clock.now += PRESIGN_BUCKET_SECONDS - 1
+        second = s3.presign_get_url("originals/a.jpg", 3600)
+
+        assert first == second
+        assert len(sign_calls) == 1
+
+    def test_new_url_in_next_bucket(self, clock, sign_calls):
+        s3.presign_get_url("originals/a.jpg", 3600)
+        clock.now += PRESIGN_BUCKET_SECONDS
+        s3.presign_get_url("originals/a.jpg", 3600)
+
+        assert len(sign_calls) == 2
+
+    def test_signed_for_expiry_plus_bucket(self, clock, sign_calls):
+        """버킷 끝에서 받아도 요청한 만료 시간 이상 유효"""
+        url = s3.presign_get_url("originals/a.jpg", 900)
+
+        expires = int(parse_qs(urlparse(url).query)["X-Amz-Expires"][0])
+        assert expires == 900 + PRESIGN_BUCKET_SECONDS
+
+    def test_params_are_part_of_key(self, clock, sign_calls):
+        """다운로드 파라미터/만료 시간이 다르면 별도 URL"""
+        plain = s3.presign_get_url("originals/a.jpg", 900)
+        download = s3.presign_get_url(
+            "originals/a.jpg", 900,
+            ResponseContentDisposition="attachment; filename*=UTF-8''a.jpg",
+        )
+        longer = s3.presign_get_url("originals/a.jpg", 3600)
+
+        assert len({plain, download, longer}) == 3
+        assert "response-content-disposition" in download
+        assert len(sign_calls) == 3
+
+    def test_listing_reuses_urls(self, client, db, clock, sign_calls):
+        """목록을 다시 조회해도 같은 URL"""
+        from src.models.image import Image
+        db.add(Image(user_id=1, object_key="originals/listed.jpg", filename="listed.jpg", size=1))
+        db.commit()
+
+        first = client.get("/images/public").json()["images"][0]["url"]
+        second = client.get("/images/public").json()["images"][0]["url"]
+
+        assert first == second
+        assert len(sign_calls) == 1
+
+
+class SlowS3Handler(BaseHTTPRequestHandler):
+    """응답이 느린 S3 대역 (HEAD → delay초 후 404)"""
+    protocol_version = "HTTP/1.1"
+    delay = 1.0
+
+    def do_HEAD(self):
+        real_time.sleep(self.delay)
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def slow_s3(monkeypatch):
+    """HEAD가 느린 로컬 S3 대역에 붙은 클라이언트로 교체"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowS3Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    client = boto3.client(
+        "s3",
+        endpoint_url=f"http://127.0.0.1:{server.server_address[1]}",
+        aws_access_key_id="test-key",
+        aws_secret_access_key="test-secret",
+        region_name="us-east-1",
+        config=Config(s3={"addressing_style": "path"}, retries={"max_attempts": 1}),
+    )
+    import src.utils.uploads as uploads
+    monkeypatch.setattr(uploads, "s3_internal", client)
+    yield server
+    server.shutdown()
+
+
+class TestNonBlockingS3:
+    """blocking boto3 호출이 이벤트 루프를 막지 않는지 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_run_s3_timeout(self):
+        s3.start_s3_executor()
+
+        with pytest.raises(s3.S3Timeout):
+            await s3.run_s3(real_time.sleep, 0.5, timeout=0.05)
+
+    @pytest.mark.asyncio
+    async def test_concurrency_capped(self, monkeypatch):
+        """스레드 수(S3_MAX_CONCURRENCY)만큼만 동시에 실행"""
+        s3.close_s3_executor()
+        monkeypatch.setattr(s3, "S3_MAX_CONCURRENCY", 2)
+        running, peak = 0, 0
+        lock = threading.Lock()
+
+        def call():
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            real_time.sleep(0.05)
+            with lock:
+                running -= 1
+
+        try:
+            await asyncio.gather(*(s3.run_s3(call) for _ in range(6)))
+        finally:
+            s3.close_s3_executor()
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_slow_s3_does_not_block_other_requests(self, slow_s3, monkeypatch):
+        """S3 HEAD가 느려도 같은 워커의 다른 요청은 바로 응답, 느린 요청은 타임아웃 후 503"""
+        monkeypatch.setattr(s3, "S3_CALL_TIMEOUT", 0.5)
+        from src.server import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            slow = asyncio.create_task(client.get("/images/originals/slow.jpg"))
+            await asyncio.sleep(0.05)  # HEAD가 스레드에서 진행 중
+
+            start = real_time.perf_counter()
+            for _ in range(5):
+                assert (await client.get("/health")).status_code == 200
+                assert (await client.get("/images/public")).status_code == 200
+            fast_elapsed = real_time.perf_counter() - start
+
+            response = await slow
+
+        assert fast_elapsed < 0.4
+        assert response.status_code == 503
+        assert response.json()["detail"] == "Storage timeout"
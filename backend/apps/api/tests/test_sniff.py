@@ -0,0 +1,67 @@
+# backend/apps/api/tests/test_sniff.py
+
+import struct
+from src.utils.sniff import Sniffed, scan_jpeg, sniff_image
+from tests.conftest import jpeg_bytes, png_bytes
+
+
+def webp_bytes(chunk: bytes, payload: bytes) -> bytes:
+    body = b"WEBP" + chunk + struct.pack("<I", len(payload)) + payload
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+def avif_bytes(width: int, height: int, brand: bytes = b"avif") -> bytes:
+    ftyp = struct.pack(">I", 24) + b"ftyp" + brand + b"\0\0\0\0" + b"mif1miaf"
+    ispe = struct.pack(">I", 20) + b"ispe" + b"\0\0\0\0" + struct.pack(">II", width, height)
+    meta = struct.pack(">I", 8 + len(ispe)) + b"meta" + ispe
+    return ftyp + meta
+
+
+class TestSniffImage:
+    """매직 바이트로 형식/크기 판별 테스트"""
+
+    def test_jpeg(self):
+        assert sniff_image(jpeg_bytes(800, 600)) == Sniffed("image/jpeg", 800, 600)
+
+    def test_png(self):
+        assert sniff_image(png_bytes(1920, 1080)) == Sniffed("image/png", 1920, 1080)
+
+    def test_webp_lossy(self):
+        frame = b"\0" * 6 + struct.pack("<HH", 640, 480)  # 프레임 태그 + 시작 코드 + 크기
+        assert sniff_image(webp_bytes(b"VP8 ", frame)) == Sniffed("image/webp", 640, 480)
+
+    def test_webp_lossless(self):
+        bits = (640 - 1) | ((480 - 1) << 14)
+        assert sniff_image(webp_bytes(b"VP8L", b"\x2f" + bits.to_bytes(4, "little"))) == Sniffed("image/webp", 640, 480)
+
+    def test_webp_extended(self):
+        payload = b"\0" * 4 + (4000 - 1).to_bytes(3, "little") + (3000 - 1).to_bytes(3, "little")
+        assert sniff_image(webp_bytes(b"VP8X", payload)) == Sniffed("image/webp", 4000, 3000)
+
+    def test_avif(self):
+        assert sniff_image(avif_bytes(1024, 768)) == Sniffed("image/avif", 1024, 768)
+
+    def test_other_isobmff_brand_not_avif(self):
+        assert sniff_image(avif_bytes(1, 1, brand=b"heic").replace(b"mif1miaf", b"mif1heic")) is None
+
+    def test_unknown(self):
+        assert sniff_image(b"%PDF-1.7\n") is None
+        assert sniff_image(b"GIF89a" + b"\0" * 10) is None
+        assert sniff_image(b"") is None
+
+
+class TestScanJpeg:
+    """EXIF 뒤의 SOF 찾기 테스트"""
+
+    def test_sof_after_large_exif_points_to_next_segment(self):
+        data = jpeg_bytes(320, 240, exif_size=10_000)
+
+        sniffed = sniff_image(data[:4096])
+
+        assert sniffed == Sniffed("image/jpeg", next_offset=2 + 4 + 10_000)
+        assert scan_jpeg(data[sniffed.next_offset:]) == ((320, 240), None)
+
+    def test_truncated_without_sof(self):
+        data = b"\xff\xd8\xff\xda" + b"\0" * 10
+
+        assert sniff_image(data) == Sniffed("image/jpeg")
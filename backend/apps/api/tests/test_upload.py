@@ -1,5 +1,19 @@
+import base64
+import json
 import pytest
+import requests
+from botocore.exceptions import ClientError
+from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
+from src.models.image import Image, ImageStatus
+from src.models.job import Job, JobStatus
+from src.models.multipart import MultipartUpload
+from src.models.image_hash import ImageHash
+from src.models.variant import ImageVariant
+from src.utils.uploads import expire_stale_uploads
+from src.utils.multipart import abort_stale_multipart_uploads
+import src.utils.uploads as uploads
+from tests.conftest import jpeg_bytes, png_bytes
 
 class TestUploadEndpoint:
     """POST /uploads 엔드포인트 테스트"""
@@ -64,4 +78,527 @@ class TestUploadEndpoint:
         
         response = client.post("/uploads", json=payload)
         
-        assert response.status_code == 200
\ No newline at end of file
+        assert response.status_code == 200
+
+class TestUploadLifecycle:
+    """pending → ready 업로드 수명주기 테스트"""
+
+    PAYLOAD = {"filename": "photo.jpg", "contentType": "image/jpeg", "size": 1024}
+
+    def start_upload(self, client):
+        response = client.post("/uploads", json=self.PAYLOAD)
+        assert response.status_code == 200
+        return response.json()["objectKey"]
+
+    def test_pending_not_listed(self, client, db):
+        """완료 확인 전에는 목록에 노출되지 않음"""
+        key = self.start_upload(client)
+
+        image = db.query(Image).filter(Image.object_key == key).one()
+        assert image.status == ImageStatus.PENDING
+        assert client.get("/images").json()["count"] == 0
+        assert client.get(f"/images/{key}").status_code == 404
+
+    def test_complete_before_upload(self, client, db):
+        """객체가 아직 없으면 409, pending 유지"""
+        key = self.start_upload(client)
+
+        response = client.post(f"/uploads/{key}/complete")
+
+        assert response.status_code == 409
+        assert db.query(Image).filter(Image.object_key == key).one().status == ImageStatus.PENDING
+
+    def test_complete_marks_ready(self, client, db, mock_s3_client):
+        """HEAD로 실제 크기/타입 반영 후 ready"""
+        key = self.start_upload(client)
+        mock_s3_client.put_object(Bucket="test-bucket", Key=key, Body=jpeg_bytes(total_size=2048), ContentType="image/jpeg")
+
+        response = client.post(f"/uploads/{key}/complete")
+
+        assert response.status_code == 200
+        assert response.json() == {"objectKey": key, "status": "ready", "size": 2048, "contentType": "image/jpeg"}
+        assert client.get("/images").json()["images"][0]["key"] == key
+
+        # 재호출해도 같은 결과
+        assert client.post(f"/uploads/{key}/complete").json()["status"] == "ready"
+
+    def test_complete_enqueues_worker_job(self, client, db, mock_s3_client):
+        """ready 전환 시 후처리 작업이 한 번만 등록됨"""
+        key = self.start_upload(client)
+        mock_s3_client.put_object(Bucket="test-bucket", Key=key, Body=jpeg_bytes(), ContentType="image/jpeg")
+
+        client.post(f"/uploads/{key}/complete")
+        client.post(f"/uploads/{key}/complete")
+
+        image = db.query(Image).filter(Image.object_key == key).one()
+        jobs = db.query(Job).order_by(Job.kind).all()
+        assert [job.kind for job in jobs] == ["process_image"]  # 한 번만 (classify는 워커가 이어서 등록)
+        for job in jobs:
+            assert job.status == JobStatus.QUEUED
+            assert job.payload == {"image_id": image.id, "object_key": key}
+
+    def test_complete_rejects_wrong_type(self, client, db, mock_s3_client):
+        key = self.start_upload(client)
+        mock_s3_client.put_object(Bucket="test-bucket", Key=key, Body=b"%PDF", ContentType="application/pdf")
+
+        response = client.post(f"/uploads/{key}/complete")
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Unsupported file type"
+        assert db.query(Image).filter(Image.object_key == key).one().status == ImageStatus.REJECTED
+        assert client.get("/images").json()["count"] == 0
+
+    def test_complete_other_users_upload(self, client, db):
+        db.add(Image(user_id=2, object_key="originals/other.jpg", status=ImageStatus.PENDING))
+        db.commit()
+
+        assert client.post("/uploads/originals/other.jpg/complete").status_code == 404
+
+    def test_ready_row_skips_head(self, client, db):
+        """ready 행은 S3 HEAD 없이 presigned URL 발급"""
+        db.add(Image(user_id=1, object_key="originals/ready-only-in-db.jpg", status=ImageStatus.READY))
+        db.commit()
+
+        with patch("src.utils.uploads.head_object") as head:
+            response = client.get("/images/originals/ready-only-in-db.jpg")
+
+        assert response.status_code == 200
+        head.assert_not_called()
+
+
+STORED_SHA = "ab" * 32
+
+
+def stored_image(db, status=ImageStatus.READY, size=2048):
+    """워커가 처리를 마친 이미지 (해시 + 파생본, 내용 해시 STORED_SHA)"""
+    image = Image(
+        user_id=2, object_key="originals/source.jpg", filename="source.jpg", content_type="image/jpeg",
+        size=size, width=640, height=480, status=status,
+    )
+    db.add(image)
+    db.flush()
+    db.add(ImageHash(
+        image_id=image.id, sha256=STORED_SHA, phash=1, dhash=1,
+        phash_band0=0, phash_band1=0, phash_band2=0, phash_band3=1,
+    ))
+    db.add(ImageVariant(image_id=image.id, object_key="derivatives/source/256.webp", format="webp", width=256, height=192, size=100))
+    db.commit()
+    return image
+
+
+class TestContentAddressedUpload:
+    """POST /uploads sha256 핸드셰이크 (같은 내용이면 업로드 생략)"""
+
+    def payload(self, **overrides):
+        return {"filename": "copy.jpg", "contentType": "image/jpeg", "size": 2048, "sha256": STORED_SHA.upper(), **overrides}
+
+    def test_already_present(self, client, db):
+        source = stored_image(db)
+
+        response = client.post("/uploads", json=self.payload())
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["alreadyPresent"] is True
+        assert data["presignedUrl"] is None and data["method"] is None
+        assert data["objectKey"] == source.object_key
+
+        image = db.query(Image).filter(Image.user_id == 1).one()
+        assert (image.status, image.object_key, image.filename) == (ImageStatus.READY, source.object_key, "copy.jpg")
+        assert (image.width, image.height, image.size) == (640, 480, 2048)
+        assert [v.object_key for v in db.query(ImageVariant).filter_by(image_id=image.id)] == ["derivatives/source/256.webp"]
+        assert [job.payload["image_id"] for job in db.query(Job)] == [image.id]  # 워커가 중복으로 연결
+        assert client.get("/images").json()["count"] == 1
+
+    @pytest.mark.parametrize("status,size,sha", [
+        (ImageStatus.READY, 2048, "cd" * 32),        # 모르는 해시
+        (ImageStatus.READY, 4096, "ab" * 32),        # 크기가 다름
+        (ImageStatus.QUARANTINED, 2048, "ab" * 32),  # ready가 아닌 이미지
+    ])
+    def test_falls_back_to_upload(self, client, db, status, size, sha):
+        stored_image(db, status=status, size=size)
+
+        data = client.post("/uploads", json=self.payload(sha256=sha)).json()
+
+        assert data["alreadyPresent"] is False
+        assert data["presignedUrl"] and data["objectKey"] != "originals/source.jpg"
+        assert db.query(Image).filter(Image.user_id == 1).one().status == ImageStatus.PENDING
+
+    def test_still_validates_request(self, client, db):
+        stored_image(db)
+
+        assert client.post("/uploads", json=self.payload(sha256="not-a-hash")).status_code == 422
+        assert client.post("/uploads", json=self.payload(filename="copy.pdf")).status_code == 400
+
+
+class TestPresignedPost:
+    """POST 정책 업로드 모드 테스트 (크기/타입을 스토리지가 검사)"""
+
+    PAYLOAD = {"filename": "photo.jpg", "contentType": "image/jpeg", "size": 1024, "mode": "post"}
+
+    def policy_of(self, fields):
+        return json.loads(base64.b64decode(fields["policy"]))
+
+    def test_post_policy_conditions(self, client):
+        response = client.post("/uploads", json=self.PAYLOAD)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["method"] == "POST"
+        assert data["fields"]["key"] == data["objectKey"]
+        assert data["fields"]["Content-Type"] == "image/jpeg"
+        conditions = self.policy_of(data["fields"])["conditions"]
+        assert ["content-length-range", 1, 10 * 1024 * 1024] in conditions
+        assert {"Content-Type": "image/jpeg"} in conditions
+        assert {"key": data["objectKey"]} in conditions
+
+    def test_put_is_default(self, client):
+        data = client.post("/uploads", json={**self.PAYLOAD, "mode": "put"}).json()
+
+        assert data["method"] == "PUT"
+        assert data["fields"] is None
+
+    def test_invalid_mode(self, client):
+        assert client.post("/uploads", json={**self.PAYLOAD, "mode": "ftp"}).status_code == 422
+
+    def test_post_upload_then_complete(self, client, db):
+        """폼 업로드 → 완료 확인까지 (moto는 정책 조건을 검사하지 않으므로 흐름만 확인)"""
+        data = client.post("/uploads", json=self.PAYLOAD).json()
+
+        uploaded = requests.post(
+            data["presignedUrl"], data=data["fields"], files={"file": ("photo.jpg", jpeg_bytes())}
+        )
+        assert uploaded.status_code == 204
+
+        response = client.post(f"/uploads/{data['objectKey']}/complete")
+        assert response.status_code == 200
+        assert response.json()["contentType"] == "image/jpeg"
+
+
+class TestMultipartUpload:
+    """멀티파트 업로드 테스트 (파트 URL 발급 → 파트 PUT → 완료/중단)"""
+
+    PART = 5 * 1024 * 1024
+
+    def start(self, client, size=PART + 1024):
+        response = client.post("/uploads/multipart", json={"filename": "big.jpg", "contentType": "image/jpeg", "size": size})
+        assert response.status_code == 200
+        return response.json()
+
+    def upload_parts(self, data, body):
+        etags = []
+        for part in data["parts"]:
+            start = (part["partNumber"] - 1) * data["partSize"]
+            uploaded = requests.put(part["url"], data=body[start:start + data["partSize"]])
+            assert uploaded.status_code == 200
+            etags.append({"partNumber": part["partNumber"], "etag": uploaded.headers["ETag"]})
+        return etags
+
+    def pending_uploads(self, mock_s3_client, key):
+        return mock_s3_client.list_multipart_uploads(Bucket="test-bucket", Prefix=key).get("Uploads", [])
+
+    def test_initiate_presigns_all_parts(self, client, db):
+        data = self.start(client, size=self.PART + 1)
+
+        assert data["partSize"] == self.PART
+        assert [part["partNumber"] for part in data["parts"]] == [1, 2]
+        assert all("uploadId=" in part["url"] and f"partNumber={part['partNumber']}" in part["url"] for part in data["parts"])
+        image = db.query(Image).filter_by(object_key=data["objectKey"]).one()
+        assert image.status == ImageStatus.PENDING
+        assert db.get(MultipartUpload, data["uploadId"]).image_id == image.id
+
+    def test_initiate_validates_request(self, client):
+        payload = {"filename": "big.gif", "contentType": "image/gif", "size": 1024}
+        assert client.post("/uploads/multipart", json=payload).status_code == 400
+
+    def test_upload_parts_then_complete(self, client, db, mock_s3_client):
+        """ETag 없이 완료 요청 → 서버가 올라간 파트 목록으로 합침"""
+        body = jpeg_bytes(total_size=self.PART + 1024)
+        data = self.start(client, size=len(body))
+        self.upload_parts(data, body)
+
+        response = client.post(f"/uploads/multipart/{data['uploadId']}/complete")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == ImageStatus.READY
+        assert response.json()["size"] == len(body)
+        assert mock_s3_client.get_object(Bucket="test-bucket", Key=data["objectKey"])["Body"].read() == body
+        assert db.query(MultipartUpload).count() == 0
+
+    def test_complete_with_client_etags(self, client, mock_s3_client):
+        body = jpeg_bytes(total_size=self.PART + 1024)
+        data = self.start(client, size=len(body))
+        etags = self.upload_parts(data, body)
+
+        response = client.post(f"/uploads/multipart/{data['uploadId']}/complete", json={"parts": etags})
+
+        assert response.status_code == 200
+        # 이후 재시도는 일반 완료 엔드포인트로 (멱등)
+        assert client.post(f"/uploads/{data['objectKey']}/complete").status_code == 200
+
+    def test_resume_with_fresh_part_urls(self, client, mock_s3_client):
+        """첫 파트만 올라간 뒤 끊김 → 남은 파트 URL만 다시 받아 이어 올림"""
+        body = jpeg_bytes(total_size=self.PART + 1024)
+        data = self.start(client, size=len(body))
+        self.upload_parts({**data, "parts": data["parts"][:1]}, body)
+
+        response = client.post(f"/uploads/multipart/{data['uploadId']}/parts", json={"partNumbers": [2]})
+        assert response.status_code == 200
+        self.upload_parts({**data, "parts": response.json()["parts"]}, body)
+
+        assert client.post(f"/uploads/multipart/{data['uploadId']}/complete").status_code == 200
+
+    def test_part_numbers_out_of_range(self, client):
+        data = self.start(client)
+
+        response = client.post(f"/uploads/multipart/{data['uploadId']}/parts", json={"partNumbers": [3]})
+
+        assert response.status_code == 400
+
+    def test_complete_without_parts(self, client):
+        data = self.start(client)
+
+        response = client.post(f"/uploads/multipart/{data['uploadId']}/complete")
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "No parts uploaded"
+
+    def test_abort(self, client, db, mock_s3_client):
+        data = self.start(client)
+
+        assert client.delete(f"/uploads/multipart/{data['uploadId']}").status_code == 204
+
+        assert self.pending_uploads(mock_s3_client, data["objectKey"]) == []
+        assert db.query(Image).filter_by(object_key=data["objectKey"]).one().status == ImageStatus.EXPIRED
+        assert client.delete(f"/uploads/multipart/{data['uploadId']}").status_code == 404
+
+    def test_other_users_upload(self, client, db):
+        image = Image(user_id=2, object_key="originals/other.jpg", status=ImageStatus.PENDING)
+        db.add(image)
+        db.commit()
+        upload = MultipartUpload(image_id=image.id, upload_id="x", part_size=self.PART, part_count=1)
+        db.add(upload)
+        db.commit()
+
+        assert client.post(f"/uploads/multipart/{upload.id}/complete").status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_sweeper_aborts_abandoned(self, client, db, mock_s3_client, async_session_factory):
+        """moto는 Initiated를 과거 고정 시각으로 돌려주므로 모든 업로드가 방치된 것으로 보임"""
+        data = self.start(client)
+        # DB 행 없이 스토리지에만 남은 업로드도 대상
+        mock_s3_client.create_multipart_upload(Bucket="test-bucket", Key="originals/orphan.jpg")
+
+        async with async_session_factory() as session:
+            aborted = await abort_stale_multipart_uploads(session, max_age=3600)
+
+        assert aborted >= 2
+        assert self.pending_uploads(mock_s3_client, data["objectKey"]) == []
+        assert self.pending_uploads(mock_s3_client, "originals/orphan.jpg") == []
+        assert db.query(MultipartUpload).count() == 0
+
+
+class TestContentValidation:
+    """완료 시 매직 바이트 검증 (앞부분 ranged GET만) 테스트"""
+
+    def start_upload(self, client):
+        response = client.post("/uploads", json={"filename": "photo.jpg", "contentType": "image/jpeg", "size": 1024})
+        return response.json()["objectKey"]
+
+    def test_records_sniffed_dimensions(self, client, db, mock_s3_client):
+        key = self.start_upload(client)
+        mock_s3_client.put_object(Bucket="test-bucket", Key=key, Body=jpeg_bytes(1200, 900), ContentType="image/jpeg")
+
+        assert client.post(f"/uploads/{key}/complete").status_code == 200
+
+        image = db.query(Image).filter(Image.object_key == key).one()
+        assert (image.width, image.height) == (1200, 900)
+
+    def test_mismatch_quarantined(self, client, db, mock_s3_client):
+        """JPEG라고 선언했지만 실제로는 PNG → 격리 (quarantine/으로 이동)"""
+        key = self.start_upload(client)
+        mock_s3_client.put_object(Bucket="test-bucket", Key=key, Body=png_bytes(), ContentType="image/jpeg")
+
+        response = client.post(f"/uploads/{key}/complete")
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Content is image/png, not image/jpeg"
+        assert db.query(Image).filter(Image.object_key == key).one().status == ImageStatus.QUARANTINED
+        mock_s3_client.head_object(Bucket="test-bucket", Key=f"quarantine/{key}")
+        with pytest.raises(ClientError):
+            mock_s3_client.head_object(Bucket="test-bucket", Key=key)
+        assert client.get(f"/images/{key}").status_code == 404
+        assert db.query(Job).count() == 0
+
+        # 재호출해도 같은 상태
+        assert client.post(f"/uploads/{key}/complete").json()["detail"] == "Upload quarantined"
+
+    def test_unrecognized_content_quarantined(self, client, db, mock_s3_client):
+        key = self.start_upload(client)
+        mock_s3_client.put_object(Bucket="test-bucket", Key=key, Body=b"<html>", ContentType="image/jpeg")
+
+        response = client.post(f"/uploads/{key}/complete")
+
+        assert response.json()["detail"] == "Unrecognized image format"
+        assert db.query(Image).filter(Image.object_key == key).one().status == ImageStatus.QUARANTINED
+
+    def test_reads_only_prefix_of_large_object(self, client, db, mock_s3_client):
+        """파일 크기와 무관하게 앞 SNIFF_BYTES만 읽음"""
+        key = self.start_upload(client)
+        body = jpeg_bytes(total_size=5 * 1024 * 1024)
+        mock_s3_client.put_object(Bucket="test-bucket", Key=key, Body=body, ContentType="image/jpeg")
+
+        with patch("src.utils.uploads._read_range", wraps=uploads._read_range) as read_range:
+            assert client.post(f"/uploads/{key}/complete").status_code == 200
+
+        read_range.assert_called_once_with(key, 0, 4096)
+
+    def test_sof_after_large_exif(self, client, db, mock_s3_client):
+        """EXIF가 커서 크기 정보가 뒤에 있으면 그 위치만 이어서 읽음"""
+        key = self.start_upload(client)
+        body = jpeg_bytes(640, 480, exif_size=20_000)
+        mock_s3_client.put_object(Bucket="test-bucket", Key=key, Body=body, ContentType="image/jpeg")
+
+        with patch("src.utils.uploads._read_range", wraps=uploads._read_range) as read_range:
+            assert client.post(f"/uploads/{key}/complete").status_code == 200
+
+        assert [c.args[1] for c in read_range.call_args_list] == [0, 2 + 4 + 20_000]
+        image = db.query(Image).filter(Image.object_key == key).one()
+        assert (image.width, image.height) == (640, 480)
+
+    def test_too_many_pixels_rejected(self, client, db, mock_s3_client):
+        key = self.start_upload(client)
+        mock_s3_client.put_object(Bucket="test-bucket", Key=key, Body=jpeg_bytes(10000, 10000), ContentType="image/jpeg")
+
+        response = client.post(f"/uploads/{key}/complete")
+
+        assert response.json()["detail"] == "Image dimensions too large"
+        assert db.query(Image).filter(Image.object_key == key).one().status == ImageStatus.REJECTED
+
+    def test_unknown_dimensions_rejected(self, client, db, mock_s3_client):
+        """읽기 횟수 안에 크기 정보(SOF)를 못 찾으면 픽셀 제한을 건너뛰고 ready로 두지 않음"""
+        key = self.start_upload(client)
+        body = jpeg_bytes(10000, 10000, exif_size=20_000)
+        mock_s3_client.put_object(Bucket="test-bucket", Key=key, Body=body, ContentType="image/jpeg")
+
+        with patch("src.utils.uploads.SNIFF_MAX_READS", 1):
+            response = client.post(f"/uploads/{key}/complete")
+
+        assert response.json()["detail"] == "Image dimensions unknown"
+        assert db.query(Image).filter(Image.object_key == key).one().status == ImageStatus.REJECTED
+        assert db.query(Job).count() == 0
+
+
+class TestPendingSweeper:
+    """오래된 pending 업로드 정리 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_expire_stale_uploads(self, db, mock_s3_client, async_session_factory):
+        old = datetime.utcnow() - timedelta(hours=3)
+        db.add_all([
+            Image(user_id=1, object_key="originals/arrived.jpg", status=ImageStatus.PENDING, created_at=old),
+            Image(user_id=1, object_key="originals/never.jpg", status=ImageStatus.PENDING, created_at=old),
+            Image(user_id=1, object_key="originals/recent.jpg", status=ImageStatus.PENDING),
+        ])
+        db.commit()
+        mock_s3_client.put_object(Bucket="test-bucket", Key="originals/arrived.jpg", Body=jpeg_bytes(), ContentType="image/jpeg")
+
+        async with async_session_factory() as session:
+            counts = await expire_stale_uploads(session, max_age=3600)
+
+        assert counts == {"ready": 1, "rejected": 0, "quarantined": 0, "expired": 1}
+        db.expire_all()
+        statuses = {img.object_key: img.status for img in db.query(Image).all()}
+        assert statuses == {
+            "originals/arrived.jpg": ImageStatus.READY,
+            "originals/never.jpg": ImageStatus.EXPIRED,
+            "originals/recent.jpg": ImageStatus.PENDING,
+        }
+
+
+class TestBatchUpload:
+    """POST /uploads/batch 테스트 (앨범 업로드 예약)"""
+
+    def item(self, i, **overrides):
+        return {"filename": f"photo{i}.jpg", "contentType": "image/jpeg", "size": 1024, **overrides}
+
+    def test_album_single_insert(self, client, db, query_counter):
+        items = [self.item(i) for i in range(50)]
+
+        response = client.post("/uploads/batch", json={"items": items})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["accepted"] == 50 and data["failed"] == 0
+        assert [item["index"] for item in data["items"]] == list(range(50))
+        assert all(item["method"] == "PUT" and item["presignedUrl"] for item in data["items"])
+        assert len({item["objectKey"] for item in data["items"]}) == 50
+        inserts = [s for s in query_counter if s.lstrip().upper().startswith("INSERT")]
+        assert len(inserts) == 1
+        rows = db.query(Image).filter(Image.object_key.in_([item["objectKey"] for item in data["items"]])).all()
+        assert len(rows) == 50
+        assert {row.status for row in rows} == {ImageStatus.PENDING}
+        assert {row.filename for row in rows} == {f"photo{i}.jpg" for i in range(50)}
+
+    def test_partial_failure(self, client, db):
+        items = [
+            self.item(0),
+            self.item(1, size=11 * 1024 * 1024),
+            self.item(2, filename="doc.pdf", contentType="application/pdf"),
+            self.item(3, mode="post"),
+        ]
+
+        data = client.post("/uploads/batch", json={"items": items}).json()
+
+        assert data["accepted"] == 2 and data["failed"] == 2
+        results = data["items"]
+        assert results[1] == {
+            "index": 1, "presignedUrl": None, "objectKey": None, "method": None, "fields": None,
+            "alreadyPresent": False, "error": "File too large",
+        }
+        assert results[2]["error"] == "Unsupported file type"
+        assert results[3]["method"] == "POST" and results[3]["fields"]["key"] == results[3]["objectKey"]
+        assert db.query(Image).count() == 2
+
+    def test_already_present_items(self, client, db, query_counter):
+        """sha256이 일치한 항목만 업로드 없이 공유, 나머지는 평소처럼 pending"""
+        source = stored_image(db)
+        query_counter.clear()
+        items = [
+            self.item(0, size=2048, sha256=STORED_SHA),
+            self.item(1, size=2048, sha256="cd" * 32),  # 모르는 해시
+            self.item(2),
+        ]
+
+        data = client.post("/uploads/batch", json={"items": items}).json()
+
+        assert data["accepted"] == 3 and data["failed"] == 0
+        shared, unknown, plain = data["items"]
+        assert shared["alreadyPresent"] is True and shared["presignedUrl"] is None
+        assert shared["objectKey"] == source.object_key
+        assert not unknown["alreadyPresent"] and unknown["presignedUrl"]
+        assert not plain["alreadyPresent"] and plain["presignedUrl"]
+        assert len([s for s in query_counter if "JOIN image_hashes" in s]) == 1  # 항목 수와 무관하게 조회 한 번
+
+        image = db.query(Image).filter(Image.user_id == 1, Image.object_key == source.object_key).one()
+        assert (image.status, image.filename) == (ImageStatus.READY, "photo0.jpg")
+        assert [v.object_key for v in db.query(ImageVariant).filter_by(image_id=image.id)] == ["derivatives/source/256.webp"]
+        assert [job.payload["image_id"] for job in db.query(Job)] == [image.id]
+        assert db.query(Image).filter(Image.user_id == 1, Image.status == ImageStatus.PENDING).count() == 2
+        assert client.get("/images").json()["count"] == 1
+
+    def test_batch_then_complete(self, client, mock_s3_client):
+        key = client.post("/uploads/batch", json={"items": [self.item(0)]}).json()["items"][0]["objectKey"]
+        mock_s3_client.put_object(Bucket="test-bucket", Key=key, Body=jpeg_bytes(), ContentType="image/jpeg")
+
+        assert client.post(f"/uploads/{key}/complete").status_code == 200
+
+    def test_all_invalid_no_insert(self, client, db, query_counter):
+        data = client.post("/uploads/batch", json={"items": [self.item(0, size=11 * 1024 * 1024)]}).json()
+
+        assert data["accepted"] == 0 and data["failed"] == 1
+        assert query_counter == []
+
+    def test_limits(self, client):
+        assert client.post("/uploads/batch", json={"items": []}).status_code == 400
+        assert client.post("/uploads/batch", json={"items": [self.item(i) for i in range(101)]}).status_code == 400
@@ -0,0 +1,159 @@
+# src/models/engine.py (api/auth/worker 공통 - 세 서비스에 같은 파일 유지, CI가 diff로 확인)
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from uuid import uuid4
+import os
+import threading
+import time
+
+# 커넥션 풀 설정 (프로세스당 값 - 워커 수 × (POOL_SIZE + MAX_OVERFLOW)가 Postgres max_connections를 넘지 않게)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))  # 커넥션 대기 상한(초)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # 이 시간(초)보다 오래된 커넥션은 재연결 (-1: 끔)
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"  # 체크아웃 시 끊긴 커넥션 감지
+# PgBouncer transaction pooling 모드: 앱 쪽 풀은 끄고(NullPool) 서버측 prepared statement 캐시 비활성화
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+
+
+class PoolMetrics:
+    """커넥션 체크아웃 대기 시간 누적 (풀 재생성 후에도 유지)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+            }
+
+
+class _TimedPoolMixin:
+    """QueuePool 체크아웃(_do_get)에 걸린 시간 측정"""
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - start)
+        return conn
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def to_async_url(url: str) -> str:
+    """동기 드라이버 URL을 async 드라이버 URL로 변환 (Postgres → asyncpg, SQLite → aiosqlite)"""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+# 이름 -> 엔진 (풀 게이지 조회용)
+_engines: dict = {}
+
+
+def _pool_options(url, is_async: bool) -> dict:
+    """URL/설정에 맞는 풀 관련 create_engine 인자"""
+    if url.get_backend_name() != "postgresql":
+        # SQLite 등은 드라이버 기본 풀 사용 (테스트/로컬)
+        return {}
+
+    if DB_PGBOUNCER:
+        options = {"poolclass": NullPool}
+        if url.get_driver_name() == "asyncpg":
+            # transaction 모드에서는 커넥션이 트랜잭션마다 바뀌므로 prepared statement 재사용 불가
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        return options
+
+    return {
+        "poolclass": TimedAsyncQueuePool if is_async else TimedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def create_db_engine(url: str, name: str = "default", is_async: bool = False, **kwargs):
+    """
+    설정값(DB_POOL_*)을 적용한 SQLAlchemy 엔진 생성
+
+    Args:
+        url: DB URL (async 엔진이면 async 드라이버 URL)
+        name: 풀 게이지에 표시할 이름
+        is_async: create_async_engine 사용 여부
+        kwargs: create_engine에 그대로 전달 (풀 설정보다 우선)
+    """
+    options = _pool_options(make_url(url), is_async)
+    options.update(kwargs)
+
+    engine = (create_async_engine if is_async else create_engine)(url, **options)
+    pool = engine.pool
+    if isinstance(pool, _TimedPoolMixin):
+        pool.metrics = PoolMetrics()
+
+    _engines[name] = engine
+    return engine
+
+
+def pool_stats() -> dict:
+    """엔진별 커넥션 풀 게이지 (checked_out/overflow/대기 시간)"""
+    stats = {}
+    for name, engine in _engines.items():
+        pool = engine.pool
+        entry = {"pool": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            entry.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+            })
+        if isinstance(pool, _TimedPoolMixin):
+            entry.update(pool.metrics.snapshot())
+        stats[name] = entry
+    return stats
@@ -1,5 +1,6 @@
 # apps/auth/src/models/user.py
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, UniqueConstraint, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import relationship, Session
 from sqlalchemy.sql import func
 from typing import Optional, Dict
@@ -62,19 +63,20 @@ class Image(Base):
 
 # ===== CRUD 함수들 =====
 
-def find_or_create_user(db: Session, oauth_info: Dict) -> User:
-    """OAuth 정보로 사용자 찾기 또는 생성"""
+async def find_or_create_user(db: AsyncSession, oauth_info: Dict) -> User:
+    """OAuth 정보로 사용자 찾기 또는 생성 (async 세션, 연결된 계정은 join 한 번으로 조회)"""
     provider = oauth_info['provider']
     provider_user_id = oauth_info['provider_user_id']
     
-    # 기존 OAuth 계정 찾기
-    oauth_account = db.query(OAuthAccount).filter(
-        OAuthAccount.provider == provider,
-        OAuthAccount.provider_user_id == provider_user_id
-    ).first()
+    # 기존 OAuth 계정의 사용자 찾기
+    user = await db.scalar(
+        select(User)
+        .join(OAuthAccount, OAuthAccount.user_id == User.id)
+        .where(OAuthAccount.provider == provider, OAuthAccount.provider_user_id == provider_user_id)
+    )
     
-    if oauth_account:
-        return oauth_account.user
+    if user:
+        return user
     
     # 새 사용자 생성
     user = User(
@@ -83,7 +85,7 @@ def find_or_create_user(db: Session, oauth_info: Dict) -> User:
         avatar_url=oauth_info.get('avatar_url')
     )
     db.add(user)
-    db.flush()
+    await db.flush()
     
     # OAuth 계정 연결
     oauth_account = OAuthAccount(
@@ -92,8 +94,8 @@ def find_or_create_user(db: Session, oauth_info: Dict) -> User:
         provider_user_id=provider_user_id
     )
     db.add(oauth_account)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     
     return user
 
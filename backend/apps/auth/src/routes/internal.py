@@ -0,0 +1,22 @@
+# apps/auth/src/routes/internal.py
+from fastapi import APIRouter, HTTPException, Header, Depends
+from src.models.engine import pool_stats
+import os
+import secrets
+
+INTERNAL_API_TOKEN = os.getenv("INTERNAL_API_TOKEN", "")
+
+
+def require_internal_token(x_internal_token: str = Header("")):
+    """서비스 간 호출 전용 (INTERNAL_API_TOKEN 미설정 시 엔드포인트 비활성화)"""
+    if not INTERNAL_API_TOKEN or not secrets.compare_digest(x_internal_token, INTERNAL_API_TOKEN):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+router = APIRouter(prefix="/internal", dependencies=[Depends(require_internal_token)])
+
+
+@router.get("/metrics")
+def get_metrics():
+    """DB 커넥션 풀 등 내부 지표"""
+    return {"db_pool": pool_stats()}
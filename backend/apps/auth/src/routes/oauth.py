@@ -4,10 +4,10 @@ from fastapi.responses import RedirectResponse
 from starlette.config import Config
 from src.utils.oauth_client import oauth, get_google_user_info 
 from src.utils.jwt import create_jwt_token, create_refresh_token, verify_refresh_token
-from src.models.user import find_or_create_user, get_user_by_id
+from src.models.user import User, find_or_create_user
 from src.models.database import get_db
 import os
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -27,14 +27,14 @@ async def google_login(request: Request):
     return await oauth.google.authorize_redirect(request, redirect_uri)
 
 @router.get("/google/callback")
-async def google_callback(request: Request, db: Session = Depends(get_db)):
+async def google_callback(request: Request, db: AsyncSession = Depends(get_db)):
     """Google OAuth 콜백"""
     try:
         token = await oauth.google.authorize_access_token(request)
         user_info = await get_google_user_info(token)
         
         # DB에서 사용자 찾기/생성
-        user = find_or_create_user(db, user_info)
+        user = await find_or_create_user(db, user_info)
         
         # ✅ Access Token + Refresh Token 모두 발급
         access_token = create_jwt_token(
@@ -53,9 +53,9 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
         raise HTTPException(500, f"OAuth failed: {str(e)}")
 
 @router.post("/refresh")
-def refresh_access_token(
+async def refresh_access_token(
     request: RefreshTokenRequest,  # ✅ Pydantic 모델 사용
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Refresh Token으로 새로운 Access Token 발급
@@ -76,7 +76,7 @@ def refresh_access_token(
         user_id = verify_refresh_token(request.refresh_token)  # ✅ request.refresh_token
         
         # DB에서 사용자 정보 조회
-        user = get_user_by_id(db, user_id)
+        user = await db.get(User, user_id)
         
         if not user:
             raise HTTPException(404, "User not found")
@@ -96,7 +96,7 @@ def refresh_access_token(
 
 # 테스트용
 @router.post("/test-token")
-def create_test_token(email: str = "test@example.com", db: Session = Depends(get_db)):
+async def create_test_token(email: str = "test@example.com", db: AsyncSession = Depends(get_db)):
     """테스트용 토큰 생성"""
     if os.getenv("ENVIRONMENT") == "production":
         raise HTTPException(403, "Not available in production")
@@ -108,7 +108,7 @@ def create_test_token(email: str = "test@example.com", db: Session = Depends(get
         'name': "Test User",
     }
     
-    user = find_or_create_user(db, user_info)
+    user = await find_or_create_user(db, user_info)
     access_token = create_jwt_token(user.id, user.email, user.name)
     refresh_token = create_refresh_token(user.id)  # ✅ 추가
     
@@ -2,7 +2,7 @@
 from fastapi import Depends, FastAPI, HTTPException
 from fastapi.security import HTTPBearer
 from src.utils.jwt import verify_jwt_token
-from src.routes import oauth, auth
+from src.routes import oauth, auth, internal
 from starlette.middleware.sessions import SessionMiddleware
 import os
 from starlette.middleware.cors import CORSMiddleware
@@ -27,4 +27,5 @@ app.add_middleware(
 )
 
 app.include_router(oauth.router, prefix="/auth/oauth", tags=["OAuth"])
-app.include_router(auth.router, prefix="/auth", tags=["Auth"])
\ No newline at end of file
+app.include_router(auth.router, prefix="/auth", tags=["Auth"])
+app.include_router(internal.router, include_in_schema=False)
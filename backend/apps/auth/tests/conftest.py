@@ -3,6 +3,8 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
 from starlette.middleware.sessions import SessionMiddleware
 import os
 import tempfile
@@ -33,6 +35,10 @@ SQLALCHEMY_DATABASE_URL = f"sqlite:///{TEST_DB_FILE}"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, echo=False)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 앱 세션용 async 엔진 (같은 DB 파일, 요청마다 새 커넥션)
+async_engine = create_async_engine(f"sqlite+aiosqlite:///{TEST_DB_FILE}", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 # 테이블 생성
 Base.metadata.create_all(bind=engine)
 
@@ -56,12 +62,10 @@ def db():
 @pytest.fixture(scope="function")
 def client(db):
     """FastAPI TestClient"""
-    def override_get_db():
-        try:
-            yield db
-        finally:
-            pass
-    
+    async def override_get_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+
     app.dependency_overrides[get_db] = override_get_db
     
     with TestClient(app) as test_client:
@@ -70,6 +74,12 @@ def client(db):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def async_session_factory():
+    """앱과 같은 테스트 DB에 붙는 async 세션 팩토리 (CRUD 함수 직접 호출용)"""
+    return TestingAsyncSessionLocal
+
+
 @pytest.fixture
 def mock_user():
     return {
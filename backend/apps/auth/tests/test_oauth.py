@@ -47,7 +47,8 @@ class TestOAuthRoutes:
 class TestUserModel:
     """User 모델 테스트"""
     
-    def test_find_or_create_user_new(self, db):
+    @pytest.mark.asyncio
+    async def test_find_or_create_user_new(self, db, async_session_factory):
         """새 사용자 생성"""
         from src.models.user import find_or_create_user
         
@@ -59,13 +60,15 @@ class TestUserModel:
             'avatar_url': 'https://example.com/avatar.jpg'
         }
         
-        user = find_or_create_user(db, oauth_info)
+        async with async_session_factory() as session:
+            user = await find_or_create_user(session, oauth_info)
         
         assert user.email == 'new@example.com'
         assert user.name == 'New User'
         assert user.id is not None
     
-    def test_find_or_create_user_existing(self, db):
+    @pytest.mark.asyncio
+    async def test_find_or_create_user_existing(self, db, async_session_factory):
         """기존 사용자 찾기"""
         from src.models.user import find_or_create_user
         
@@ -76,11 +79,13 @@ class TestUserModel:
             'name': 'Existing User'
         }
         
-        # 첫 번째 생성
-        user1 = find_or_create_user(db, oauth_info)
+        async with async_session_factory() as session:
+            # 첫 번째 생성
+            user1 = await find_or_create_user(session, oauth_info)
         
-        # 같은 정보로 다시 호출
-        user2 = find_or_create_user(db, oauth_info)
+        async with async_session_factory() as session:
+            # 같은 정보로 다시 호출
+            user2 = await find_or_create_user(session, oauth_info)
         
         # 같은 사용자여야 함
         assert user1.id == user2.id
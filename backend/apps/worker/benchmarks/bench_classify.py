@@ -0,0 +1,75 @@
+"""
+분류 처리량 벤치마크 (코어 하나 기준 images/sec)
+
+워커 프로세스 하나와 같은 조건(추론 스레드 1개, 디코딩도 같은 스레드)에서
+JPEG 디코딩(draft 축소) → NumPy 전처리 → ONNX 추론을 배치 크기별로 측정한다.
+S3 다운로드는 제외한다. 워커 전체 처리량은 대략 이 값 × WORKER_PROCESSES.
+
+실행 (apps/worker 디렉토리에서):
+    python -m benchmarks.bench_classify [이미지 수] [모델 경로] [원본 가로 px]
+"""
+import io
+import os
+import sys
+import time
+import numpy as np
+from PIL import Image as PILImage
+from src.utils.classifier import Classifier
+
+DEFAULT_MODEL = os.path.join(os.path.dirname(__file__), "..", "tests", "data", "tiny_classifier.onnx")
+BATCH_SIZES = [1, 8, 32, 64]
+
+
+def make_jpegs(count: int, width: int) -> list[bytes]:
+    """사진처럼 압축되도록 부드러운 그라디언트 + 노이즈"""
+    rng = np.random.default_rng(0)
+    height = width * 3 // 4
+    base = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+    images = []
+    for _ in range(count):
+        pixels = base + rng.normal(0, 20, (height, width, 3)) + rng.uniform(0, 60, 3)
+        buffer = io.BytesIO()
+        PILImage.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)).save(buffer, format="JPEG", quality=85)
+        images.append(buffer.getvalue())
+    return images
+
+
+def run(classifier: Classifier, jpegs: list[bytes], batch_size: int) -> dict:
+    decode = infer = 0.0
+    for start in range(0, len(jpegs), batch_size):
+        t0 = time.perf_counter()
+        pixels = [classifier.fit(PILImage.open(io.BytesIO(data))) for data in jpegs[start:start + batch_size]]
+        t1 = time.perf_counter()
+        classifier.predict(classifier.preprocess(pixels))
+        t2 = time.perf_counter()
+        decode += t1 - t0
+        infer += t2 - t1
+    total = decode + infer
+    return {
+        "images_per_sec": len(jpegs) / total,
+        "decode_ms": decode / len(jpegs) * 1000,
+        "infer_ms": infer / len(jpegs) * 1000,
+    }
+
+
+def main(count: int, model_path: str, width: int):
+    classifier = Classifier(model_path, threads=1)
+    jpegs = make_jpegs(count, width)
+    print(f"model={classifier.version} input={classifier.input_size} images={count} original={width}px threads=1")
+    run(classifier, jpegs[:8], 8)  # 워밍업
+
+    for batch_size in BATCH_SIZES:
+        result = run(classifier, jpegs, batch_size)
+        print(
+            f"batch={batch_size:<3} {result['images_per_sec']:8.1f} images/sec/core  "
+            f"(decode {result['decode_ms']:.2f} ms + preprocess/infer {result['infer_ms']:.3f} ms per image)"
+        )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 256,
+        args[1] if len(args) > 1 else DEFAULT_MODEL,
+        int(args[2]) if len(args) > 2 else 1024,
+    )
@@ -0,0 +1,194 @@
+"""
+근접 중복 검색 벤치마크 (image_hashes N행에서 find_near 지연 시간과 후보 수)
+
+무작위 64비트 해시는 밴드 값이 고르게 퍼져(100만 행에서 밴드 값 하나에 약 15행) 실제보다 훨씬 유리하다.
+실제 사진의 pHash는 몰린다: 하늘/수평선/벽처럼 단순한 장면은 색과 무관하게 비슷한 해시가 나온다.
+그래서 합성 사진(수평선, 그라데이션, 어두운 사진, 배경 위 물체)을 32x32 흑백으로 그려
+find_near와 같은 pHash(phash_gray)로 해시를 만든다. (사진 디렉토리를 주면 그 사진의 해시를 앞쪽에 섞음)
+
+기존 해시에서 비트 0~3개를 바꾼 질의로 질의당 후보 수(p50/p99/max)와 지연 시간을
+흔한 밴드 건너뛰기 없음 / DEDUP_BAND_MAX_ROWS 두 경우로 비교하고, 전체 스캔과도 비교한다.
+
+실행 (apps/worker 디렉토리에서):
+    python -m benchmarks.bench_dedup [해시 수] [질의 수] [사진 디렉토리]
+"""
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+import numpy as np
+from PIL import Image as PILImage
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+from src.models.image import Image  # noqa: F401 (image_hashes 외래 키 대상)
+from src.models.image_hash import ImageHash
+from src.utils.dedup import BAND_COLUMNS, ContentHash, band_candidates, find_near
+from src.utils.phash import bands, hamming, is_informative, phash, phash_gray, to_unsigned
+from src.config import DEDUP_BAND_MAX_ROWS
+
+INSERT_CHUNK = 50_000
+RENDER_CHUNK = 8192
+SIZE = 32  # pHash 입력 크기로 바로 그림 (리사이즈 생략)
+
+# 장면 종류별 비율: 수평선(하늘/땅, 벽/바닥), 그라데이션, 어두운 사진, 배경 위 물체
+SCENES = {"horizon": 0.25, "gradient": 0.15, "dark": 0.10, "objects": 0.50}
+MAX_OBJECTS = 8
+
+_y, _x = np.mgrid[:SIZE, :SIZE].astype(np.float64) / (SIZE - 1)
+
+
+def render(count: int, rng: np.random.Generator) -> np.ndarray:
+    """합성 사진 count장 ([count, 32, 32] 밝기 0~255)"""
+    scene = rng.choice(len(SCENES), size=count, p=list(SCENES.values()))
+    horizon, gradient, dark, objects = (scene == i for i in range(len(SCENES)))
+
+    # 배경: 임의 방향 그라데이션 (어두운 사진은 대비가 아주 낮음)
+    angle = rng.uniform(0, 2 * np.pi, count)[:, None, None]
+    t = np.cos(angle) * _x + np.sin(angle) * _y
+    t = (t - t.min(axis=(1, 2), keepdims=True)) / np.ptp(t, axis=(1, 2), keepdims=True)
+    low, high = rng.uniform(0, 255, (2, count, 1, 1))
+    high = np.where(dark[:, None, None], low + rng.uniform(2, 10, (count, 1, 1)), high)
+    pixels = low + (high - low) * t
+
+    # 수평선: 가로(가끔 세로) 경계 위아래가 다른 밝기
+    split = rng.uniform(0.2, 0.8, count)[:, None, None]
+    vertical = (rng.random(count) < 0.2)[:, None, None]
+    above = np.where(vertical, _x < split, _y < split)
+    sky = rng.uniform(0, 255, (count, 1, 1))
+    pixels = np.where(horizon[:, None, None] & above, sky + (pixels - low) * 0.2, pixels)
+
+    # 물체: 배경 위 원 1~MAX_OBJECTS개
+    shapes = np.where(objects, rng.integers(1, MAX_OBJECTS + 1, count), 0)
+    for k in range(MAX_OBJECTS):
+        cx, cy = rng.random((2, count, 1, 1))
+        radius = rng.uniform(0.05, 0.4, (count, 1, 1))
+        inside = ((_x - cx) ** 2 + (_y - cy) ** 2 < radius ** 2) & (k < shapes)[:, None, None]
+        pixels = np.where(inside, rng.uniform(0, 255, (count, 1, 1)), pixels)
+
+    pixels += rng.normal(0, 1.5, pixels.shape)  # 센서 노이즈
+    return np.clip(pixels, 0, 255)
+
+
+def photo_hashes(directory: str) -> list[int]:
+    values = []
+    for name in sorted(os.listdir(directory)):
+        try:
+            with PILImage.open(os.path.join(directory, name)) as img:
+                values.append(phash(img))
+        except OSError:
+            continue
+    return values
+
+
+def make_hashes(count: int, rng: np.random.Generator, directory: str | None) -> np.ndarray:
+    hashes = np.concatenate([
+        phash_gray(render(min(RENDER_CHUNK, count - start), rng)) for start in range(0, count, RENDER_CHUNK)
+    ])
+    if directory:
+        real = photo_hashes(directory)[:count]
+        hashes[:len(real)] = np.array(real, dtype=np.uint64)
+        print(f"photos={len(real)} from {directory}")
+    return hashes
+
+
+def populate(db: Session, hashes: np.ndarray):
+    """hash_row와 같은 값을 NumPy로 한 번에 계산해 삽입 (부호 있는 64비트 + 16비트 밴드)"""
+    signed = hashes.view(np.int64).tolist()
+    band_values = [((hashes >> np.uint64(48 - 16 * i)) & np.uint64(0xFFFF)).astype(np.int64).tolist() for i in range(4)]
+    for start in range(0, len(hashes), INSERT_CHUNK):
+        db.execute(insert(ImageHash), [
+            {
+                "image_id": index + 1, "sha256": f"{index:064x}", "phash": signed[index], "dhash": signed[index],
+                **{column.key: band_values[i][index] for i, column in enumerate(BAND_COLUMNS)},
+            }
+            for index in range(start, min(start + INSERT_CHUNK, len(hashes)))
+        ])
+    db.commit()
+
+
+def flip_bits(value: int, count: int, rng: np.random.Generator) -> int:
+    for bit in rng.choice(64, size=count, replace=False):
+        value ^= 1 << int(bit)
+    return value
+
+
+def full_scan(db: Session, query: int, max_distance: int) -> list[int]:
+    """비교용: 모든 행을 읽어 거리 계산"""
+    return [
+        image_id
+        for image_id, value in db.execute(select(ImageHash.image_id, ImageHash.phash))
+        if hamming(query, to_unsigned(value)) <= max_distance
+    ]
+
+
+def report_skew(hashes: np.ndarray):
+    for i, column in enumerate(BAND_COLUMNS):
+        counts = Counter(((hashes >> np.uint64(48 - 16 * i)) & np.uint64(0xFFFF)).tolist())
+        top = ", ".join(f"0x{value:04x}×{n}" for value, n in counts.most_common(3))
+        print(f"{column.key}: {len(counts)} distinct, top {top}")
+
+
+def run_queries(db: Session, queries: list[tuple[int, int, int]], max_rows: int, count: int):
+    latencies, candidates, skipped, found = [], [], 0, 0
+    for target, original, query in queries:
+        t0 = time.perf_counter()
+        match = find_near(db, ContentHash("", query, original), before_id=count + 1, max_rows=max_rows)
+        latencies.append(time.perf_counter() - t0)
+        found += match is not None and match[1] <= hamming(query, original)  # 원본 또는 그만큼 가까운 행
+
+        rows, skipped_bands = band_candidates(db, query, max_rows)
+        candidates.append(len(rows))
+        skipped += skipped_bands
+
+    latencies_ms = np.array(latencies) * 1000
+    label = f"max_rows={max_rows}" if max_rows else "no band limit"
+    print(
+        f"{label:>15}: mean {latencies_ms.mean():.2f} ms, p99 {np.percentile(latencies_ms, 99):.2f} ms, "
+        f"max {latencies_ms.max():.1f} ms | candidates p50 {np.percentile(candidates, 50):.0f}, "
+        f"p99 {np.percentile(candidates, 99):.0f}, max {max(candidates)} | "
+        f"skipped bands {skipped}/{4 * len(queries)} | recall {found}/{len(queries)}"
+    )
+
+
+def main(count: int, queries: int, directory: str | None):
+    rng = np.random.default_rng(0)
+
+    t0 = time.perf_counter()
+    hashes = make_hashes(count, rng, directory)
+    informative = np.array([is_informative(value) for value in hashes.tolist()])
+    print(f"hashes={count} computed in {time.perf_counter() - t0:.1f}s, informative {informative.sum()}")
+    report_skew(hashes)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        ImageHash.__table__.create(engine)
+        with Session(engine) as db:
+            t0 = time.perf_counter()
+            populate(db, hashes)
+            print(f"inserted in {time.perf_counter() - t0:.1f}s")
+
+            # 질의는 근접 비교 대상(informative)에서 고름 → 흔한 장면이 그만큼 자주 질의됨
+            targets = rng.choice(np.flatnonzero(informative), size=queries)
+            cases = []
+            for target in targets.tolist():
+                original = int(hashes[target])
+                cases.append((target, original, flip_bits(original, int(rng.integers(0, 4)), rng)))
+
+            for max_rows in (0, DEDUP_BAND_MAX_ROWS):
+                run_queries(db, cases, max_rows, count)
+
+            scans = min(queries, 3)
+            t0 = time.perf_counter()
+            for _, original, _ in cases[:scans]:
+                full_scan(db, original, 3)
+            print(f"      full scan: mean {(time.perf_counter() - t0) / scans * 1000:.0f} ms per query")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 1_000_000,
+        int(args[1]) if len(args) > 1 else 1000,
+        args[2] if len(args) > 2 else None,
+    )
@@ -0,0 +1,62 @@
+import os
+from botocore.client import Config
+
+# S3 설정 (api 서비스와 같은 버킷)
+S3_ENDPOINT = os.getenv("S3_ENDPOINT", "http://minio:9000")
+S3_ACCESS_KEY = os.getenv("S3_ACCESS_KEY", "minio")
+S3_SECRET_KEY = os.getenv("S3_SECRET_KEY", "minio123")
+S3_BUCKET = os.getenv("S3_BUCKET", "uploads")
+
+BOTO_CONFIG = Config(
+    signature_version="s3v4",
+    s3={"addressing_style": "path"},
+    connect_timeout=float(os.getenv("S3_CONNECT_TIMEOUT", "2.0")),
+    read_timeout=float(os.getenv("S3_READ_TIMEOUT", "30.0")),
+    retries={"max_attempts": 3, "mode": "standard"},
+)
+
+# 워커 프로세스 풀
+WORKER_PROCESSES = int(os.getenv("WORKER_PROCESSES") or os.cpu_count() or 1)
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))  # 큐가 비었을 때 재조회 간격(초)
+JOB_SHUTDOWN_TIMEOUT = float(os.getenv("JOB_SHUTDOWN_TIMEOUT", "30"))  # 종료 시 진행 중 작업 대기(초)
+
+# 재시도 / dead-letter
+JOB_RETRY_BACKOFF = float(os.getenv("JOB_RETRY_BACKOFF", "10"))  # 재시도 대기 기준(초, 지수 증가 + jitter)
+JOB_RETRY_BACKOFF_MAX = float(os.getenv("JOB_RETRY_BACKOFF_MAX", "3600"))
+JOB_LOCK_TIMEOUT = int(os.getenv("JOB_LOCK_TIMEOUT", "600"))  # 이보다 오래 갱신되지 않은 running 작업은 워커가 죽은 것으로 보고 재등록
+JOB_HEARTBEAT_INTERVAL = float(os.getenv("JOB_HEARTBEAT_INTERVAL", "60"))  # 실행 중 작업의 잠금(locked_at) 갱신 주기(초, JOB_LOCK_TIMEOUT보다 충분히 짧게)
+JOB_REAP_INTERVAL = float(os.getenv("JOB_REAP_INTERVAL", "60"))  # 감독 프로세스 점검 주기(초)
+
+# 이미지 디코딩 제한 (압축 폭탄 방지)
+MAX_IMAGE_PIXELS = int(os.getenv("MAX_IMAGE_PIXELS", str(50_000_000)))
+
+# 파생본 (목록용 리사이즈 이미지)
+DERIVATIVES_PREFIX = os.getenv("DERIVATIVES_PREFIX", "derivatives/")
+VARIANT_WIDTHS = [int(w) for w in os.getenv("VARIANT_WIDTHS", "256,768,1536").split(",")]  # 가로 px (원본보다 크게 만들지 않음)
+VARIANT_FORMATS = os.getenv("VARIANT_FORMATS", "webp,avif").split(",")
+VARIANT_QUALITY = {
+    "webp": int(os.getenv("VARIANT_WEBP_QUALITY", "80")),
+    "avif": int(os.getenv("VARIANT_AVIF_QUALITY", "55")),
+}
+VARIANT_AVIF_SPEED = int(os.getenv("VARIANT_AVIF_SPEED", "8"))  # 0(느림, 작음) ~ 10(빠름)
+VARIANT_CACHE_CONTROL = "public, max-age=31536000"
+
+# 재활용 분류 (ONNX Runtime, CPU)
+CLASSIFY_MODEL_PATH = os.getenv("CLASSIFY_MODEL_PATH", "")  # 비어 있으면 classify 작업을 가져가지 않음 (큐에 남아 있다가 모델이 생기면 처리)
+CLASSIFY_BATCH_SIZE = int(os.getenv("CLASSIFY_BATCH_SIZE", "32"))  # 한 번에 추론할 이미지 수 (클수록 처리량↑)
+CLASSIFY_MAX_WAIT = float(os.getenv("CLASSIFY_MAX_WAIT", "0.5"))  # 배치가 찰 때까지 기다리는 최대 시간(초, 클수록 지연↑)
+CLASSIFY_TOP_K = int(os.getenv("CLASSIFY_TOP_K", "3"))  # 이미지당 저장할 라벨 수
+CLASSIFY_THREADS = int(os.getenv("CLASSIFY_THREADS", "1"))  # 추론 스레드 수 (프로세스가 코어마다 하나씩이므로 기본 1)
+CLASSIFY_DOWNLOAD_CONCURRENCY = int(os.getenv("CLASSIFY_DOWNLOAD_CONCURRENCY", "8"))  # 배치 안 이미지 동시 다운로드/디코딩 수
+
+# process_image가 끝나면 등록할 후속 작업 (classify는 파생본/중복 정보가 생긴 뒤에 실행되도록 여기서 등록)
+# 기본값: 모델이 설정된 경우에만 classify (가져갈 워커가 없는 작업이 큐에 계속 쌓이지 않게)
+PROCESS_IMAGE_NEXT_KINDS = [
+    kind for kind in os.getenv("PROCESS_IMAGE_NEXT_KINDS", "classify" if CLASSIFY_MODEL_PATH else "").split(",") if kind
+]
+
+# 중복 업로드 감지 (process_image가 SHA-256 + pHash/dHash 기록)
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+DEDUP_PHASH_DISTANCE = int(os.getenv("DEDUP_PHASH_DISTANCE", "3"))  # 근접 중복 pHash 해밍 거리 상한 (3 이하면 밴드 검색이 빠짐없이 찾음)
+DEDUP_DHASH_DISTANCE = int(os.getenv("DEDUP_DHASH_DISTANCE", "8"))  # dHash도 이 거리 안이어야 근접 중복 (오탐 방지)
+DEDUP_BAND_MAX_ROWS = int(os.getenv("DEDUP_BAND_MAX_ROWS", "1000"))  # 이보다 많은 행이 같은 밴드 값이면 그 밴드는 건너뜀 (흔한 값, 0: 제한 없음)
@@ -0,0 +1,21 @@
+from typing import Callable, NamedTuple
+from src.handlers import classify, process_image
+from src.config import CLASSIFY_MODEL_PATH, CLASSIFY_BATCH_SIZE, CLASSIFY_MAX_WAIT
+
+
+class BatchHandler(NamedTuple):
+    """같은 종류 작업을 모아 한 번에 처리하는 handler(db, jobs) -> {실패한 job.id: 예외}"""
+    handle: Callable
+    batch_size: int  # 한 번에 가져올 최대 작업 수
+    max_wait: float  # 배치가 찰 때까지 기다리는 최대 시간(초)
+
+
+# 작업 종류 -> handler(db, job)
+HANDLERS = {
+    "process_image": process_image.handle,
+}
+
+# 작업 종류 -> BatchHandler
+BATCH_HANDLERS = {}
+if CLASSIFY_MODEL_PATH:
+    BATCH_HANDLERS["classify"] = BatchHandler(classify.handle_batch, CLASSIFY_BATCH_SIZE, CLASSIFY_MAX_WAIT)
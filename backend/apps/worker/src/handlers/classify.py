@@ -0,0 +1,118 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PIL import Image as PILImage, UnidentifiedImageError
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from src.models.image import Image, ImageStatus
+from src.models.image_hash import ImageHash
+from src.models.job import Job
+from src.models.label import ImageLabel
+from src.models.variant import ImageVariant
+from src.utils.classifier import Classifier, get_classifier
+from src.utils.queue import PermanentJobError
+from src.utils.s3 import download_object
+from src.config import CLASSIFY_DOWNLOAD_CONCURRENCY
+
+
+def source_keys(db: Session, images: list[Image], min_width: int) -> dict[int, str]:
+    """
+    이미지별로 읽을 객체 키
+
+    process_image가 이미 만든 WebP 파생본 중 모델 입력보다 큰 가장 작은 것을 쓰고 (원본 다운로드/디코딩 생략),
+    아직 없으면 원본을 쓴다.
+    """
+    keys = {image.id: image.object_key for image in images}
+    variants = db.scalars(
+        select(ImageVariant)
+        .where(ImageVariant.image_id.in_(keys), ImageVariant.format == "webp", ImageVariant.width >= min_width)
+        .order_by(ImageVariant.width.desc())
+    ).all()
+    for variant in variants:
+        keys[variant.image_id] = variant.object_key  # 작은 것이 나중에 덮어씀
+    return keys
+
+
+def reuse_canonical_labels(db: Session, image_ids: list[int], model: str) -> set[int]:
+    """
+    중복 이미지(image_hashes.canonical_image_id)는 대표 이미지의 같은 모델 라벨을 복사 (다운로드/추론 없음)
+
+    Returns:
+        라벨을 복사한 이미지 id (대표가 아직 분류되지 않았으면 제외 - 직접 분류)
+    """
+    canonical = dict(db.execute(
+        select(ImageHash.image_id, ImageHash.canonical_image_id)
+        .where(ImageHash.image_id.in_(image_ids), ImageHash.canonical_image_id.is_not(None))
+    ).all())
+    if not canonical:
+        return set()
+
+    labels_by_image = {}
+    for label in db.scalars(
+        select(ImageLabel).where(ImageLabel.image_id.in_(set(canonical.values())), ImageLabel.model == model)
+    ):
+        labels_by_image.setdefault(label.image_id, []).append(label)
+
+    reused = {image_id for image_id, source_id in canonical.items() if source_id in labels_by_image}
+    if reused:
+        db.execute(delete(ImageLabel).where(ImageLabel.image_id.in_(reused), ImageLabel.model == model))
+        db.add_all(
+            ImageLabel(image_id=image_id, model=model, rank=label.rank, label=label.label, confidence=label.confidence)
+            for image_id in reused
+            for label in labels_by_image[canonical[image_id]]
+        )
+    return reused
+
+
+def load_pixels(classifier: Classifier, key: str) -> np.ndarray:
+    """다운로드 + 축소 디코딩 (깨진 파일은 영구 실패)"""
+    data = download_object(key)
+    try:
+        return classifier.fit(PILImage.open(io.BytesIO(data)))
+    except (UnidentifiedImageError, PILImage.DecompressionBombError, OSError, SyntaxError) as e:
+        raise PermanentJobError(f"Undecodable image: {e}") from e
+
+
+def handle_batch(db: Session, jobs: list[Job]) -> dict[int, Exception]:
+    """
+    재활용 분류: 배치 안 이미지를 동시에 받아 디코딩하고 모델을 한 번만 실행
+
+    이미 분류된 이미지의 중복이면 라벨만 복사한다.
+    같은 모델 버전의 기존 라벨은 덮어쓰므로 재실행해도 결과가 같다.
+
+    Returns:
+        실패한 작업 id -> 예외 (나머지는 성공)
+    """
+    classifier = get_classifier()
+    ids = {job.id: job.payload["image_id"] for job in jobs}
+    images = {
+        image.id: image
+        for image in db.scalars(select(Image).where(Image.id.in_(ids.values()), Image.status == ImageStatus.READY))
+    }
+    for image_id in reuse_canonical_labels(db, list(images), classifier.version):
+        del images[image_id]
+    keys = source_keys(db, list(images.values()), min(classifier.input_size))
+
+    # 같은 이미지 작업이 배치에 여러 개 있어도 한 번만 처리 (삭제/거부된 이미지의 작업은 할 일 없이 성공)
+    image_errors = {}
+    loaded = []
+    with ThreadPoolExecutor(CLASSIFY_DOWNLOAD_CONCURRENCY) as pool:
+        futures = {image_id: pool.submit(load_pixels, classifier, keys[image_id]) for image_id in images}
+        for image_id, future in futures.items():
+            try:
+                loaded.append((image_id, future.result()))
+            except Exception as e:
+                image_errors[image_id] = e
+
+    if loaded:
+        image_ids = [image_id for image_id, _ in loaded]
+        predictions = classifier.predict(classifier.preprocess([pixels for _, pixels in loaded]))
+
+        db.execute(delete(ImageLabel).where(ImageLabel.image_id.in_(image_ids), ImageLabel.model == classifier.version))
+        db.add_all(
+            ImageLabel(image_id=image_id, model=classifier.version, rank=rank, label=label, confidence=confidence)
+            for image_id, labels in zip(image_ids, predictions)
+            for rank, (label, confidence) in enumerate(labels, start=1)
+        )
+    db.commit()
+    return {job.id: image_errors[ids[job.id]] for job in jobs if ids[job.id] in image_errors}
@@ -0,0 +1,154 @@
+import hashlib
+import io
+import posixpath
+from PIL import Image as PILImage, ImageOps, UnidentifiedImageError, features
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from src.models.image import Image, ImageStatus
+from src.models.job import Job
+from src.models.variant import ImageVariant
+from src.models.image_hash import ImageHash
+from src.utils.dedup import content_hash, find_exact, find_near, hash_row, stored_hash
+from src.utils.queue import PermanentJobError, enqueue_job
+from src.utils.listing import bump_listing_versions
+from src.utils.s3 import download_object, upload_object
+from src.config import (
+    MAX_IMAGE_PIXELS, DERIVATIVES_PREFIX, VARIANT_WIDTHS, VARIANT_FORMATS,
+    VARIANT_QUALITY, VARIANT_AVIF_SPEED, VARIANT_CACHE_CONTROL,
+    DEDUP_ENABLED, PROCESS_IMAGE_NEXT_KINDS
+)
+
+PILImage.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+
+# 이 Pillow 빌드로 인코딩할 수 있는 형식만 사용
+ENABLED_FORMATS = [fmt for fmt in VARIANT_FORMATS if features.check(fmt)]
+if len(ENABLED_FORMATS) < len(VARIANT_FORMATS):
+    print(f"⚠️ Variant formats not supported by Pillow, skipped: {sorted(set(VARIANT_FORMATS) - set(ENABLED_FORMATS))}")
+
+
+def decode_image(data: bytes) -> PILImage.Image:
+    """원본 바이트 디코딩 (깨진 파일/압축 폭탄은 영구 실패)"""
+    try:
+        img = PILImage.open(io.BytesIO(data))
+        img.load()
+    except (UnidentifiedImageError, PILImage.DecompressionBombError, OSError, SyntaxError) as e:
+        raise PermanentJobError(f"Undecodable image: {e}") from e
+    return img
+
+
+def derivative_key(object_key: str, width: int, fmt: str) -> str:
+    """
+    파생본 키 (originals/abc.jpg → derivatives/abc/256.webp)
+
+    원본 키에서 결정되므로 재실행 시 같은 객체를 덮어쓴다.
+    """
+    stem = posixpath.splitext(object_key.split("/", 1)[-1])[0]
+    return f"{DERIVATIVES_PREFIX}{stem}/{width}.{fmt}"
+
+
+def variant_widths(original_width: int) -> list[int]:
+    """만들 가로 크기 (원본보다 큰 크기는 원본 크기로 합침, 큰 것부터)"""
+    return sorted({min(width, original_width) for width in VARIANT_WIDTHS}, reverse=True)
+
+
+def encode(img: PILImage.Image, fmt: str) -> bytes:
+    buffer = io.BytesIO()
+    options = {"quality": VARIANT_QUALITY.get(fmt, 80)}
+    if fmt == "avif":
+        options["speed"] = VARIANT_AVIF_SPEED
+    img.save(buffer, format=fmt.upper(), **options)
+    return buffer.getvalue()
+
+
+def render_variants(img: PILImage.Image, object_key: str) -> list[dict]:
+    """
+    리사이즈 + 인코딩 + 업로드
+
+    큰 크기부터 만들고 직전 결과를 다음 리사이즈의 입력으로 써서 큰 원본을 여러 번 읽지 않는다.
+    """
+    has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+    img = img.convert("RGBA" if has_alpha else "RGB")
+
+    variants = []
+    source = img
+    for width in variant_widths(img.width):
+        height = max(1, round(img.height * width / img.width))
+        if source.size != (width, height):
+            source = source.resize((width, height), PILImage.LANCZOS)
+        for fmt in ENABLED_FORMATS:
+            key = derivative_key(object_key, width, fmt)
+            data = encode(source, fmt)
+            upload_object(key, data, f"image/{fmt}", cache_control=VARIANT_CACHE_CONTROL)
+            variants.append({"object_key": key, "format": fmt, "width": width, "height": height, "size": len(data)})
+    return variants
+
+
+def enqueue_next_jobs(db: Session, image: Image):
+    """후속 작업 등록 (api의 업로드 작업과 같은 dedupe_key 규칙이라 이미 있으면 무시)"""
+    for kind in PROCESS_IMAGE_NEXT_KINDS:
+        enqueue_job(db, kind, {"image_id": image.id, "object_key": image.object_key}, dedupe_key=f"{kind}:{image.id}")
+
+
+def link_exact_duplicate(db: Session, image: Image, source_hash: ImageHash):
+    """
+    같은 바이트의 이미지가 이미 있으면 그 파생본을 공유 (디코딩/리사이즈/인코딩 없음)
+
+    object_key는 클라이언트가 받은 식별자(완료 재시도, GET /images/{key}, api 캐시)라 바꾸지 않고
+    자기 원본 객체도 그대로 둔다. 대표 이미지와는 canonical_image_id로만 연결한다.
+    """
+    source = db.get(Image, source_hash.image_id)
+    image.width, image.height = source.width, source.height
+
+    source_variants = db.scalars(select(ImageVariant).where(ImageVariant.image_id == source.id)).all()
+    db.query(ImageVariant).filter(ImageVariant.image_id == image.id).delete()
+    db.add_all(
+        ImageVariant(
+            image_id=image.id, object_key=variant.object_key, format=variant.format,
+            width=variant.width, height=variant.height, size=variant.size,
+        )
+        for variant in source_variants
+    )
+    db.merge(hash_row(image.id, stored_hash(source_hash), canonical_image_id=source.id, distance=0))
+
+
+def handle(db: Session, job: Job):
+    """
+    업로드 후처리: 원본을 받아 디코딩하고 크기 기록 + 목록용 파생본 생성 + 중복 확인
+
+    같은 바이트의 이미지가 이미 있으면 파생본을 공유한다 (원본 키/객체는 그대로).
+    지각 해시가 가까운 이미지는 대표 이미지로 연결만 한다 (classify가 라벨을 재사용).
+    같은 작업이 다시 실행돼도 결과가 같도록 덮어쓰기만 한다.
+    """
+    image = db.get(Image, job.payload["image_id"])
+    if image is None or image.status != ImageStatus.READY:
+        return  # 삭제/거부된 이미지는 처리할 것이 없음
+
+    data = download_object(image.object_key)
+    sha256 = hashlib.sha256(data).hexdigest()
+
+    if DEDUP_ENABLED:
+        source_hash = find_exact(db, sha256, image.id)
+        if source_hash is not None:
+            link_exact_duplicate(db, image, source_hash)
+            enqueue_next_jobs(db, image)
+            bump_listing_versions(db, image.user_id)
+            db.commit()
+            print(f"♻️ Image {image.id} is a copy of {source_hash.image_id}, sharing its variants")
+            return
+
+    img = decode_image(data)
+    img = ImageOps.exif_transpose(img)  # 회전 정보 반영 (보이는 방향 기준 크기, 파생본에는 EXIF를 남기지 않음)
+    variants = render_variants(img, image.object_key)
+
+    image.width, image.height = img.size
+    db.query(ImageVariant).filter(ImageVariant.image_id == image.id).delete()
+    db.add_all(ImageVariant(image_id=image.id, **variant) for variant in variants)
+
+    if DEDUP_ENABLED:
+        hashes = content_hash(sha256, img)
+        near = find_near(db, hashes, image.id)
+        db.merge(hash_row(image.id, hashes, *((near[0].image_id, near[1]) if near else ())))
+
+    enqueue_next_jobs(db, image)
+    bump_listing_versions(db, image.user_id)  # 목록의 크기/썸네일이 바뀜
+    db.commit()
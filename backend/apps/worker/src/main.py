@@ -0,0 +1,85 @@
+"""
+워커 서비스 진입점
+
+    python -m src.main                   # 감독 프로세스 + WORKER_PROCESSES개 워커 프로세스
+    python -m src.main requeue-dead [kind]  # dead-letter 작업 재등록
+"""
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+from src.models.database import SessionLocal, engine
+from src.utils.queue import requeue_dead_jobs, requeue_stale_jobs
+from src.worker import Worker
+from src.config import WORKER_PROCESSES, JOB_LOCK_TIMEOUT, JOB_REAP_INTERVAL, JOB_SHUTDOWN_TIMEOUT
+
+
+def _worker_main(stop_event):
+    """자식 프로세스: 부모에게서 물려받은 DB 커넥션은 쓰지 않고 새로 연결"""
+    engine.dispose(close=False)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # 종료는 부모가 stop_event로 알림
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    Worker(f"{socket.gethostname()}-{os.getpid()}").run(stop_event)
+
+
+def supervise(processes: int = WORKER_PROCESSES):
+    """워커 프로세스 풀 실행: 죽은 프로세스 재시작, 멈춘 작업 재등록, SIGTERM 시 정리"""
+    stop_event = multiprocessing.Event()
+    workers: dict[int, multiprocessing.Process] = {}
+    stopping = False
+
+    def spawn(slot: int):
+        process = multiprocessing.Process(target=_worker_main, args=(stop_event,), name=f"worker-{slot}")
+        process.start()
+        workers[slot] = process
+
+    def shutdown(signum, frame):
+        # 핸들러 안에서 stop_event.set()을 부르면 wait 중인 락과 교착될 수 있어 플래그만 세움
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    for slot in range(processes):
+        spawn(slot)
+    print(f"✅ Started {processes} worker processes")
+
+    next_check = 0.0
+    while not stopping:
+        if time.monotonic() >= next_check:
+            next_check = time.monotonic() + JOB_REAP_INTERVAL
+            for slot, process in list(workers.items()):
+                if not process.is_alive():
+                    print(f"⚠️ {process.name} exited ({process.exitcode}), restarting")
+                    spawn(slot)
+            try:
+                with SessionLocal() as db:
+                    requeued = requeue_stale_jobs(db, JOB_LOCK_TIMEOUT)
+                if requeued:
+                    print(f"♻️ Requeued {requeued} stale jobs")
+            except Exception as e:
+                print(f"⚠️ Stale job check failed: {e!r}")
+        time.sleep(0.2)
+
+    print("🛑 Shutting down workers...")
+    stop_event.set()
+    for process in workers.values():
+        process.join(JOB_SHUTDOWN_TIMEOUT)
+        if process.is_alive():
+            process.terminate()
+
+
+def main(argv: list[str]):
+    if argv[:1] == ["requeue-dead"]:
+        with SessionLocal() as db:
+            count = requeue_dead_jobs(db, kind=argv[1] if len(argv) > 1 else None)
+        print(f"♻️ Requeued {count} dead jobs")
+        return
+    supervise()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
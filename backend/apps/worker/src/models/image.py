@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from src.models.database import Base
+
+
+class ImageStatus:
+    """업로드 상태 (api 서비스의 ImageStatus와 같은 값)"""
+    PENDING = "pending"
+    READY = "ready"
+    REJECTED = "rejected"
+    QUARANTINED = "quarantined"
+    EXPIRED = "expired"
+
+
+class Image(Base):
+    """이미지 테이블 (api 서비스 소유, 워커는 후처리 결과만 기록)"""
+    __tablename__ = "images"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    object_key = Column(String(500), nullable=False)
+    content_type = Column(String(100))
+    size = Column(Integer)
+    status = Column(String(20), nullable=False)
+    width = Column(Integer)
+    height = Column(Integer)
+    created_at = Column(DateTime, nullable=False)
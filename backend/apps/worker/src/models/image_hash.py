@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey
+from datetime import datetime
+from src.models.database import Base
+
+
+class ImageHash(Base):
+    """
+    이미지 내용 해시 (중복 업로드 감지, process_image가 기록)
+
+    canonical_image_id가 있으면 그 이미지의 중복 (0: 같은 바이트 - 파생본만 공유하고 원본 객체는 각자, 1~: 지각 해시 근접).
+    phash_band0~3은 근접 검색용 16비트 밴드 (각각 인덱스, src/utils/phash.py 참고).
+    """
+    __tablename__ = "image_hashes"
+
+    image_id = Column(Integer, ForeignKey("images.id", ondelete="CASCADE"), primary_key=True)
+    sha256 = Column(String(64), nullable=False, index=True)
+    phash = Column(BigInteger, nullable=False)  # 부호 있는 64비트로 저장
+    dhash = Column(BigInteger, nullable=False)
+    phash_band0 = Column(Integer, nullable=False, index=True)
+    phash_band1 = Column(Integer, nullable=False, index=True)
+    phash_band2 = Column(Integer, nullable=False, index=True)
+    phash_band3 = Column(Integer, nullable=False, index=True)
+    canonical_image_id = Column(Integer, ForeignKey("images.id", ondelete="SET NULL"), index=True)
+    distance = Column(Integer)  # canonical과의 pHash 해밍 거리
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
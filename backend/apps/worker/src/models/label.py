@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, UniqueConstraint
+from datetime import datetime
+from src.models.database import Base
+
+
+class ImageLabel(Base):
+    """분류 결과 (이미지당 상위 CLASSIFY_TOP_K개 라벨, 모델 버전별)"""
+    __tablename__ = "image_labels"
+
+    id = Column(Integer, primary_key=True)
+    image_id = Column(Integer, ForeignKey("images.id", ondelete="CASCADE"), nullable=False, index=True)
+    model = Column(String(100), nullable=False)  # 모델 파일 이름:해시 앞자리
+    rank = Column(Integer, nullable=False)  # 1 = 가장 확률 높은 라벨
+    label = Column(String(100), nullable=False, index=True)
+    confidence = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("image_id", "model", "rank", name="uq_image_labels_image_model_rank"),
+    )
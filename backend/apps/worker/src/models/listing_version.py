@@ -0,0 +1,10 @@
+from sqlalchemy import Column, BigInteger, String
+from src.models.database import Base
+
+
+class ListingVersion(Base):
+    """목록 범위별 변경 카운터 (api 서비스 소유, 목록 ETag용 - 워커는 목록에 보이는 값을 바꿀 때 +1)"""
+    __tablename__ = "listing_versions"
+
+    scope = Column(String(50), primary_key=True)  # public | user:<id>
+    version = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from datetime import datetime
+from src.models.database import Base
+
+
+class ImageVariant(Base):
+    """리사이즈된 파생본 (derivatives/ 아래 WebP/AVIF, 워커가 기록하고 api가 목록에서 사용)"""
+    __tablename__ = "image_variants"
+
+    id = Column(Integer, primary_key=True)
+    image_id = Column(Integer, ForeignKey("images.id", ondelete="CASCADE"), nullable=False, index=True)
+    object_key = Column(String(500), nullable=False)
+    format = Column(String(10), nullable=False)  # webp | avif
+    width = Column(Integer, nullable=False)
+    height = Column(Integer, nullable=False)
+    size = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("image_id", "format", "width", name="uq_image_variants_image_format_width"),
+    )
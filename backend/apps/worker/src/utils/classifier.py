@@ -0,0 +1,79 @@
+import hashlib
+import json
+import os
+import numpy as np
+import onnxruntime as ort
+from PIL import Image as PILImage, ImageOps
+from src.config import CLASSIFY_MODEL_PATH, CLASSIFY_THREADS, CLASSIFY_TOP_K
+
+# 모델 메타데이터에 값이 없을 때 기본값 (ImageNet 정규화)
+DEFAULT_MEAN = [0.485, 0.456, 0.406]
+DEFAULT_STD = [0.229, 0.224, 0.225]
+
+
+class Classifier:
+    """
+    ONNX 분류 모델 (CPU)
+
+    입력은 float32 [N, 3, H, W], 출력은 [N, 클래스 수] logits.
+    라벨/정규화 값은 모델 메타데이터(labels, mean, std - JSON 문자열)에서 읽는다.
+    """
+
+    def __init__(self, path: str, threads: int = CLASSIFY_THREADS):
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.input_size = (model_input.shape[3], model_input.shape[2])  # (W, H)
+
+        meta = self.session.get_modelmeta().custom_metadata_map
+        self.labels = json.loads(meta["labels"])
+        # 정규화를 (x / 255 - mean) / std = x * scale - shift 한 번의 곱셈/뺄셈으로
+        mean = np.array(json.loads(meta.get("mean", "null")) or DEFAULT_MEAN, dtype=np.float32)
+        std = np.array(json.loads(meta.get("std", "null")) or DEFAULT_STD, dtype=np.float32)
+        self._scale = 1 / (255 * std)
+        self._shift = mean / std
+
+        with open(path, "rb") as f:
+            self.version = f"{os.path.basename(path)}:{hashlib.sha256(f.read()).hexdigest()[:12]}"
+
+    def fit(self, img: PILImage.Image) -> np.ndarray:
+        """이미지 하나를 모델 입력 크기로 (가운데 crop, uint8 HWC)"""
+        if img.format == "JPEG":
+            img.draft("RGB", (self.input_size[0] * 2, self.input_size[1] * 2))  # DCT 단계에서 축소 디코딩
+        img = ImageOps.exif_transpose(img).convert("RGB")
+        return np.asarray(ImageOps.fit(img, self.input_size, PILImage.BILINEAR))
+
+    def preprocess(self, pixels: list[np.ndarray]) -> np.ndarray:
+        """uint8 [H, W, 3] 목록 → 정규화된 float32 [N, 3, H, W] (배치 전체를 한 번에 연산)"""
+        batch = np.stack(pixels).astype(np.float32)
+        batch *= self._scale
+        batch -= self._shift
+        return np.ascontiguousarray(batch.transpose(0, 3, 1, 2))
+
+    def predict(self, batch: np.ndarray, top_k: int = CLASSIFY_TOP_K) -> list[list[tuple[str, float]]]:
+        """배치 추론 → 이미지별 (라벨, 확률) 상위 top_k개"""
+        logits = self.session.run(None, {self.input_name: batch})[0]
+        logits = logits - logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=1, keepdims=True)
+
+        top = np.argsort(-probs, axis=1)[:, :top_k]
+        return [
+            [(self.labels[i], float(row[i])) for i in indices]
+            for row, indices in zip(probs, top)
+        ]
+
+
+_classifier = None
+
+
+def get_classifier() -> Classifier:
+    """프로세스당 한 번 모델 로드 (fork 후 자식 프로세스에서 처음 호출될 때)"""
+    global _classifier
+    if _classifier is None:
+        _classifier = Classifier(CLASSIFY_MODEL_PATH)
+    return _classifier
@@ -0,0 +1,107 @@
+from typing import NamedTuple
+from PIL import Image as PILImage
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from src.models.image_hash import ImageHash
+from src.utils.phash import phash, dhash, hamming, bands, is_informative, to_signed, to_unsigned
+from src.config import DEDUP_PHASH_DISTANCE, DEDUP_DHASH_DISTANCE, DEDUP_BAND_MAX_ROWS
+
+BAND_COLUMNS = [ImageHash.phash_band0, ImageHash.phash_band1, ImageHash.phash_band2, ImageHash.phash_band3]
+
+
+class ContentHash(NamedTuple):
+    sha256: str
+    phash: int  # 부호 없는 64비트
+    dhash: int
+
+
+def content_hash(sha256: str, img: PILImage.Image) -> ContentHash:
+    """원본 바이트 SHA-256 + 디코딩한(회전 반영) 이미지의 지각 해시"""
+    return ContentHash(sha256, phash(img), dhash(img))
+
+
+def hash_row(image_id: int, hashes: ContentHash, canonical_image_id: int | None = None, distance: int | None = None) -> ImageHash:
+    return ImageHash(
+        image_id=image_id,
+        sha256=hashes.sha256,
+        phash=to_signed(hashes.phash),
+        dhash=to_signed(hashes.dhash),
+        **{column.key: band for column, band in zip(BAND_COLUMNS, bands(hashes.phash))},
+        canonical_image_id=canonical_image_id,
+        distance=distance,
+    )
+
+
+def stored_hash(row: ImageHash) -> ContentHash:
+    return ContentHash(row.sha256, to_unsigned(row.phash), to_unsigned(row.dhash))
+
+
+def find_exact(db: Session, sha256: str, before_id: int) -> ImageHash | None:
+    """
+    같은 바이트의 대표 이미지 (sha256 인덱스)
+
+    대표는 가장 먼저 올라온 이미지 (자기보다 id가 작은 것만 보므로 재실행해도 대표가 바뀌지 않음)
+    """
+    return db.scalars(
+        select(ImageHash)
+        .where(ImageHash.sha256 == sha256, ImageHash.canonical_image_id.is_(None), ImageHash.image_id < before_id)
+        .order_by(ImageHash.image_id)
+        .limit(1)
+    ).first()
+
+
+def band_candidates(db: Session, value: int, max_rows: int = DEDUP_BAND_MAX_ROWS) -> tuple[list, int]:
+    """
+    밴드 4개 중 하나라도 같은 행 (밴드마다 인덱스 조회)
+
+    단순한 사진(하늘, 수평선, 어두운 사진 등)은 지각 해시의 밴드 값이 몰려서
+    한 밴드에 수천~수만 행이 걸릴 수 있다. max_rows보다 많은 행이 걸린 밴드는 건너뛴다.
+    (나머지 밴드가 하나라도 같은 이웃은 그대로 찾음)
+
+    Returns:
+        (image_id/phash/dhash/canonical_image_id 행, 건너뛴 밴드 수)
+    """
+    # 밴드 조건만 넣어야 플래너가 밴드 인덱스를 쓴다.
+    # canonical_image_id IS NULL 같은 조건을 같이 넣으면 선택도가 낮은 그 인덱스로 전체를 훑을 수 있음
+    rows, skipped = {}, 0
+    for column, band in zip(BAND_COLUMNS, bands(value)):
+        query = select(ImageHash.image_id, ImageHash.phash, ImageHash.dhash, ImageHash.canonical_image_id).where(column == band)
+        if max_rows:
+            query = query.limit(max_rows + 1)
+        found = db.execute(query).all()
+        if max_rows and len(found) > max_rows:
+            skipped += 1
+            continue
+        rows.update((row.image_id, row) for row in found)
+    return list(rows.values()), skipped
+
+
+def find_near(
+    db: Session,
+    hashes: ContentHash,
+    before_id: int,
+    max_phash: int = DEDUP_PHASH_DISTANCE,
+    max_dhash: int = DEDUP_DHASH_DISTANCE,
+    max_rows: int = DEDUP_BAND_MAX_ROWS,
+) -> tuple[ImageHash, int] | None:
+    """
+    지각 해시가 가까운 대표 이미지와 pHash 거리
+
+    밴드 4개 중 하나라도 같은 행만 인덱스로 가져와(multi-index hashing) 정확한 거리를 계산한다.
+    max_phash가 3 이하면 빠짐없이 찾고, 그보다 크거나 흔한 밴드를 건너뛰면 놓칠 수 있다.
+    단색에 가까운 이미지는 해시가 색과 무관하게 같아서 근접 비교하지 않는다.
+    """
+    if not is_informative(hashes.phash):
+        return None
+
+    candidates, _ = band_candidates(db, hashes.phash, max_rows)
+
+    best = None
+    for image_id, candidate_phash, candidate_dhash, canonical_image_id in candidates:
+        if canonical_image_id is not None or image_id >= before_id:
+            continue
+        distance = hamming(hashes.phash, to_unsigned(candidate_phash))
+        if distance <= max_phash and hamming(hashes.dhash, to_unsigned(candidate_dhash)) <= max_dhash:
+            if best is None or (distance, image_id) < best:
+                best = (distance, image_id)
+    return None if best is None else (db.get(ImageHash, best[1]), best[0])
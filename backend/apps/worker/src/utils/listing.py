@@ -0,0 +1,18 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from src.models.listing_version import ListingVersion
+
+
+def bump_listing_versions(db: Session, user_id: int):
+    """
+    공개 목록 + 업로더 목록 버전 +1 (commit은 호출자가 - api의 bump_listing_versions와 같은 규칙)
+
+    크기/썸네일(중복이면 대표 이미지의 파생본)이 바뀌면 목록 응답이 달라지므로 클라이언트 캐시(ETag)를 무효화한다.
+    """
+    insert = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+    for scope in ("public", f"user:{user_id}"):
+        db.execute(
+            insert(ListingVersion)
+            .values(scope=scope, version=1)
+            .on_conflict_do_update(index_elements=["scope"], set_={"version": ListingVersion.version + 1})
+        )
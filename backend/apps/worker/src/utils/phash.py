@@ -0,0 +1,80 @@
+"""
+지각 해시 (pHash / dHash, 64비트)
+
+다시 인코딩/리사이즈/약간 보정한 같은 사진은 해밍 거리가 작게 나온다.
+근접 검색은 64비트를 16비트 밴드 4개로 나눠 밴드별 인덱스로 후보를 찾는다 (multi-index hashing):
+거리가 3 이하면 비둘기집 원리로 적어도 한 밴드는 정확히 같으므로 전체 스캔 없이 놓치지 않는다.
+"""
+import numpy as np
+from PIL import Image as PILImage
+
+HASH_BITS = 64
+BAND_BITS = 16
+BAND_COUNT = HASH_BITS // BAND_BITS
+MAX_EXACT_RECALL_DISTANCE = BAND_COUNT - 1  # 이 거리까지는 밴드 검색이 모든 이웃을 찾음
+
+_DCT_SIZE = 32
+_n = np.arange(_DCT_SIZE)
+# DCT-II 행렬 (정규화는 중앙값 비교라 불필요)
+_DCT = np.cos(np.pi * (2 * _n[None, :] + 1) * _n[:, None] / (2 * _DCT_SIZE))
+_BIT_WEIGHTS = 1 << np.arange(HASH_BITS - 1, -1, -1, dtype=np.uint64)
+
+
+def _gray(img: PILImage.Image, size: tuple[int, int]) -> np.ndarray:
+    """흑백 축소 (reducing_gap: 큰 원본은 먼저 정수배로 줄여서 빠르게)"""
+    small = img.convert("L").resize(size, PILImage.LANCZOS, reducing_gap=2.0)
+    return np.asarray(small, dtype=np.float64)
+
+
+def _to_int(bits: np.ndarray) -> int:
+    return int((bits.ravel().astype(np.uint64) * _BIT_WEIGHTS).sum())
+
+
+def phash_gray(gray: np.ndarray) -> np.ndarray:
+    """
+    32x32 흑백 배열(여러 장이면 [N, 32, 32])의 pHash → uint64 배열
+
+    2D DCT 저주파 8x8 계수를 중앙값과 비교한다. (벤치마크가 여러 장을 한 번에 계산할 때도 사용)
+    """
+    low = (_DCT @ gray @ _DCT.T)[..., :8, :8]
+    low = np.round(low, 6)  # 단색 이미지의 부동소수 오차가 무작위 비트가 되지 않게
+    bits = low.reshape(*low.shape[:-2], HASH_BITS) > np.median(low, axis=(-2, -1))[..., None]
+    return (bits.astype(np.uint64) * _BIT_WEIGHTS).sum(axis=-1, dtype=np.uint64)
+
+
+def phash(img: PILImage.Image) -> int:
+    """32x32 흑백 축소 후 pHash"""
+    return int(phash_gray(_gray(img, (_DCT_SIZE, _DCT_SIZE))))
+
+
+def dhash(img: PILImage.Image) -> int:
+    """9x8 흑백에서 가로로 이웃한 픽셀 밝기 비교"""
+    pixels = _gray(img, (9, 8))
+    return _to_int(pixels[:, 1:] > pixels[:, :-1])
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def bands(value: int) -> list[int]:
+    """64비트 해시 → 상위부터 16비트 밴드 4개"""
+    mask = (1 << BAND_BITS) - 1
+    return [(value >> (BAND_BITS * (BAND_COUNT - 1 - i))) & mask for i in range(BAND_COUNT)]
+
+
+def is_informative(value: int, min_bits: int = 8) -> bool:
+    """
+    근접 비교에 쓸 만한 해시인지 (단색/거의 단색 이미지는 색과 무관하게 해시가 거의 0이라 제외)
+    """
+    ones = value.bit_count()
+    return min_bits <= ones <= HASH_BITS - min_bits
+
+
+def to_signed(value: int) -> int:
+    """부호 없는 64비트 → BIGINT 저장용"""
+    return value - (1 << HASH_BITS) if value >= 1 << (HASH_BITS - 1) else value
+
+
+def to_unsigned(value: int) -> int:
+    return value & ((1 << HASH_BITS) - 1)
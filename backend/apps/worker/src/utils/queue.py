@@ -0,0 +1,133 @@
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from src.models.job import Job, JobStatus
+from src.config import JOB_RETRY_BACKOFF, JOB_RETRY_BACKOFF_MAX
+
+
+class PermanentJobError(Exception):
+    """재시도해도 성공할 수 없는 실패 (바로 dead-letter)"""
+
+
+def enqueue_job(db: Session, kind: str, payload: dict, dedupe_key: str):
+    """
+    후속 작업 등록 (같은 dedupe_key가 있으면 무시, commit은 호출자가 - api의 enqueue_job과 같은 규칙)
+    """
+    insert = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+    db.execute(
+        insert(Job)
+        .values(kind=kind, payload=payload, dedupe_key=dedupe_key)
+        .on_conflict_do_nothing(index_elements=["dedupe_key"])
+    )
+
+
+def claim_jobs(db: Session, worker_id: str, kinds: list[str] | None = None, limit: int = 1) -> list[Job]:
+    """
+    실행할 작업을 가져와 running으로 표시
+
+    FOR UPDATE SKIP LOCKED로 다른 워커가 잡고 있는 행은 건너뛰므로
+    여러 프로세스가 같은 큐를 동시에 소비해도 한 작업은 한 워커만 가져간다.
+    """
+    now = datetime.utcnow()
+    query = select(Job)\
+        .where(Job.status == JobStatus.QUEUED, Job.run_after <= now)\
+        .order_by(Job.run_after, Job.id)\
+        .limit(limit)\
+        .with_for_update(skip_locked=True)
+    if kinds is not None:
+        query = query.where(Job.kind.in_(kinds))
+
+    jobs = db.scalars(query).all()
+    for job in jobs:
+        job.status = JobStatus.RUNNING
+        job.attempts += 1
+        job.locked_at = now
+        job.locked_by = worker_id
+    db.commit()
+    return jobs
+
+
+def heartbeat_jobs(db: Session, worker_id: str, job_ids: list[int]) -> int:
+    """
+    실행 중인 작업의 잠금 시각 갱신 (오래 걸리는 작업이 requeue_stale_jobs에 재등록되지 않게)
+
+    Returns:
+        갱신한 행 수 (이미 재등록돼 다른 워커가 가져간 작업은 빠짐)
+    """
+    count = db.execute(
+        update(Job)
+        .where(Job.id.in_(job_ids), Job.status == JobStatus.RUNNING, Job.locked_by == worker_id)
+        .values(locked_at=datetime.utcnow())
+    ).rowcount
+    db.commit()
+    return count
+
+
+def complete_jobs(db: Session, jobs: list[Job]):
+    """성공한 작업 완료 처리 (배치도 commit 한 번)"""
+    for job in jobs:
+        job.status = JobStatus.DONE
+        job.locked_at = None
+        job.last_error = None
+    db.commit()
+
+
+def retry_delay(attempts: int) -> float:
+    """지수 증가 + full jitter"""
+    return random.uniform(0, min(JOB_RETRY_BACKOFF * 2 ** (attempts - 1), JOB_RETRY_BACKOFF_MAX))
+
+
+def fail_job(db: Session, job: Job, error: str, permanent: bool = False) -> str:
+    """
+    실패 기록 후 재시도 예약, 또는 재시도 소진/영구 실패면 dead-letter
+
+    Returns:
+        바뀐 상태 (queued | dead)
+    """
+    job.last_error = error[:2000]
+    job.locked_at = None
+    if permanent or job.attempts >= job.max_attempts:
+        job.status = JobStatus.DEAD
+    else:
+        job.status = JobStatus.QUEUED
+        job.run_after = datetime.utcnow() + timedelta(seconds=retry_delay(job.attempts))
+    db.commit()
+    return job.status
+
+
+def requeue_stale_jobs(db: Session, lock_timeout: int) -> int:
+    """
+    워커가 죽어 running으로 남은 작업을 다시 queued로 (이미 센 attempts는 유지)
+
+    살아 있는 워커는 실행 중 locked_at을 계속 갱신하므로(heartbeat_jobs) 오래 걸리는 작업은 해당되지 않는다.
+
+    재시도 소진된 작업은 dead-letter로 보낸다.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=lock_timeout)
+    stale = (Job.status == JobStatus.RUNNING) & (Job.locked_at < cutoff)
+    dead = db.execute(
+        update(Job)
+        .where(stale, Job.attempts >= Job.max_attempts)
+        .values(status=JobStatus.DEAD, locked_at=None, last_error="Worker lost (lock timeout)")
+    ).rowcount
+    requeued = db.execute(
+        update(Job)
+        .where(stale)
+        .values(status=JobStatus.QUEUED, locked_at=None, run_after=datetime.utcnow())
+    ).rowcount
+    db.commit()
+    return requeued + dead
+
+
+def requeue_dead_jobs(db: Session, kind: str | None = None) -> int:
+    """dead-letter 작업을 처음부터 다시 실행 (원인 수정 후 수동 실행)"""
+    query = update(Job).where(Job.status == JobStatus.DEAD)
+    if kind is not None:
+        query = query.where(Job.kind == kind)
+    count = db.execute(
+        query.values(status=JobStatus.QUEUED, attempts=0, run_after=datetime.utcnow(), last_error=None)
+    ).rowcount
+    db.commit()
+    return count
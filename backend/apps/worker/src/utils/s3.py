@@ -0,0 +1,24 @@
+import boto3
+from src.config import S3_ENDPOINT, S3_ACCESS_KEY, S3_SECRET_KEY, S3_BUCKET, BOTO_CONFIG
+
+# 워커 → MinIO 클라이언트 (프로세스마다 생성)
+s3_internal = boto3.client(
+    "s3",
+    endpoint_url=S3_ENDPOINT if S3_ENDPOINT else None,
+    aws_access_key_id=S3_ACCESS_KEY,
+    aws_secret_access_key=S3_SECRET_KEY,
+    config=BOTO_CONFIG,
+    region_name="us-east-1",
+)
+
+
+def download_object(key: str) -> bytes:
+    """원본 객체 전체 다운로드"""
+    response = s3_internal.get_object(Bucket=S3_BUCKET, Key=key)
+    return response["Body"].read()
+
+
+def upload_object(key: str, data: bytes, content_type: str, cache_control: str | None = None):
+    """파생본 업로드 (같은 키면 덮어씀)"""
+    extra = {"CacheControl": cache_control} if cache_control else {}
+    s3_internal.put_object(Bucket=S3_BUCKET, Key=key, Body=data, ContentType=content_type, **extra)
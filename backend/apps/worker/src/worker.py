@@ -0,0 +1,140 @@
+import threading
+import time
+import traceback
+from src.handlers import BATCH_HANDLERS, HANDLERS, BatchHandler
+from src.models.database import SessionLocal
+from src.utils.queue import PermanentJobError, claim_jobs, complete_jobs, fail_job, heartbeat_jobs
+from src.config import JOB_POLL_INTERVAL, JOB_HEARTBEAT_INTERVAL
+
+# 배치를 채우는 동안 재조회 간격(초)
+BATCH_FILL_POLL = 0.05
+
+
+class LockHeartbeat:
+    """
+    handler가 도는 동안 작업 잠금(locked_at)을 주기적으로 갱신하는 스레드
+
+    handler가 쓰는 세션과 따로 연결해 커밋하므로 handler 트랜잭션에 영향을 주지 않는다.
+    """
+
+    def __init__(self, session_factory, worker_id: str, job_ids: list[int], interval: float = JOB_HEARTBEAT_INTERVAL):
+        self.session_factory = session_factory
+        self.worker_id = worker_id
+        self.job_ids = job_ids
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="job-heartbeat", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                with self.session_factory() as db:
+                    if heartbeat_jobs(db, self.worker_id, self.job_ids) < len(self.job_ids):
+                        print(f"⚠️ Worker {self.worker_id} lost the lock on some of jobs {self.job_ids}")
+            except Exception as e:
+                print(f"⚠️ Job heartbeat failed: {e!r}")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+class Worker:
+    """작업을 가져와 handler 실행 (프로세스당 하나, 배치 handler는 같은 종류를 모아서)"""
+
+    def __init__(
+        self,
+        worker_id: str,
+        handlers: dict | None = None,
+        batch_handlers: dict | None = None,
+        session_factory=SessionLocal,
+        heartbeat_interval: float = JOB_HEARTBEAT_INTERVAL,
+    ):
+        self.worker_id = worker_id
+        if handlers is None and batch_handlers is None:
+            handlers, batch_handlers = HANDLERS, BATCH_HANDLERS
+        self.handlers = handlers or {}
+        self.batch_handlers = batch_handlers or {}
+        self.session_factory = session_factory
+        self.heartbeat_interval = heartbeat_interval
+
+    def _heartbeat(self, jobs: list) -> LockHeartbeat:
+        return LockHeartbeat(self.session_factory, self.worker_id, [job.id for job in jobs], self.heartbeat_interval)
+
+    def run_once(self) -> bool:
+        """작업 하나(또는 배치 하나) 처리 (큐가 비었으면 False)"""
+        with self.session_factory() as db:
+            jobs = claim_jobs(db, self.worker_id, kinds=[*self.handlers, *self.batch_handlers])
+            if not jobs:
+                return False
+
+            job = jobs[0]
+            if job.kind in self.batch_handlers:
+                self._run_batch(db, self.batch_handlers[job.kind], jobs)
+                return True
+
+            try:
+                with self._heartbeat([job]):
+                    self.handlers[job.kind](db, job)
+            except Exception as e:
+                db.rollback()
+                self._fail(db, job, e)
+            else:
+                complete_jobs(db, [job])
+            return True
+
+    def _fill_batch(self, db, handler: BatchHandler, jobs: list) -> list:
+        """batch_size가 찰 때까지 최대 max_wait초 동안 같은 종류 작업을 더 가져옴"""
+        kind = jobs[0].kind
+        deadline = time.monotonic() + handler.max_wait
+        while True:
+            jobs += claim_jobs(db, self.worker_id, kinds=[kind], limit=handler.batch_size - len(jobs))
+            remaining = deadline - time.monotonic()
+            if len(jobs) >= handler.batch_size or remaining <= 0:
+                return jobs
+            time.sleep(min(BATCH_FILL_POLL, remaining))
+
+    def _run_batch(self, db, handler: BatchHandler, jobs: list):
+        jobs = self._fill_batch(db, handler, jobs)
+        try:
+            with self._heartbeat(jobs):
+                errors = handler.handle(db, jobs)
+        except Exception as e:
+            # 배치 전체 실패 (DB/모델 오류 등) - 모두 재시도
+            db.rollback()
+            for job in jobs:
+                self._fail(db, job, e)
+            return
+
+        for job in jobs:
+            if job.id in errors:
+                self._fail(db, job, errors[job.id])
+        complete_jobs(db, [job for job in jobs if job.id not in errors])
+        print(f"📦 Batch of {len(jobs)} {jobs[0].kind} jobs done ({len(errors)} failed)")
+
+    def _fail(self, db, job, error: Exception):
+        if isinstance(error, PermanentJobError):
+            fail_job(db, job, str(error), permanent=True)
+            print(f"💀 Job {job.id} ({job.kind}) dead: {error}")
+        else:
+            trace = "".join(traceback.format_exception(error))
+            status = fail_job(db, job, f"{error!r}\n{trace}")
+            print(f"⚠️ Job {job.id} ({job.kind}) failed (attempt {job.attempts}/{job.max_attempts}, now {status}): {error!r}")
+
+    def run(self, stop_event):
+        """stop_event가 설정될 때까지 큐 소비 (진행 중 작업은 끝내고 종료)"""
+        kinds = [*self.handlers, *self.batch_handlers]
+        print(f"👷 Worker {self.worker_id} started ({', '.join(kinds)})")
+        while not stop_event.is_set():
+            try:
+                if not self.run_once():
+                    stop_event.wait(JOB_POLL_INTERVAL)
+            except Exception as e:
+                # DB 연결 끊김 등 - 잠시 쉬었다 재시도
+                print(f"⚠️ Worker {self.worker_id} loop error: {e!r}")
+                stop_event.wait(JOB_POLL_INTERVAL)
+        print(f"👋 Worker {self.worker_id} stopped")
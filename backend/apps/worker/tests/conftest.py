@@ -0,0 +1,111 @@
+# backend/apps/worker/tests/conftest.py
+
+import io
+import os
+import tempfile
+import uuid
+import pytest
+from moto import mock_s3
+
+# ===== 1. 환경 변수 먼저 설정 =====
+TEST_DB_FILE = tempfile.mktemp(suffix=".db")
+os.environ["DATABASE_URL"] = f"sqlite:///{TEST_DB_FILE}"
+os.environ["S3_ENDPOINT"] = ""
+os.environ["S3_ACCESS_KEY"] = "test-key"
+os.environ["S3_SECRET_KEY"] = "test-secret"
+os.environ["S3_BUCKET"] = "test-bucket"
+os.environ["JOB_RETRY_BACKOFF"] = "0"
+os.environ["CLASSIFY_MODEL_PATH"] = os.path.join(os.path.dirname(__file__), "data", "tiny_classifier.onnx")
+os.environ["CLASSIFY_MAX_WAIT"] = "0"
+
+# ===== 2. Mock을 전역으로 시작 =====
+mock = mock_s3()
+mock.start()
+
+# ===== 3. mock이 활성화된 상태에서 import =====
+from datetime import datetime
+from PIL import Image as PILImage
+from src.models.database import Base, SessionLocal, engine
+from src.models.image import Image, ImageStatus
+from src.models.job import Job
+from src.models.variant import ImageVariant
+from src.models.label import ImageLabel
+from src.models.image_hash import ImageHash
+from src.models.listing_version import ListingVersion
+from src.utils.s3 import s3_internal
+from src.config import S3_BUCKET
+
+s3_internal.create_bucket(Bucket=S3_BUCKET)
+Base.metadata.create_all(bind=engine)
+
+
+@pytest.fixture
+def db():
+    """테스트용 DB 세션 (각 테스트마다 초기화)"""
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.query(Job).delete()
+        session.query(ImageVariant).delete()
+        session.query(ImageLabel).delete()
+        session.query(ImageHash).delete()
+        session.query(ListingVersion).delete()
+        session.query(Image).delete()
+        session.commit()
+        session.close()
+
+
+@pytest.fixture
+def s3():
+    yield s3_internal
+
+
+def make_image_bytes(size=(64, 48), fmt="PNG", color=(200, 30, 30)) -> bytes:
+    buffer = io.BytesIO()
+    PILImage.new("RGB", size, color).save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def run_until_idle(worker):
+    """큐가 빌 때까지 처리 (worker가 가져갈 수 없는 작업은 큐에 남음)"""
+    while worker.run_once():
+        pass
+
+
+@pytest.fixture
+def uploaded_image(db, s3):
+    """ready 상태 이미지 행 + S3 원본 생성 (key를 주지 않으면 매번 새 키)"""
+    def create(key=None, data=None, content_type="image/png"):
+        key = key or f"originals/{uuid.uuid4().hex}.{content_type.split('/')[-1]}"
+        data = data if data is not None else make_image_bytes()
+        s3.put_object(Bucket=S3_BUCKET, Key=key, Body=data, ContentType=content_type)
+        image = Image(
+            user_id=1, object_key=key, content_type=content_type, size=len(data),
+            status=ImageStatus.READY, created_at=datetime.utcnow(),
+        )
+        db.add(image)
+        db.commit()
+        return image
+    return create
+
+
+@pytest.fixture
+def make_job(db):
+    """작업 등록 (api의 enqueue_job 대신, image를 주면 그 이미지의 payload)"""
+    def create(kind="process_image", payload=None, image=None, **kwargs):
+        if image is not None:
+            payload = {"image_id": image.id, "object_key": image.object_key}
+        job = Job(kind=kind, payload=payload or {}, dedupe_key=f"{kind}:{uuid.uuid4().hex}", **kwargs)
+        db.add(job)
+        db.commit()
+        return job
+    return create
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """테스트 세션 종료 시 정리"""
+    mock.stop()
+    if os.path.exists(TEST_DB_FILE):
+        os.remove(TEST_DB_FILE)
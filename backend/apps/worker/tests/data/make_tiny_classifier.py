@@ -0,0 +1,58 @@
+"""
+테스트/벤치마크용 초소형 분류 모델 생성 (tiny_classifier.onnx)
+
+입력: float32 [N, 3, 32, 32] (mean/std 정규화된 RGB)
+GlobalAveragePool → Gemm(3 → 5)으로 평균 색만 보고 분류한다.
+빨강=plastic, 초록=glass, 파랑=metal, 흰색=paper, 검정=other
+
+실행 (apps/worker 디렉토리에서, onnx 패키지 필요):
+    python tests/data/make_tiny_classifier.py
+"""
+import json
+import os
+import numpy as np
+import onnx
+from onnx import TensorProto, helper, numpy_helper
+
+LABELS = ["plastic", "paper", "glass", "metal", "other"]
+INPUT_SIZE = 32
+
+# 입력 채널(R, G, B) × 클래스
+WEIGHTS = np.array([
+    # plastic paper glass metal other
+    [4, 2, -2, -2, -2],   # R
+    [-2, 2, 4, -2, -2],   # G
+    [-2, 2, -2, 4, -2],   # B
+], dtype=np.float32)
+
+
+def build() -> onnx.ModelProto:
+    graph = helper.make_graph(
+        [
+            helper.make_node("GlobalAveragePool", ["input"], ["pooled"]),
+            helper.make_node("Flatten", ["pooled"], ["features"]),
+            helper.make_node("Gemm", ["features", "weights", "bias"], ["logits"]),
+        ],
+        "tiny_classifier",
+        [helper.make_tensor_value_info("input", TensorProto.FLOAT, ["N", 3, INPUT_SIZE, INPUT_SIZE])],
+        [helper.make_tensor_value_info("logits", TensorProto.FLOAT, ["N", len(LABELS)])],
+        initializer=[
+            numpy_helper.from_array(WEIGHTS, "weights"),
+            numpy_helper.from_array(np.zeros(len(LABELS), dtype=np.float32), "bias"),
+        ],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 7  # 오래된 onnxruntime에서도 로드
+    helper.set_model_props(model, {
+        "labels": json.dumps(LABELS),
+        "mean": json.dumps([0.5, 0.5, 0.5]),
+        "std": json.dumps([0.5, 0.5, 0.5]),
+    })
+    onnx.checker.check_model(model)
+    return model
+
+
+if __name__ == "__main__":
+    path = os.path.join(os.path.dirname(__file__), "tiny_classifier.onnx")
+    onnx.save(build(), path)
+    print(f"✅ Saved {path}")
@@ -0,0 +1,117 @@
+# backend/apps/worker/tests/test_classify.py
+
+import numpy as np
+from src.handlers import BatchHandler
+from src.handlers.classify import handle_batch
+from src.models.job import Job, JobStatus
+from src.models.label import ImageLabel
+from src.models.variant import ImageVariant
+from src.utils.classifier import get_classifier
+from src.worker import Worker
+from tests.conftest import make_image_bytes, run_until_idle
+
+RED, BLUE, WHITE = (230, 10, 10), (10, 10, 230), (250, 250, 250)
+
+
+def swatch(color) -> bytes:
+    """색만 다른 이미지"""
+    return make_image_bytes(size=(120, 90), color=color)
+
+
+def top_label(db, image_id):
+    return db.query(ImageLabel).filter_by(image_id=image_id, rank=1).one().label
+
+
+class TestClassifier:
+    """전처리/추론 테스트 (tests/data/tiny_classifier.onnx)"""
+
+    def test_preprocess_vectorized(self):
+        classifier = get_classifier()
+        pixels = [np.full((32, 32, 3), value, dtype=np.uint8) for value in (0, 255)]
+
+        batch = classifier.preprocess(pixels)
+
+        assert batch.shape == (2, 3, 32, 32)
+        assert batch.dtype == np.float32
+        assert np.allclose(batch[0], -1.0) and np.allclose(batch[1], 1.0)  # mean/std = 0.5
+
+    def test_predict_top_k(self):
+        classifier = get_classifier()
+        batch = classifier.preprocess([
+            np.full((32, 32, 3), color, dtype=np.uint8) for color in (RED, BLUE, WHITE)
+        ])
+
+        predictions = classifier.predict(batch, top_k=2)
+
+        assert [labels[0][0] for labels in predictions] == ["plastic", "metal", "paper"]
+        assert all(len(labels) == 2 for labels in predictions)
+        assert all(labels[0][1] >= labels[1][1] for labels in predictions)
+
+
+class TestClassifyJobs:
+    """classify 배치 작업 테스트"""
+
+    def test_labels_stored(self, db, uploaded_image, make_job):
+        red, white = uploaded_image(data=swatch(RED)), uploaded_image(data=swatch(WHITE))
+        make_job("classify", image=red)
+        make_job("classify", image=white)
+
+        run_until_idle(Worker("test"))
+
+        assert top_label(db, red.id) == "plastic"
+        assert top_label(db, white.id) == "paper"
+        labels = db.query(ImageLabel).filter_by(image_id=red.id).order_by(ImageLabel.rank).all()
+        assert [label.rank for label in labels] == [1, 2, 3]
+        assert labels[0].model.startswith("tiny_classifier.onnx:")
+        assert sum(label.confidence for label in labels) <= 1.0
+
+    def test_batches_capped_at_batch_size(self, db, uploaded_image, make_job):
+        for _ in range(5):
+            make_job("classify", image=uploaded_image(data=swatch(RED)))
+        batch_sizes = []
+
+        def recording(db, jobs):
+            batch_sizes.append(len(jobs))
+            return handle_batch(db, jobs)
+
+        worker = Worker("test", batch_handlers={"classify": BatchHandler(recording, batch_size=2, max_wait=0)})
+        run_until_idle(worker)
+
+        assert batch_sizes == [2, 2, 1]
+        db.expire_all()
+        assert {job.status for job in db.query(Job).all()} == {JobStatus.DONE}
+
+    def test_bad_image_fails_alone(self, db, uploaded_image, make_job):
+        good = uploaded_image(data=swatch(BLUE))
+        good_job = make_job("classify", image=good)
+        bad_job = make_job("classify", image=uploaded_image(data=b"not an image"))
+
+        run_until_idle(Worker("test"))
+
+        db.expire_all()
+        assert db.get(Job, good_job.id).status == JobStatus.DONE
+        assert db.get(Job, bad_job.id).status == JobStatus.DEAD
+        assert top_label(db, good.id) == "metal"
+
+    def test_prefers_small_variant(self, db, s3, uploaded_image, make_job):
+        """파생본이 있으면 원본 대신 읽음 (원본은 빨강, 파생본은 파랑)"""
+        image = uploaded_image(data=swatch(RED))
+        make_job("classify", image=image)
+        s3.put_object(Bucket="test-bucket", Key="derivatives/small.webp", Body=make_image_bytes(color=BLUE, fmt="WEBP"))
+        db.add(ImageVariant(
+            image_id=image.id, object_key="derivatives/small.webp", format="webp", width=64, height=48, size=1,
+        ))
+        db.commit()
+
+        run_until_idle(Worker("test"))
+
+        assert top_label(db, image.id) == "metal"
+
+    def test_rerun_replaces_labels(self, db, uploaded_image, make_job):
+        image = uploaded_image(data=swatch(RED))
+        for _ in range(2):
+            make_job("classify", image=image)
+
+        run_until_idle(Worker("test"))
+
+        assert db.query(ImageLabel).filter_by(image_id=image.id).count() == 3
@@ -0,0 +1,205 @@
+# backend/apps/worker/tests/test_dedup.py
+
+import io
+from unittest.mock import patch
+import numpy as np
+from PIL import Image as PILImage
+from src.handlers import HANDLERS, classify
+from src.models.image import Image
+from src.models.image_hash import ImageHash
+from src.models.job import Job
+from src.models.label import ImageLabel
+from src.models.variant import ImageVariant
+from src.utils.dedup import ContentHash, band_candidates, hash_row
+from src.utils.phash import phash, phash_gray, _gray, dhash, hamming, bands, is_informative, to_signed, to_unsigned
+from src.worker import Worker
+from src.config import S3_BUCKET
+from tests.conftest import make_image_bytes, run_until_idle
+
+JPEG = "image/jpeg"
+
+
+def photo(seed: int, size=(320, 240)) -> PILImage.Image:
+    """겹친 원 몇 개 (지각 해시가 색과 모양을 구분할 만큼의 구조)"""
+    rng = np.random.default_rng(seed)
+    width, height = size
+    pixels = np.zeros((height, width, 3), dtype=np.uint8)
+    yy, xx = np.ogrid[:height, :width]
+    for _ in range(8):
+        cx, cy, radius = rng.uniform(0, width), rng.uniform(0, height), rng.uniform(20, 120)
+        pixels[(xx - cx) ** 2 + (yy - cy) ** 2 < radius ** 2] = rng.uniform(0, 255, 3)
+    return PILImage.fromarray(pixels)
+
+
+def encode(img: PILImage.Image, fmt="JPEG", **options) -> bytes:
+    buffer = io.BytesIO()
+    img.save(buffer, format=fmt, **options)
+    return buffer.getvalue()
+
+
+def process_queued():
+    """쌓인 process_image 작업을 등록 순서대로 실행 (classify는 큐에 남겨 둠)"""
+    run_until_idle(Worker("test", handlers=HANDLERS))
+
+
+class TestPerceptualHash:
+    """pHash/dHash 테스트"""
+
+    def test_recompressed_copy_is_close(self):
+        original = photo(1)
+        copy = PILImage.open(io.BytesIO(encode(original.resize((160, 120)), quality=50)))
+
+        assert hamming(phash(original), phash(copy)) <= 3
+        assert hamming(dhash(original), dhash(copy)) <= 8
+
+    def test_different_photos_are_far(self):
+        assert hamming(phash(photo(1)), phash(photo(2))) > 10
+
+    def test_flat_image_not_informative(self):
+        for color in ((200, 30, 30), (30, 30, 200)):
+            assert not is_informative(phash(PILImage.new("RGB", (120, 90), color)))
+        assert is_informative(phash(photo(1)))
+
+    def test_batch_matches_single(self):
+        images = [photo(seed) for seed in range(3)]
+        batch = phash_gray(np.stack([_gray(img, (32, 32)) for img in images]))
+
+        assert batch.tolist() == [phash(img) for img in images]
+
+    def test_bands_and_signed_storage(self):
+        value = (0xFFFF << 48) | (0x1234 << 32) | (0xABCD << 16) | 0x0001
+        assert bands(value) == [0xFFFF, 0x1234, 0xABCD, 0x0001]
+        assert to_signed(value) < 0
+        assert to_unsigned(to_signed(value)) == value
+
+
+class TestDedupJobs:
+    """process_image 중복 감지 테스트"""
+
+    def test_exact_duplicate_shares_variants(self, db, s3, uploaded_image, make_job):
+        data = encode(photo(1))
+        first, second = uploaded_image(data=data, content_type=JPEG), uploaded_image(data=data, content_type=JPEG)
+        second_key = second.object_key
+        for image in (first, second):
+            make_job(image=image)
+
+        process_queued()
+
+        db.expire_all()
+        second = db.get(Image, second.id)
+        assert second.object_key == second_key  # 클라이언트가 받은 키는 그대로
+        assert (second.width, second.height) == (320, 240)
+        assert s3.head_object(Bucket=S3_BUCKET, Key=second_key)  # 올린 원본도 그대로
+
+        row = db.get(ImageHash, second.id)
+        assert (row.canonical_image_id, row.distance) == (first.id, 0)
+        assert db.get(ImageHash, first.id).canonical_image_id is None
+        variant_keys = lambda image_id: sorted(v.object_key for v in db.query(ImageVariant).filter_by(image_id=image_id))
+        assert variant_keys(second.id) == variant_keys(first.id) != []
+
+    def test_duplicate_rerun_is_idempotent(self, db, uploaded_image, make_job):
+        data = encode(photo(1))
+        first, second = uploaded_image(data=data, content_type=JPEG), uploaded_image(data=data, content_type=JPEG)
+        for image in (first, second, second):
+            make_job(image=image)
+
+        process_queued()
+
+        db.expire_all()
+        assert db.get(Image, second.id).object_key != first.object_key
+        assert db.get(ImageHash, second.id).canonical_image_id == first.id
+
+    def test_near_duplicate_linked(self, db, s3, uploaded_image, make_job):
+        original = photo(1)
+        first = uploaded_image(data=encode(original, quality=90), content_type=JPEG)
+        second = uploaded_image(data=encode(original.resize((240, 180)), quality=40), content_type=JPEG)
+        for image in (first, second):
+            make_job(image=image)
+
+        process_queued()
+
+        db.expire_all()
+        row = db.get(ImageHash, second.id)
+        assert row.canonical_image_id == first.id
+        assert 0 <= row.distance <= 3
+        assert s3.head_object(Bucket=S3_BUCKET, Key=second.object_key)  # 다른 바이트는 원본 유지
+
+    def test_different_photos_not_linked(self, db, uploaded_image, make_job):
+        make_job(image=uploaded_image(data=encode(photo(1)), content_type=JPEG))
+        other = uploaded_image(data=encode(photo(2)), content_type=JPEG)
+        make_job(image=other)
+
+        process_queued()
+
+        assert db.get(ImageHash, other.id).canonical_image_id is None
+
+    def test_flat_images_not_linked(self, db, uploaded_image, make_job):
+        make_job(image=uploaded_image(data=make_image_bytes(size=(120, 90), color=(230, 10, 10), fmt="JPEG"), content_type=JPEG))
+        other = uploaded_image(data=make_image_bytes(size=(120, 90), color=(10, 10, 230), fmt="JPEG"), content_type=JPEG)
+        make_job(image=other)
+
+        process_queued()
+
+        assert db.get(ImageHash, other.id).canonical_image_id is None
+
+    def test_enqueues_classify_after_processing(self, db, uploaded_image, make_job):
+        image = uploaded_image(data=encode(photo(1)), content_type=JPEG)
+        make_job(image=image)
+
+        process_queued()
+
+        jobs = db.query(Job).filter_by(kind="classify").all()
+        assert [job.payload["image_id"] for job in jobs] == [image.id]
+
+    def test_common_band_skipped(self, db):
+        """같은 밴드 값 행이 max_rows보다 많으면 그 밴드는 건너뛰고 나머지 밴드로 찾음"""
+        common = 0xB3B3 << 48
+        for image_id, tail in enumerate((0x1111_2222_3333, 0x4444_5555_6666, 0x7777_8888_9999), start=1):
+            db.add(hash_row(image_id, ContentHash(f"{image_id:064x}", common | tail, 0)))
+        db.commit()
+
+        rows, skipped = band_candidates(db, common | 0x1111_0000_0000, max_rows=2)
+        assert (sorted(row.image_id for row in rows), skipped) == ([1], 1)
+
+        rows, skipped = band_candidates(db, common | 0x1111_0000_0000, max_rows=0)
+        assert (len(rows), skipped) == (3, 0)
+
+
+class TestClassifyReuse:
+    """중복 이미지는 대표 이미지 라벨 복사"""
+
+    def test_duplicate_copies_labels_without_inference(self, db, uploaded_image, make_job):
+        data = encode(photo(1))
+        first = uploaded_image(data=data, content_type=JPEG)
+        make_job(image=first)
+        process_queued()
+        run_until_idle(Worker("test"))  # 대표 분류
+
+        second = uploaded_image(data=data, content_type=JPEG)
+        make_job(image=second)
+        process_queued()
+        with patch("src.handlers.classify.load_pixels", wraps=classify.load_pixels) as load:
+            run_until_idle(Worker("test"))
+
+        load.assert_not_called()
+        labels = lambda image_id: [
+            (label.rank, label.label, label.confidence)
+            for label in db.query(ImageLabel).filter_by(image_id=image_id).order_by(ImageLabel.rank)
+        ]
+        assert labels(second.id) == labels(first.id) != []
+
+    def test_canonical_not_classified_yet(self, db, uploaded_image, make_job):
+        """대표 라벨이 아직 없으면 직접 분류"""
+        data = encode(photo(1))
+        first, second = uploaded_image(data=data, content_type=JPEG), uploaded_image(data=data, content_type=JPEG)
+        for image in (first, second):
+            make_job(image=image)
+        process_queued()
+        db.query(Job).filter(Job.kind == "classify", Job.payload["image_id"].as_integer() != second.id).delete(
+            synchronize_session=False
+        )
+        db.commit()
+
+        run_until_idle(Worker("test"))
+
+        assert db.query(ImageLabel).filter_by(image_id=second.id).count() == 3
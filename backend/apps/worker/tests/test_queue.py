@@ -0,0 +1,167 @@
+# backend/apps/worker/tests/test_queue.py
+
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+from src.models.job import Job, JobStatus
+from src.utils.queue import claim_jobs, complete_jobs, fail_job, heartbeat_jobs, requeue_dead_jobs, requeue_stale_jobs
+
+# SQLite에서는 FOR UPDATE SKIP LOCKED가 무시되므로 동시 소비는 실제 Postgres로만 확인할 수 있다.
+# 이 변수가 없으면(기본, CI 포함) 해당 테스트는 건너뜀
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL", "")
+
+
+class TestClaim:
+    """작업 가져오기 테스트"""
+
+    def test_claim_marks_running(self, db, make_job):
+        job = make_job()
+
+        claimed = claim_jobs(db, "w1")
+
+        assert [j.id for j in claimed] == [job.id]
+        assert claimed[0].status == JobStatus.RUNNING
+        assert claimed[0].attempts == 1
+        assert claimed[0].locked_by == "w1"
+
+    def test_claimed_job_not_returned_again(self, db, make_job):
+        make_job()
+
+        assert len(claim_jobs(db, "w1")) == 1
+        assert claim_jobs(db, "w2") == []
+
+    def test_future_run_after_skipped(self, db, make_job):
+        make_job(run_after=datetime.utcnow() + timedelta(minutes=5))
+
+        assert claim_jobs(db, "w1") == []
+
+    def test_filter_by_kind(self, db, make_job):
+        make_job(kind="other")
+        job = make_job(kind="process_image")
+
+        claimed = claim_jobs(db, "w1", kinds=["process_image"], limit=10)
+
+        assert [j.id for j in claimed] == [job.id]
+
+    def test_batch_claim_in_order(self, db, make_job):
+        jobs = [make_job() for _ in range(3)]
+
+        claimed = claim_jobs(db, "w1", limit=2)
+
+        assert [j.id for j in claimed] == [jobs[0].id, jobs[1].id]
+
+
+class TestRetryAndDeadLetter:
+    """재시도 / dead-letter 테스트"""
+
+    def test_complete(self, db, make_job):
+        make_job()
+        job = claim_jobs(db, "w1")[0]
+
+        complete_jobs(db, [job])
+
+        assert db.get(Job, job.id).status == JobStatus.DONE
+
+    def test_failure_requeued(self, db, make_job):
+        make_job()
+        job = claim_jobs(db, "w1")[0]
+
+        assert fail_job(db, job, "boom") == JobStatus.QUEUED
+        assert job.last_error == "boom"
+        assert len(claim_jobs(db, "w1")) == 1
+
+    def test_dead_after_max_attempts(self, db, make_job):
+        make_job(max_attempts=2)
+
+        fail_job(db, claim_jobs(db, "w1")[0], "boom")
+        job = claim_jobs(db, "w1")[0]
+
+        assert fail_job(db, job, "boom again") == JobStatus.DEAD
+        assert claim_jobs(db, "w1") == []
+
+    def test_permanent_failure_dead_immediately(self, db, make_job):
+        make_job()
+        job = claim_jobs(db, "w1")[0]
+
+        assert fail_job(db, job, "bad input", permanent=True) == JobStatus.DEAD
+
+    def test_requeue_dead(self, db, make_job):
+        make_job()
+        fail_job(db, claim_jobs(db, "w1")[0], "bad input", permanent=True)
+
+        assert requeue_dead_jobs(db) == 1
+
+        job = claim_jobs(db, "w1")[0]
+        assert job.attempts == 1
+        assert job.last_error is None
+
+    def test_requeue_stale_running(self, db, make_job):
+        """워커가 죽어 running으로 남은 작업 재등록, 재시도 소진이면 dead"""
+        make_job()
+        make_job(max_attempts=1)
+        claimed = claim_jobs(db, "w1", limit=2)
+        for job in claimed:
+            job.locked_at = datetime.utcnow() - timedelta(hours=1)
+        db.commit()
+
+        assert requeue_stale_jobs(db, lock_timeout=60) == 2
+
+        db.expire_all()
+        assert {db.get(Job, j.id).status for j in claimed} == {JobStatus.QUEUED, JobStatus.DEAD}
+
+    def test_heartbeat_prevents_requeue(self, db, make_job):
+        """잠금을 갱신한 작업은 재등록되지 않고, 다른 워커의 작업은 갱신하지 않음"""
+        make_job()
+        make_job()
+        mine, other = claim_jobs(db, "w1"), claim_jobs(db, "w2")
+        for job in mine + other:
+            job.locked_at = datetime.utcnow() - timedelta(hours=1)
+        db.commit()
+
+        assert heartbeat_jobs(db, "w1", [mine[0].id, other[0].id]) == 1
+        assert requeue_stale_jobs(db, lock_timeout=60) == 1
+
+        db.expire_all()
+        assert db.get(Job, mine[0].id).status == JobStatus.RUNNING
+        assert db.get(Job, other[0].id).status == JobStatus.QUEUED
+
+
+@pytest.mark.skipif(not TEST_POSTGRES_URL, reason="TEST_POSTGRES_URL not set (SKIP LOCKED needs Postgres)")
+class TestPostgresConcurrency:
+    """여러 워커가 동시에 가져가도 한 작업은 한 번만 (실제 Postgres 필요)"""
+
+    def test_concurrent_claims_never_overlap(self):
+        engine = create_engine(TEST_POSTGRES_URL)
+        Job.__table__.create(engine, checkfirst=True)
+        Session = sessionmaker(bind=engine, expire_on_commit=False)
+        kind = f"concurrency-{uuid.uuid4().hex}"
+        with Session() as db:
+            db.add_all(Job(kind=kind, payload={}, dedupe_key=f"{kind}:{i}") for i in range(200))
+            db.commit()
+
+        claimed, start = [], threading.Barrier(8)
+
+        def consume(worker_id):
+            start.wait()
+            with Session() as db:
+                while jobs := claim_jobs(db, worker_id, kinds=[kind], limit=5):
+                    claimed.extend(job.id for job in jobs)
+
+        threads = [threading.Thread(target=consume, args=(f"w{i}",)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+
+        try:
+            assert len(claimed) == 200
+            assert len(set(claimed)) == 200
+        finally:
+            with Session() as db:
+                db.execute(delete(Job).where(Job.kind == kind))
+                db.commit()
+            engine.dispose()
@@ -0,0 +1,177 @@
+# backend/apps/worker/tests/test_worker.py
+
+import io
+import threading
+import time
+from PIL import Image as PILImage
+from src.models.database import SessionLocal
+from src.models.image import Image
+from src.models.job import Job, JobStatus
+from src.models.listing_version import ListingVersion
+from src.models.variant import ImageVariant
+from src.utils.queue import requeue_stale_jobs
+from src.worker import Worker
+from src.handlers.process_image import derivative_key, variant_widths
+from src.config import S3_BUCKET
+from tests.conftest import make_image_bytes, run_until_idle
+
+
+class TestProcessImage:
+    """process_image 작업 테스트"""
+
+    def test_records_dimensions(self, db, uploaded_image, make_job):
+        image = uploaded_image(data=make_image_bytes(size=(320, 200)))
+        job = make_job(image=image)
+
+        run_until_idle(Worker("test"))
+
+        db.expire_all()
+        assert db.get(Job, job.id).status == JobStatus.DONE
+        assert (db.get(Image, image.id).width, db.get(Image, image.id).height) == (320, 200)
+
+    def test_bumps_listing_versions(self, db, uploaded_image, make_job):
+        """크기/썸네일이 목록에 반영되므로 공개 목록과 업로더 목록의 ETag가 바뀜"""
+        image = uploaded_image()
+        make_job(image=image)
+
+        run_until_idle(Worker("test"))
+
+        versions = {row.scope: row.version for row in db.query(ListingVersion)}
+        assert versions == {"public": 1, f"user:{image.user_id}": 1}
+
+    def test_idempotent_rerun(self, db, uploaded_image, make_job):
+        image = uploaded_image()
+        for _ in range(2):
+            make_job(image=image)
+
+        run_until_idle(Worker("test"))
+
+        db.expire_all()
+        assert {job.status for job in db.query(Job).all()} == {JobStatus.DONE}
+
+    def test_undecodable_image_dead_lettered(self, db, uploaded_image, make_job):
+        image = uploaded_image(data=b"not an image")
+        job = make_job(image=image)
+
+        run_until_idle(Worker("test"))
+
+        db.expire_all()
+        job = db.get(Job, job.id)
+        assert job.status == JobStatus.DEAD
+        assert job.attempts == 1
+        assert "Undecodable" in job.last_error
+
+    def test_missing_image_skipped(self, db, make_job):
+        job = make_job(payload={"image_id": 999999, "object_key": "originals/gone.png"})
+
+        run_until_idle(Worker("test"))
+
+        db.expire_all()
+        assert db.get(Job, job.id).status == JobStatus.DONE
+
+
+class TestVariants:
+    """목록용 파생본(WebP/AVIF) 생성 테스트"""
+
+    def test_variant_widths_capped_at_original(self):
+        assert variant_widths(4000) == [1536, 768, 256]
+        assert variant_widths(500) == [500, 256]
+        assert variant_widths(100) == [100]
+
+    def test_derivative_key(self):
+        assert derivative_key("originals/abc.jpg", 256, "webp") == "derivatives/abc/256.webp"
+
+    def test_variants_written_and_recorded(self, db, s3, uploaded_image, make_job):
+        image = uploaded_image(data=make_image_bytes(size=(1000, 500), fmt="JPEG"), content_type="image/jpeg")
+        make_job(image=image)
+
+        run_until_idle(Worker("test"))
+
+        variants = db.query(ImageVariant).filter_by(image_id=image.id).all()
+        assert {(v.format, v.width, v.height) for v in variants} == {
+            (fmt, w, h) for fmt in ("webp", "avif") for w, h in ((1000, 500), (768, 384), (256, 128))
+        }
+        for variant in variants:
+            assert variant.object_key.startswith("derivatives/")
+            head = s3.head_object(Bucket=S3_BUCKET, Key=variant.object_key)
+            assert head["ContentType"] == f"image/{variant.format}"
+            assert head["ContentLength"] == variant.size
+
+    def test_rerun_replaces_rows(self, db, uploaded_image, make_job):
+        image = uploaded_image(data=make_image_bytes(size=(300, 300)))
+        for _ in range(2):
+            make_job(image=image)
+
+        run_until_idle(Worker("test"))
+
+        assert db.query(ImageVariant).filter_by(image_id=image.id).count() == 4  # (256, 300) × (webp, avif)
+
+    def test_exif_rotation_applied(self, db, uploaded_image, make_job):
+        buffer = io.BytesIO()
+        exif = PILImage.Exif()
+        exif[0x0112] = 6  # 90도 회전
+        PILImage.new("RGB", (400, 200)).save(buffer, format="JPEG", exif=exif)
+        image = uploaded_image(data=buffer.getvalue(), content_type="image/jpeg")
+        make_job(image=image)
+
+        run_until_idle(Worker("test"))
+
+        db.expire_all()
+        assert (db.get(Image, image.id).width, db.get(Image, image.id).height) == (200, 400)
+
+
+class TestWorkerLoop:
+    """재시도/알 수 없는 작업/종료 테스트"""
+
+    def test_transient_failure_retried(self, db, make_job):
+        calls = []
+
+        def flaky(db, job):
+            calls.append(job.attempts)
+            if len(calls) < 3:
+                raise ConnectionError("S3 unavailable")
+
+        job = make_job(kind="flaky")
+        run_until_idle(Worker("test", handlers={"flaky": flaky}))
+
+        db.expire_all()
+        assert calls == [1, 2, 3]
+        assert db.get(Job, job.id).status == JobStatus.DONE
+
+    def test_unhandled_kinds_left_alone(self, db, make_job):
+        job = make_job(kind="classify")
+
+        assert Worker("test", handlers={"other": lambda db, job: None}).run_once() is False
+        assert db.get(Job, job.id).status == JobStatus.QUEUED
+
+    def test_heartbeat_keeps_long_job_locked(self, db, make_job):
+        """JOB_LOCK_TIMEOUT보다 오래 걸려도 잠금이 갱신되므로 재등록되지 않음 (두 번 실행 안 됨)"""
+        job = make_job(kind="slow")
+        requeued = []
+
+        def slow(db, job):
+            time.sleep(0.3)
+            with SessionLocal() as other:
+                requeued.append(requeue_stale_jobs(other, lock_timeout=0.2))
+
+        assert Worker("test", handlers={"slow": slow}, heartbeat_interval=0.05).run_once()
+
+        db.expire_all()
+        assert requeued == [0]
+        assert db.get(Job, job.id).status == JobStatus.DONE
+
+    def test_run_stops_on_event(self, db, make_job):
+        make_job(kind="noop")
+        stop = threading.Event()
+        done = []
+
+        def noop(db, job):
+            done.append(job.id)
+            stop.set()
+
+        thread = threading.Thread(target=Worker("test", handlers={"noop": noop}).run, args=(stop,))
+        thread.start()
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert len(done) == 1
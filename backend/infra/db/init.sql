@@ -28,17 +28,117 @@ CREATE TABLE IF NOT EXISTS oauth_accounts (
 CREATE TABLE IF NOT EXISTS images (
     id SERIAL PRIMARY KEY,
     user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-    object_key VARCHAR(500) NOT NULL UNIQUE,
+    object_key VARCHAR(500) NOT NULL,  -- sha256 핸드셰이크로 재사용한 행은 같은 키를 가리킴 (UNIQUE 아님)
     filename VARCHAR(500),
     content_type VARCHAR(100),
     size INTEGER,
-    created_at TIMESTAMP DEFAULT NOW()
+    created_at TIMESTAMP DEFAULT NOW(),
+    status VARCHAR(20) NOT NULL DEFAULT 'ready'  -- pending | ready | rejected | quarantined | expired
+);
+
+-- 기존 DB 업그레이드용 (업로드 수명주기)
+ALTER TABLE images ADD COLUMN IF NOT EXISTS status VARCHAR(20) NOT NULL DEFAULT 'ready';
+-- 기존 DB: 같은 내용의 업로드가 원본 객체를 공유하도록 UNIQUE 제거 (idx_images_object_key 인덱스는 유지)
+ALTER TABLE images DROP CONSTRAINT IF EXISTS images_object_key_key;
+-- 워커가 채우는 원본 크기 (후처리 전에는 NULL)
+ALTER TABLE images ADD COLUMN IF NOT EXISTS width INTEGER;
+ALTER TABLE images ADD COLUMN IF NOT EXISTS height INTEGER;
+
+-- 목록용 파생본 (워커가 derivatives/ 아래에 만든 리사이즈 WebP/AVIF)
+CREATE TABLE IF NOT EXISTS image_variants (
+    id SERIAL PRIMARY KEY,
+    image_id INTEGER NOT NULL REFERENCES images(id) ON DELETE CASCADE,
+    object_key VARCHAR(500) NOT NULL,  -- 예: derivatives/abc/256.webp
+    format VARCHAR(10) NOT NULL,       -- webp | avif
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_image_variants_image_format_width UNIQUE (image_id, format, width)
+);
+
+-- 재활용 분류 결과 (워커 classify 작업, 이미지당 상위 라벨)
+CREATE TABLE IF NOT EXISTS image_labels (
+    id SERIAL PRIMARY KEY,
+    image_id INTEGER NOT NULL REFERENCES images(id) ON DELETE CASCADE,
+    model VARCHAR(100) NOT NULL,  -- 모델 파일 이름:해시 앞자리
+    rank INTEGER NOT NULL,        -- 1 = 가장 확률 높은 라벨
+    label VARCHAR(100) NOT NULL,
+    confidence FLOAT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_image_labels_image_model_rank UNIQUE (image_id, model, rank)
+);
+
+-- 내용 해시 (워커 process_image, 중복 업로드 감지)
+CREATE TABLE IF NOT EXISTS image_hashes (
+    image_id INTEGER PRIMARY KEY REFERENCES images(id) ON DELETE CASCADE,
+    sha256 CHAR(64) NOT NULL,
+    phash BIGINT NOT NULL,  -- 64비트 지각 해시 (부호 있는 값으로 저장)
+    dhash BIGINT NOT NULL,
+    phash_band0 INTEGER NOT NULL,  -- pHash 16비트 밴드 (근접 검색 multi-index)
+    phash_band1 INTEGER NOT NULL,
+    phash_band2 INTEGER NOT NULL,
+    phash_band3 INTEGER NOT NULL,
+    canonical_image_id INTEGER REFERENCES images(id) ON DELETE SET NULL,  -- NULL: 자신이 대표
+    distance INTEGER,  -- 대표와의 pHash 해밍 거리 (0: 같은 바이트, 파생본 공유)
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- 목록 범위별 변경 카운터 (목록 ETag, ready 전환/워커 처리 시 같은 트랜잭션에서 +1)
+CREATE TABLE IF NOT EXISTS listing_versions (
+    scope VARCHAR(50) PRIMARY KEY,  -- public | user:<id>
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+-- 진행 중인 멀티파트 업로드 (완료/중단 시 삭제, 방치된 업로드는 API 스위퍼가 중단)
+CREATE TABLE IF NOT EXISTS multipart_uploads (
+    id SERIAL PRIMARY KEY,
+    image_id INTEGER NOT NULL REFERENCES images(id) ON DELETE CASCADE,
+    upload_id VARCHAR(1024) NOT NULL,  -- S3 UploadId
+    part_size INTEGER NOT NULL,
+    part_count INTEGER NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- 워커 작업 큐 (api가 등록, worker가 FOR UPDATE SKIP LOCKED로 소비)
+CREATE TABLE IF NOT EXISTS jobs (
+    id SERIAL PRIMARY KEY,
+    kind VARCHAR(50) NOT NULL,
+    payload JSON NOT NULL,
+    dedupe_key VARCHAR(200) NOT NULL UNIQUE,  -- 예: process_image:<image_id>
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',  -- queued | running | done | dead
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    run_after TIMESTAMP NOT NULL DEFAULT NOW(),
+    locked_at TIMESTAMP,
+    locked_by VARCHAR(100),
+    last_error TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
 );
 
 -- 인덱스
 CREATE INDEX IF NOT EXISTS idx_oauth_accounts_user_id ON oauth_accounts(user_id);
 CREATE INDEX IF NOT EXISTS idx_images_user_id ON images(user_id);
 CREATE INDEX IF NOT EXISTS idx_images_object_key ON images(object_key);
+-- 키셋(커서) 페이지네이션: ORDER BY created_at DESC, id DESC
+CREATE INDEX IF NOT EXISTS idx_images_created_at_id ON images(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_images_user_id_created_at_id ON images(user_id, created_at, id);
+-- 만료 스위퍼: 오래된 pending 업로드 조회
+CREATE INDEX IF NOT EXISTS idx_images_pending_created_at ON images(created_at) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_image_variants_image_id ON image_variants(image_id);
+CREATE INDEX IF NOT EXISTS idx_image_labels_image_id ON image_labels(image_id);
+CREATE INDEX IF NOT EXISTS idx_image_labels_label ON image_labels(label);
+CREATE INDEX IF NOT EXISTS idx_image_hashes_sha256 ON image_hashes(sha256);
+CREATE INDEX IF NOT EXISTS idx_image_hashes_phash_band0 ON image_hashes(phash_band0);
+CREATE INDEX IF NOT EXISTS idx_image_hashes_phash_band1 ON image_hashes(phash_band1);
+CREATE INDEX IF NOT EXISTS idx_image_hashes_phash_band2 ON image_hashes(phash_band2);
+CREATE INDEX IF NOT EXISTS idx_image_hashes_phash_band3 ON image_hashes(phash_band3);
+CREATE INDEX IF NOT EXISTS idx_image_hashes_canonical_image_id ON image_hashes(canonical_image_id);
+CREATE INDEX IF NOT EXISTS idx_multipart_uploads_image_id ON multipart_uploads(image_id);
+CREATE INDEX IF NOT EXISTS idx_multipart_uploads_created_at ON multipart_uploads(created_at);
+-- 워커 작업 조회: 대기 작업만
+CREATE INDEX IF NOT EXISTS idx_jobs_queued ON jobs(kind, run_after) WHERE status = 'queued';
 
 -- 테스트 데이터 (development only)
 -- INSERT INTO users (email) VALUES ('test@example.com');
\ No newline at end of file
@@ -6,6 +6,7 @@ API_BASE="${API_BASE:-http://localhost:8080}"
 AUTH_BASE="${AUTH_BASE:-http://localhost:8001}"
 IMG_FILE="${IMG_FILE:-test.jpg}"
 TEST_EMAIL="${TEST_EMAIL:-test@example.com}"
+UPLOAD_MODE="${UPLOAD_MODE:-put}"  # put | post (POST 정책: 크기/타입을 스토리지가 검사)
 
 if ! command -v jq >/dev/null 2>&1; then
   echo "❌ jq가 필요합니다. (brew install jq / apt-get install jq)" >&2
@@ -19,6 +20,21 @@ fi
 
 # 파일 크기 계산
 SIZE=$(wc -c < "$IMG_FILE" | tr -d ' ')
+# 내용 해시 (같은 파일이 이미 올라와 있으면 서버가 업로드를 생략시킴)
+if command -v sha256sum >/dev/null 2>&1; then
+  SHA256=$(sha256sum "$IMG_FILE" | cut -d' ' -f1)
+else
+  SHA256=$(shasum -a 256 "$IMG_FILE" | cut -d' ' -f1)
+fi
+
+# 확장자로 Content-Type 결정 (서버가 실제 바이트와 비교하므로 일치해야 함)
+case "${IMG_FILE##*.}" in
+  jpg|jpeg|JPG|JPEG) CONTENT_TYPE="image/jpeg" ;;
+  png|PNG) CONTENT_TYPE="image/png" ;;
+  webp) CONTENT_TYPE="image/webp" ;;
+  avif) CONTENT_TYPE="image/avif" ;;
+  *) echo "❌ 지원하지 않는 확장자: $IMG_FILE" >&2; exit 1 ;;
+esac
 
 echo "================================"
 echo "🔐 1) OAuth 테스트 토큰 발급..."
@@ -59,32 +75,57 @@ echo "================================"
 RESP=$(curl -sS -f -X POST "$API_BASE/uploads" \
   -H "Content-Type: application/json" \
   -H "Authorization: Bearer $ACCESS_TOKEN" \
-  -d "{\"filename\":\"$(basename "$IMG_FILE")\",\"contentType\":\"image/png\",\"size\":$SIZE}")
+  -d "{\"filename\":\"$(basename "$IMG_FILE")\",\"contentType\":\"$CONTENT_TYPE\",\"size\":$SIZE,\"mode\":\"$UPLOAD_MODE\",\"sha256\":\"$SHA256\"}")
 
 echo "Response: $RESP"
 URL=$(echo "$RESP" | jq -r .presignedUrl)
 KEY=$(echo "$RESP" | jq -r .objectKey)
+ALREADY_PRESENT=$(echo "$RESP" | jq -r .alreadyPresent)
 
-if [ -z "$URL" ] || [ "$URL" = "null" ]; then
+if [ "$ALREADY_PRESENT" = "true" ]; then
+  echo "♻️ 같은 내용이 이미 있음 - 업로드/완료 확인 생략 (Object Key: $KEY)"
+  echo ""
+elif [ -z "$URL" ] || [ "$URL" = "null" ]; then
   echo "❌ presignedUrl 파싱 실패" >&2
   exit 1
 fi
 
-echo "✅ Presigned URL: ${URL:0:100}..."
-echo "✅ Object Key: $KEY"
-echo ""
-
-echo "================================"
-echo "📤 4) S3에 이미지 업로드..."
-echo "================================"
-
-curl --fail-with-body -sS -X PUT "$URL" \
-  -H "Content-Type: image/png" \
-  --data-binary @"$IMG_FILE" \
-  -D - >/dev/null
-
-echo "✅ Upload OK."
-echo ""
+if [ "$ALREADY_PRESENT" != "true" ]; then
+  echo "✅ Presigned URL: ${URL:0:100}..."
+  echo "✅ Object Key: $KEY"
+  echo ""
+
+  echo "================================"
+  echo "📤 4) S3에 이미지 업로드..."
+  echo "================================"
+
+  if [ "$UPLOAD_MODE" = "post" ]; then
+    # 정책 필드를 먼저, 파일은 마지막 필드로
+    FORM_ARGS=()
+    while IFS= read -r FIELD; do
+      FORM_ARGS+=(-F "$FIELD")
+    done < <(echo "$RESP" | jq -r '.fields | to_entries[] | "\(.key)=\(.value)"')
+    curl --fail-with-body -sS -X POST "$URL" \
+      "${FORM_ARGS[@]}" \
+      -F "file=@$IMG_FILE" \
+      -D - >/dev/null
+  else
+    curl --fail-with-body -sS -X PUT "$URL" \
+      -H "Content-Type: $CONTENT_TYPE" \
+      --data-binary @"$IMG_FILE" \
+      -D - >/dev/null
+  fi
+
+  echo "✅ Upload OK."
+  echo ""
+
+  # 업로드 완료 확인 (pending → ready, 이후 목록/조회에 노출)
+  DONE_RESP=$(curl -sS -f -X POST "$API_BASE/uploads/$KEY/complete" \
+    -H "Authorization: Bearer $ACCESS_TOKEN")
+
+  echo "Complete Response: $DONE_RESP"
+  echo ""
+fi
 
 echo "================================"
 echo "📥 5) 조회용 Presigned URL 발급..."
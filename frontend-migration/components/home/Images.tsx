@@ -101,7 +101,10 @@ export default function Images() {
                         {/* Image Container */}
                         <div className="relative h-48 bg-slate-800/50 overflow-hidden">
                             <img
-                                src={image.url}
+                                src={image.thumbnail_url ?? image.url}
+                                srcSet={image.srcset ?? undefined}
+                                sizes="(min-width: 1024px) 25vw, (min-width: 768px) 33vw, (min-width: 640px) 50vw, 100vw"
+                                loading="lazy"
                                 alt={image.filename}
                                 className="w-full h-full object-cover transition-transform duration-300 group-hover:scale-110"
                             />
@@ -153,7 +156,7 @@ export default function Images() {
                                     <svg className="w-3.5 h-3.5 text-emerald-500/60" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                                         <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M16 7a4 4 0 11-8 0 4 4 0 018 0zM12 14a7 7 0 00-7 7h14a7 7 0 00-7-7z" />
                                     </svg>
-                                    <span className="text-emerald-400/80">{image.user.name}</span>
+                                    <span className="text-emerald-400/80">{image.user?.name}</span>
                                 </div>
                             </div>
                             
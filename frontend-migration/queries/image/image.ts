@@ -1,5 +1,5 @@
 import axios from 'axios'
-import { UserResponse } from '@/types/shared/user'
+import { UploaderSummary } from '@/types/shared/user'
 
 const API_BASE = process.env.API_BASE || 'http://localhost:8080'
 
@@ -8,9 +8,14 @@ export interface ImageItem {
     key: string
     filename: string
     size: number
-    url: string // ✅ Presigned URL
+    url: string // ✅ Presigned URL (원본)
+    thumbnail_url: string // 목록용 썸네일 (처리 전이면 원본 URL)
+    srcset: string | null
+    width: number | null
+    height: number | null
     created_at: string
-    user: UserResponse
+    user_id: number
+    user: UploaderSummary | null
 }
 
 export interface ImageListResponse {
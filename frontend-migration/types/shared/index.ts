@@ -1 +1 @@
-export type { UserResponse } from './user'
+export type { UserResponse, UploaderSummary } from './user'
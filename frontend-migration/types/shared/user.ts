@@ -5,4 +5,11 @@ export interface UserResponse {
     avatar_url: string
     created_at: string
     updated_at: string
-}
\ No newline at end of file
+}
+
+/** 이미지 목록에 포함되는 업로더 요약 정보 */
+export interface UploaderSummary {
+    id: number
+    name: string | null
+    avatar_url: string | null
+}